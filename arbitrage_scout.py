@@ -4,11 +4,12 @@ Main orchestrator for the news-to-markets arbitrage scout system
 """
 
 import asyncio
+from itertools import chain, combinations
 from typing import List
 from datetime import datetime, timedelta
 import logging
 
-from connectors import StackerNewsConnector, PolymarketConnector, PredyxConnector
+from connectors import BaseConnector, StackerNewsConnector, PolymarketConnector, PredyxConnector
 from event_model import EventNormalizer
 from event_matcher import EventMatcher, HumanReviewQueue
 from arbitrage_engine import ArbitrageDetector
@@ -18,9 +19,9 @@ class ArbitrageScout:
     
     def __init__(self, config: dict):
         # Initialize connectors
-        self.sn_connector = StackerNewsConnector(config.get('stacker_news_endpoint'))
-        self.polymarket_connector = PolymarketConnector(config.get('polymarket_api_base'))
-        self.predyx_connector = PredyxConnector(config.get('predyx_base_url'))
+        self.sn_connector: BaseConnector = StackerNewsConnector(config.get('stacker_news_endpoint'))
+        self.polymarket_connector: BaseConnector = PolymarketConnector(config.get('polymarket_api_base'))
+        self.predyx_connector: BaseConnector = PredyxConnector(config.get('predyx_base_url'))
         
         # Initialize processing components
         self.normalizer = EventNormalizer()
@@ -34,18 +35,34 @@ class ArbitrageScout:
         # Configuration
         self.config = config
         self.logger = logging.getLogger(__name__)
+        
+        # Sources that raised during the last cycle (name -> exception), so an
+        # outage can be told apart from a venue that simply has no events
+        self.source_failures = {}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def close(self):
+        """Close the connectors' pooled HTTP sessions"""
+        await asyncio.gather(
+            self.sn_connector.close(),
+            self.polymarket_connector.close(),
+            self.predyx_connector.close(),
+        )
     
     async def run_discovery_cycle(self):
         """Run one complete discovery and analysis cycle"""
         self.logger.info("Starting arbitrage discovery cycle")
         
         try:
-            # Step 1: Fetch signals from Stacker News
-            sn_posts = await self._fetch_stacker_news_signals()
-            
-            # Step 2: Fetch markets from prediction venues
-            polymarket_markets = await self._fetch_polymarket_markets()
-            predyx_markets = await self._fetch_predyx_markets()
+            # Steps 1-2: Fetch Stacker News signals and venue markets concurrently
+            (sn_posts, polymarket_markets, predyx_markets), self.source_failures = await self._fetch_all_sources()
+            if self.source_failures:
+                self.logger.warning(f"Cycle running without data from: {', '.join(self.source_failures)}")
             
             # Step 3: Normalize all data to canonical events
             events = await self._normalize_all_events(sn_posts, polymarket_markets, predyx_markets)
@@ -65,6 +82,31 @@ class ArbitrageScout:
             self.logger.error(f"Error in discovery cycle: {e}")
             raise
     
+    async def _fetch_all_sources(self):
+        """
+        Fetch all sources concurrently; a failing source yields no data instead of aborting the cycle
+        
+        Returns ([sn_posts, polymarket_markets, predyx_markets], failures) where
+        failures maps each source that raised to its exception.
+        """
+        sources = ("stacker_news", "polymarket", "predyx")
+        results = await asyncio.gather(
+            self._fetch_stacker_news_signals(),
+            self._fetch_polymarket_markets(),
+            self._fetch_predyx_markets(),
+            return_exceptions=True,
+        )
+        
+        fetched = []
+        failures = {}
+        for source, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Error fetching {source} data: {result!r}", exc_info=result)
+                failures[source] = result
+                result = []
+            fetched.append(result)
+        return fetched, failures
+    
     async def _fetch_stacker_news_signals(self):
         """Fetch signals from Stacker News"""
         # TODO: Implement entity/keyword search
@@ -111,36 +153,50 @@ class ArbitrageScout:
         # Group events by venue
         events_by_venue = {}
         for event in events:
-            venue = event.venue.value
+            venue = event.venue.label
             if venue not in events_by_venue:
                 events_by_venue[venue] = []
             events_by_venue[venue].append(event)
         
-        # Find matches between venue pairs
-        all_matches = []
+        # Find matches between venue pairs, each pair in a worker thread
         venues = list(events_by_venue.keys())
+        pair_results = await asyncio.gather(*(
+            asyncio.to_thread(
+                self._match_venue_pair,
+                events_by_venue[venue_a],
+                events_by_venue[venue_b]
+            )
+            for venue_a, venue_b in combinations(venues, 2)
+        ))
+        all_matches = list(chain.from_iterable(pair_results))
         
-        for i in range(len(venues)):
-            for j in range(i + 1, len(venues)):
-                venue_a, venue_b = venues[i], venues[j]
-                matches = self.matcher.find_matches(
-                    events_by_venue[venue_a], 
-                    events_by_venue[venue_b]
-                )
-                all_matches.extend(matches)
-        
-        # Queue low-confidence matches for human review
+        # Single pass: queue low-confidence matches for human review and keep
+        # only those confident enough for the arbitrage detector
+        min_confidence = self.arbitrage_detector.min_match_confidence
+        tradeable_matches = []
         for match in all_matches:
             if match.human_review_required:
                 self.review_queue.add_for_review(match)
+            if match.confidence_score >= min_confidence:
+                tradeable_matches.append(match)
         
-        self.logger.info(f"Found {len(all_matches)} potential matches")
-        return all_matches
+        self.logger.info(f"Found {len(all_matches)} potential matches, "
+                         f"{len(tradeable_matches)} above detector confidence")
+        return tradeable_matches
+    
+    def _match_venue_pair(self, events_a, events_b):
+        """Match two venues' events (find_matches does its own entity/category-week blocking)"""
+        return self.matcher.find_matches(events_a, events_b)
     
     async def _detect_arbitrage_opportunities(self, matches):
         """Detect arbitrage opportunities from matches"""
-        opportunities = self.arbitrage_detector.scan_for_arbitrage(matches)
-        self.logger.info(f"Detected {len(opportunities)} arbitrage opportunities")
+        # Only opportunities that can trigger an alert are built and ranked
+        opportunities = self.arbitrage_detector.scan_for_arbitrage(
+            matches,
+            top_k=self.config.get('max_alerts'),
+            min_net_edge=self.config.get('alert_threshold', 0.03)
+        )
+        self.logger.info(f"Detected {len(opportunities)} arbitrage opportunities above alert threshold")
         return opportunities
     
     async def _process_opportunities(self, opportunities):
@@ -179,17 +235,17 @@ DEFAULT_CONFIG = {
     'min_edge': 0.02,  # 2% minimum edge
     'max_slippage': 0.01,  # 1% max slippage
     'alert_threshold': 0.03,  # 3% profit threshold for alerts
+    'max_alerts': None,  # Only alert on the N best opportunities per cycle (None = all)
 }
 
 async def main():
     """Example main function"""
-    scout = ArbitrageScout(DEFAULT_CONFIG)
-    
-    # Run single cycle
-    await scout.run_discovery_cycle()
-    
-    # Or run continuous monitoring
-    # await scout.run_continuous(cycle_interval_seconds=300)
+    async with ArbitrageScout(DEFAULT_CONFIG) as scout:
+        # Run single cycle
+        await scout.run_discovery_cycle()
+        
+        # Or run continuous monitoring
+        # await scout.run_continuous(cycle_interval_seconds=300)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -3,29 +3,58 @@
 Connectors package for multi-venue market data ingestion
 """
 
-from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Protocol, runtime_checkable
 from datetime import datetime
 
-class BaseConnector(ABC):
-    """Abstract base class for all market data connectors"""
+import aiohttp
+
+@runtime_checkable
+class BaseConnector(Protocol):
+    """Structural interface for all market data connectors
+    
+    Any class with these methods is a connector; no inheritance (and no ABC
+    metaclass) required.
+    """
     
-    @abstractmethod
     async def fetch_markets(self) -> List[Dict]:
         """Fetch current markets from the venue"""
-        pass
+        ...
     
-    @abstractmethod
     async def fetch_prices(self, market_id: str) -> Dict:
         """Fetch current price data for a specific market"""
-        pass
+        ...
     
-    @abstractmethod
     def get_venue_name(self) -> str:
         """Return the venue identifier"""
-        pass
+        ...
+    
+    async def close(self) -> None:
+        """Release any network resources held by the connector"""
+        ...
 
-class StackerNewsConnector(BaseConnector):
+class PooledSessionMixin:
+    """Lazily created aiohttp session kept open across discovery cycles
+    
+    Reusing one pooled session avoids a fresh TCP + TLS handshake for every
+    request in run_continuous. Call close() on shutdown.
+    """
+    
+    _session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def close(self):
+        """Close the pooled session, if one was opened"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+class StackerNewsConnector(PooledSessionMixin):
     """Connector for Stacker News GraphQL API - signal feed"""
     
     def __init__(self, graphql_endpoint: str = "https://stacker.news/api/graphql"):
@@ -48,17 +77,27 @@ class StackerNewsConnector(BaseConnector):
     def get_venue_name(self) -> str:
         return "stacker_news"
 
-class PolymarketConnector(BaseConnector):
+class PolymarketConnector(PooledSessionMixin):
     """Connector for Polymarket via Gamma Markets REST API"""
     
-    def __init__(self, gamma_api_base: str = "https://gamma-api.polymarket.com"):
+    def __init__(self, gamma_api_base: str = "https://gamma-api.polymarket.com",
+                 markets_limit: int = 500):
         self.gamma_base = gamma_api_base
         self.data_api_base = "https://data-api.polymarket.com"  # For trades data
+        self.markets_limit = markets_limit  # Markets requested per fetch_markets call
         
     async def fetch_markets(self) -> List[Dict]:
-        """Fetch markets via Gamma Markets API"""
-        # TODO: Implement get-markets endpoint
-        pass
+        """Fetch open markets via the Gamma Markets API (one page of markets_limit)
+        
+        HTTP errors are raised, so the scout reports the venue as failed
+        rather than empty.
+        """
+        session = await self._get_session()
+        params = {"active": "true", "closed": "false", "limit": str(self.markets_limit)}
+        async with session.get(f"{self.gamma_base}/markets", params=params,
+                               timeout=aiohttp.ClientTimeout(total=30)) as response:
+            response.raise_for_status()
+            return await response.json()
     
     async def fetch_prices(self, market_id: str) -> Dict:
         """Fetch price data and order book depth"""
@@ -73,7 +112,7 @@ class PolymarketConnector(BaseConnector):
     def get_venue_name(self) -> str:
         return "polymarket"
 
-class PredyxConnector(BaseConnector):
+class PredyxConnector(PooledSessionMixin):
     """Connector for Predyx via web scraping (until API available)"""
     
     def __init__(self, base_url: str = "https://beta.predyx.com"):
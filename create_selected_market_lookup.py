@@ -1,50 +1,70 @@
+import csv
 import json
-import os
-from generate_market_lookup_json import create_market_lookup
+import warnings
+from datetime import datetime, timezone
+from generate_market_lookup_json import CSV_ENCODINGS, market_data_is_valid, safe_parse_tokens
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
 def create_selected_market_lookup(selected_slugs, input_csv='./data/markets_data.csv', 
-                                 temp_lookup='./data/temp_market_lookup.json',
+                                 temp_lookup=None,
                                  output_json='./data/selected_market_lookup.json'):
     """
     Create a filtered market lookup JSON containing only specified market slugs.
     
+    Streams the markets CSV once and keeps only rows whose slug was requested,
+    so memory stays proportional to the selection rather than the full dataset.
+    
     Args:
         selected_slugs (list): List of market slugs to include in the filtered lookup
         input_csv (str): Path to the markets data CSV file
-        temp_lookup (str): Path for temporary full market lookup file
+        temp_lookup (str): Deprecated and ignored; no temporary full lookup is written any more
         output_json (str): Path for the filtered output JSON file
     """
+    if temp_lookup is not None:
+        warnings.warn("create_selected_market_lookup(temp_lookup=...) is ignored: the CSV is "
+                      "now filtered directly, without a temporary full lookup",
+                      DeprecationWarning, stacklevel=2)
     
-    # First, create the full market lookup JSON
-    print("Creating temporary full market lookup...")
-    create_market_lookup(input_csv, temp_lookup)
-    
-    # Load the full market lookup
-    with open(temp_lookup, 'r') as f:
-        full_lookup = json.load(f)
+    selected_set = set(selected_slugs)
     
-    # Filter for selected slugs
-    selected_lookup = {}
-    found_slugs = []
+    # Filter for selected slugs while reading the CSV
+    print(f"Scanning {input_csv} for {len(selected_set)} selected slugs...")
+    run_timestamp = datetime.now(timezone.utc).isoformat()
     
-    for condition_id, market_data in full_lookup.items():
-        if market_data['market_slug'] in selected_slugs:
-            selected_lookup[condition_id] = market_data
-            found_slugs.append(market_data['market_slug'])
+    # Same encoding fallbacks as read_csv_with_fallback: a decode error part
+    # way through restarts the scan with the next encoding
+    last_error = None
+    for encoding in CSV_ENCODINGS:
+        try:
+            selected_lookup = _scan_selected_rows(input_csv, selected_set, run_timestamp, encoding, 'strict')
+            if encoding != 'utf-8':
+                print(f"Warning: UTF-8 failed, using {encoding} encoding")
+            break
+        except UnicodeDecodeError as exc:
+            last_error = exc
+    else:
+        print(f"Warning: Falling back to UTF-8 with replacement due to decode error: {last_error}")
+        selected_lookup = _scan_selected_rows(input_csv, selected_set, run_timestamp, 'utf-8', 'replace')
     
-    # Save the filtered lookup
-    with open(output_json, 'w') as f:
-        json.dump(selected_lookup, f, indent=4)
+    found_slugs = [market_data['market_slug'] for market_data in selected_lookup.values()]
     
-    # Clean up temporary file
-    if os.path.exists(temp_lookup):
-        os.remove(temp_lookup)
+    # Save the filtered lookup (orjson serializes straight to bytes)
+    if orjson is not None:
+        with open(output_json, 'wb') as f:
+            f.write(orjson.dumps(selected_lookup))
+    else:
+        with open(output_json, 'w') as f:
+            json.dump(selected_lookup, f)
     
     # Report results
     print(f"Selected market lookup created: {output_json}")
     print(f"Found {len(selected_lookup)} markets from {len(selected_slugs)} requested slugs")
     
-    missing_slugs = set(selected_slugs) - set(found_slugs)
+    missing_slugs = selected_set - set(found_slugs)
     if missing_slugs:
         print(f"Missing slugs not found in data: {list(missing_slugs)}")
     
@@ -52,6 +72,45 @@ def create_selected_market_lookup(selected_slugs, input_csv='./data/markets_data
     
     return selected_lookup
 
+def _scan_selected_rows(input_csv, selected_set, last_updated, encoding, errors):
+    """Lookup entries for the CSV rows whose slug is in selected_set"""
+    selected_lookup = {}
+    with open(input_csv, 'r', newline='', encoding=encoding, errors=errors) as f:
+        for row in csv.DictReader(f):
+            if row.get('market_slug') not in selected_set:
+                continue
+            
+            condition_id = row.get('condition_id', '')
+            market_entry = _build_market_entry(row, last_updated)
+            if market_entry is None:
+                print(f"Skipping invalid market row for {row['market_slug']} ({condition_id})")
+                continue
+            
+            # Later rows win, matching the keep='last' dedup of the full lookup
+            selected_lookup[condition_id] = market_entry
+    return selected_lookup
+
+def _build_market_entry(row, last_updated):
+    """Build a lookup entry from a CSV row, or None if the row fails validation"""
+    condition_id = row.get('condition_id', '')
+    description = row.get('description', '')
+    market_slug = row['market_slug']
+    tokens_list = safe_parse_tokens(row.get('tokens', ''))
+    
+    if not market_data_is_valid(condition_id, description, market_slug, tokens_list):
+        return None
+    
+    tokens_info = [
+        {"token_id": str(token["token_id"]), "outcome": str(token["outcome"])}
+        for token in tokens_list
+    ]
+    return {
+        "description": description,
+        "market_slug": market_slug,
+        "tokens": tokens_info,
+        "last_updated": last_updated
+    }
+
 if __name__ == "__main__":
     # Example usage with selected market slugs
     selected_market_slugs = [
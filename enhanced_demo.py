@@ -7,30 +7,69 @@ Shows the improved flexible query matching system in action
 import requests
 import json
 import re
+import heapq
+from collections import namedtuple
+from functools import lru_cache
+from operator import attrgetter
 from difflib import SequenceMatcher
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # pragma: no cover
+    fuzz = None  # type: ignore[assignment]
+
+from levenshtein import JIT_AVAILABLE, levenshtein_ratio
+
+# Compiled once at import instead of on every normalize_text call
+_NON_WORD = re.compile(r'[^\w\s]')
+_MULTI_WS = re.compile(r'\s+')
+
+_IMPORTANT_TERMS = frozenset({
+    'election', 'win', 'wins', 'winner', 'president', 'presidential', 
+    'senate', 'governor', 'house', 'congress', 'primary', 'general',
+    'democrat', 'republican', 'party', 'candidate', 'nominee'
+})
+
+# Strategy 4 templates ({c} = contract name, {m} = market name) and the
+# Strategy 6 keyword test, built once rather than per call
+_ELECTION_PATTERNS = (
+    "Will {c} win the {m}",
+    "{c} to win {m}",
+    "Will {c} be elected",
+    "{c} {m}",
+)
+_ELECTION_RE = re.compile(r'election|president|governor|senate')
+
+# Names scoring below this get a generic "Will X win" bridge query
+_BRIDGE_THRESHOLD = 0.3
+
+# One candidate Polymarket query; a tuple is far lighter than a dict per variation
+Variation = namedtuple('Variation', ('query', 'confidence', 'strategy'))
+
 # Enhanced query generation functions
+# The same market name is normalized for every contract and strategy, so the
+# text helpers are memoized; extract_key_terms returns a tuple to stay hashable
+@lru_cache(maxsize=8192)
 def normalize_text(text):
     """Clean and normalize text for better matching"""
     if not text:
         return ""
-    text = re.sub(r'[^\w\s]', ' ', text.lower())
-    text = re.sub(r'\s+', ' ', text.strip())
-    return text
+    return _MULTI_WS.sub(' ', _NON_WORD.sub(' ', text.lower())).strip()
 
+@lru_cache(maxsize=8192)
 def extract_key_terms(text):
     """Extract key terms from market/contract names"""
     if not text:
-        return []
-    
-    important_terms = {
-        'election', 'win', 'wins', 'winner', 'president', 'presidential', 
-        'senate', 'governor', 'house', 'congress', 'primary', 'general',
-        'democrat', 'republican', 'party', 'candidate', 'nominee'
-    }
+        return ()
     
     words = normalize_text(text).split()
-    key_terms = [w for w in words if w in important_terms or len(w) > 3]
+    # Length test first: only short words pay for the set lookup
+    key_terms = tuple(w for w in words if len(w) > 3 or w in _IMPORTANT_TERMS)
     return key_terms
 
 def generate_query_variations(contract, market):
@@ -38,54 +77,33 @@ def generate_query_variations(contract, market):
     variations = []
     contract_name = contract['name']
     market_name = market['name']
+    # Lower-cased once; every strategy below tests against these
+    mn_lower = market_name.lower()
+    cn_lower = contract_name.lower()
+    win_idx = mn_lower.find("win")
     
     # Strategy 1: Original rigid pattern
-    if 'win' in market_name.lower() and market_name.lower() != contract_name.lower():
-        try:
-            query = "Will " + contract_name + " " + market_name[market_name.lower().index("win"):]
-            variations.append({
-                'query': query,
-                'confidence': 0.9,
-                'strategy': 'original_pattern'
-            })
-        except:
-            pass
+    if win_idx != -1 and mn_lower != cn_lower:
+        query = "Will " + contract_name + " " + market_name[win_idx:]
+        variations.append(Variation(query, 0.9, 'original_pattern'))
     
     # Strategy 2: Direct contract name
-    if market_name.lower() == contract_name.lower():
-        variations.append({
-            'query': contract_name,
-            'confidence': 0.8,
-            'strategy': 'direct_name'
-        })
+    if mn_lower == cn_lower:
+        variations.append(Variation(contract_name, 0.8, 'direct_name'))
     
     # Strategy 3: Constructed "Will X win Y"
-    if 'win' not in market_name.lower():
+    if win_idx == -1:
         key_terms = extract_key_terms(market_name)
         if key_terms:
             query = f"Will {contract_name} win {' '.join(key_terms[:3])}"
-            variations.append({
-                'query': query,
-                'confidence': 0.75,
-                'strategy': 'constructed_win'
-            })
+            variations.append(Variation(query, 0.75, 'constructed_win'))
     
     # Strategy 4: Election-specific patterns
-    election_patterns = [
-        f"Will {contract_name} win the {market_name}",
-        f"{contract_name} to win {market_name}",
-        f"Will {contract_name} be elected",
-        f"{contract_name} {market_name}",
-    ]
-    
-    for i, pattern in enumerate(election_patterns):
-        clean_pattern = re.sub(r'\s+', ' ', pattern).strip()
+    names = {'c': contract_name, 'm': market_name}
+    for i, template in enumerate(_ELECTION_PATTERNS):
+        clean_pattern = _MULTI_WS.sub(' ', template.format_map(names)).strip()
         if len(clean_pattern.split()) >= 3:
-            variations.append({
-                'query': clean_pattern,
-                'confidence': 0.7 - (i * 0.05),
-                'strategy': f'election_pattern_{i+1}'
-            })
+            variations.append(Variation(clean_pattern, 0.7 - (i * 0.05), f'election_pattern_{i+1}'))
     
     # Strategy 5: Fuzzy reconstruction
     contract_terms = extract_key_terms(contract_name)
@@ -94,34 +112,39 @@ def generate_query_variations(contract, market):
     if contract_terms and market_terms:
         combined_terms = contract_terms[:2] + market_terms[:2]
         fuzzy_query = f"Will {' '.join(combined_terms)}"
-        variations.append({
-            'query': fuzzy_query,
-            'confidence': 0.65,
-            'strategy': 'fuzzy_reconstruction'
-        })
+        variations.append(Variation(fuzzy_query, 0.65, 'fuzzy_reconstruction'))
     
     # Strategy 6: Simple election
-    if any(term in market_name.lower() for term in ['election', 'president', 'governor', 'senate']):
+    if _ELECTION_RE.search(mn_lower):
         simple_query = f"{contract_name} election"
-        variations.append({
-            'query': simple_query,
-            'confidence': 0.6,
-            'strategy': 'simple_election'
-        })
+        variations.append(Variation(simple_query, 0.6, 'simple_election'))
     
     # Strategy 7: Similarity bridge
-    similarity = SequenceMatcher(None, normalize_text(contract_name), normalize_text(market_name)).ratio()
-    if similarity < 0.3:
+    if _needs_similarity_bridge(normalize_text(contract_name), normalize_text(market_name)):
         bridge_query = f"Will {contract_name} win"
-        variations.append({
-            'query': bridge_query,
-            'confidence': 0.55,
-            'strategy': 'similarity_bridge'
-        })
+        variations.append(Variation(bridge_query, 0.55, 'similarity_bridge'))
     
-    variations.sort(key=lambda x: x['confidence'], reverse=True)
-    return variations[:5]
+    return heapq.nlargest(5, variations, key=attrgetter('confidence'))
+
+def name_similarity(a, b):
+    """0-1 similarity of two normalized names (rapidfuzz's C++ ratio, else a
+    Numba Levenshtein, else difflib)"""
+    if fuzz is not None:
+        return fuzz.ratio(a, b) / 100.0
+    if JIT_AVAILABLE:
+        return levenshtein_ratio(a, b)
+    return SequenceMatcher(None, a, b).ratio()
 
+def _needs_similarity_bridge(a, b):
+    """True when the names are too dissimilar (< _BRIDGE_THRESHOLD) to share a query"""
+    total = len(a) + len(b)
+    # Every name_similarity scorer is bounded by 2 * min(len) / total, so when
+    # the bound is already below the threshold the O(n*m) ratio is skipped
+    if total and 2 * min(len(a), len(b)) / total < _BRIDGE_THRESHOLD - 1e-9:
+        return True
+    return name_similarity(a, b) < _BRIDGE_THRESHOLD
+
+@lru_cache(maxsize=8192)
 def mock_get_polymarket_values(query):
     """Mock function that simulates Polymarket matching"""
     # Simple keyword-based mock matching
@@ -129,6 +152,25 @@ def mock_get_polymarket_values(query):
         return f"Mock match for: {query[:50]}...", 30, 0.65, 0.35
     return None, None, None, None
 
+def mock_get_polymarket_values_batch(queries):
+    """Look up several queries in one call, resolving each distinct query once
+    
+    Stands in for a batched Polymarket lookup; a real client would send the
+    distinct queries concurrently in a single round trip.
+    """
+    results = {query: mock_get_polymarket_values(query) for query in dict.fromkeys(queries)}
+    return [results[query] for query in queries]
+
+def rigid_query(contract_name, market_name):
+    """The original get_full_list() query: "Will <contract> win..." or the bare name"""
+    market_lower = market_name.lower()
+    if market_lower == contract_name.lower():
+        return contract_name
+    win_idx = market_lower.find("win")
+    if win_idx != -1:
+        return "Will " + contract_name + " " + market_name[win_idx:]
+    return None
+
 def check_for_arbitrage(poly_yes, poly_no, pred_yes, pred_no):
     """Mock arbitrage checker"""
     if all(x is not None for x in [poly_yes, poly_no, pred_yes, pred_no]):
@@ -155,7 +197,8 @@ def get_full_list_enhanced_demo(limit=15):
             print(f"❌ Failed to fetch PredictIt data: {response.status_code}")
             return
         
-        data = json.loads(response.content)
+        # orjson parses the raw body bytes directly; stdlib json is the fallback
+        data = orjson.loads(response.content) if orjson is not None else json.loads(response.content)
         print(f"📊 Retrieved {len(data['markets'])} PredictIt markets")
         
     except Exception as e:
@@ -178,30 +221,29 @@ def get_full_list_enhanced_demo(limit=15):
         print(f"\n📈 MARKET: {market['name'][:60]}...")
         print("  " + "-" * 50)
         
-        for contract in market['contracts'][:8]:  # Max 8 contracts per market
-            if total_tested >= limit:
-                break
-                
+        market_name = market['name']
+        contracts = market['contracts'][:min(8, limit - total_tested)]  # Max 8 contracts per market
+        
+        # Plan every contract's queries first so the whole market is looked up
+        # in one deduplicated batch rather than one call per query
+        planned = [
+            (contract, rigid_query(contract['name'], market_name), generate_query_variations(contract, market))
+            for contract in contracts
+        ]
+        queries = [query for _, old_query, variations in planned
+                   for query in ([old_query] if old_query else []) + [var.query for var in variations]]
+        lookups = dict(zip(queries, mock_get_polymarket_values_batch(queries)))
+        
+        for contract, old_query, variations in planned:
             total_tested += 1
             contract_name = contract['name']
-            market_name = market['name']
             
             print(f"\n  📋 Contract {total_tested}: {contract_name}")
             
-            # OLD METHOD: Rigid pattern matching
-            old_query = None
-            if market_name.lower() != contract_name.lower():
-                try:
-                    if 'win' in market_name.lower():
-                        old_query = "Will " + contract_name + " " + market_name[market_name.lower().index("win"):]
-                except:
-                    pass
-            else:
-                old_query = contract_name
-            
+            # OLD METHOD: Rigid pattern matching (looked up once, reused by the improvement check)
+            old_found = bool(old_query) and lookups[old_query][0] is not None
             if old_query:
-                old_match = mock_get_polymarket_values(old_query)
-                if old_match[0]:
+                if old_found:
                     old_method_matches += 1
                     print(f"    ✅ OLD METHOD: Found match")
                     print(f"       Query: {old_query[:50]}...")
@@ -212,8 +254,6 @@ def get_full_list_enhanced_demo(limit=15):
                 print(f"    ❌ OLD METHOD: No query generated")
             
             # NEW METHOD: Enhanced flexible matching
-            variations = generate_query_variations(contract, market)
-            
             if variations:
                 print(f"    🔄 NEW METHOD: Generated {len(variations)} variations:")
                 
@@ -221,30 +261,24 @@ def get_full_list_enhanced_demo(limit=15):
                 best_confidence = 0
                 
                 for var in variations:
-                    query = var['query']
-                    strategy = var['strategy']
-                    confidence = var['confidence']
+                    query, confidence, strategy = var
                     
-                    match = mock_get_polymarket_values(query)
+                    match = lookups[query]
                     if match[0]:
                         final_confidence = confidence * 0.7 + 0.3
                         if final_confidence > best_confidence:
-                            best_match = {
-                                'query': query,
-                                'strategy': strategy,
-                                'confidence': final_confidence
-                            }
+                            best_match = Variation(query, final_confidence, strategy)
                             best_confidence = final_confidence
                 
                 if best_match:
                     new_method_matches += 1
                     print(f"    ✅ NEW METHOD: Found match!")
-                    print(f"       Strategy: {best_match['strategy']}")
-                    print(f"       Confidence: {best_match['confidence']:.1%}")
-                    print(f"       Query: {best_match['query'][:50]}...")
+                    print(f"       Strategy: {best_match.strategy}")
+                    print(f"       Confidence: {best_match.confidence:.1%}")
+                    print(f"       Query: {best_match.query[:50]}...")
                     
                     # Check if this is an improvement over old method
-                    if not old_query or not mock_get_polymarket_values(old_query)[0]:
+                    if not old_found:
                         improved_matches += 1
                         print(f"    🎯 IMPROVEMENT: New method found match where old failed!")
                 else:
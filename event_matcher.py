@@ -3,28 +3,81 @@
 Event Matching Engine - Cross-venue event linking and similarity detection
 """
 
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Deque
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import attrgetter
 from dataclasses import dataclass
+from enum import IntFlag
 from datetime import datetime, timedelta
-import hashlib
+from difflib import SequenceMatcher
+import heapq
+import os
 
-from event_model import Event
+import numpy as np
 
-@dataclass
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover
+    fuzz = None  # type: ignore[assignment]
+    process = None  # type: ignore[assignment]
+
+from event_model import Event, EventTable, DATACLASS_SLOTS
+
+class RiskBits(IntFlag):
+    """Potential issues with a match, packed into one int; names decode to risk factor tags"""
+    DIFFERENT_RESOLUTION_SOURCES = 1
+    DEADLINE_MISMATCH_GT_WEEK = 2
+    DIFFERENT_MARKET_TYPES = 4
+    TRANSITIVE_MATCH = 8
+
+@dataclass(**DATACLASS_SLOTS)
 class MatchResult:
     """Result of cross-venue event matching"""
     event_a: Event
     event_b: Event
     confidence_score: float
     match_strategies: List[str]  # Which strategies contributed to the match
-    risk_factors: List[str]  # Potential issues with this match
+    risk_mask: int  # RiskBits of potential issues with this match
     human_review_required: bool
+    
+    @property
+    def risk_factor_names(self) -> List[str]:
+        """Decode risk_mask into tags such as "deadline_mismatch_gt_week", for reviewers"""
+        return [bit.name.lower() for bit in RiskBits if self.risk_mask & bit]
+    
+    @property
+    def risk_factors(self) -> List[str]:
+        """Read-only alias of risk_factor_names, for callers of the old list field"""
+        return self.risk_factor_names
+    
+    @property
+    def risk_count(self) -> int:
+        """Number of risk factors set in risk_mask"""
+        return bin(self.risk_mask).count("1")
+
+def _match_rows(matcher: "EventMatcher", events_a: List[Event], events_b: List[Event]) -> List[Tuple]:
+    """Process-pool worker: matches for one chunk of events_a as plain index tuples
+    
+    Only indices and scores travel back, not pickled copies of the events.
+    """
+    return [
+        (row, position, match_result.confidence_score, match_result.match_strategies,
+         match_result.risk_mask, match_result.human_review_required)
+        for row, position, match_result in matcher._iter_matches(events_a, events_b)
+    ]
 
 class EventMatcher:
     """Matches events across venues using multiple strategies"""
     
-    def __init__(self, confidence_threshold: float = 0.75):
+    def __init__(self, confidence_threshold: float = 0.75, max_deadline_gap_days: int = 31,
+                 parallel_min_pairs: int = 250_000, max_workers: Optional[int] = None):
         self.confidence_threshold = confidence_threshold
+        self.max_deadline_gap_days = max_deadline_gap_days  # Candidate pairs further apart are skipped
+        # Below this many pairs, process startup and pickling outweigh the parallel speedup
+        self.parallel_min_pairs = parallel_min_pairs
+        self.max_workers = max_workers  # None = os.cpu_count()
         self.match_strategies = {
             "exact_title": self._exact_title_match,
             "fuzzy_title": self._fuzzy_title_match,
@@ -34,32 +87,145 @@ class EventMatcher:
             "temporal_alignment": self._temporal_alignment_check,
         }
     
-    def find_matches(self, events_a: List[Event], events_b: List[Event]) -> List[MatchResult]:
-        """Find all potential matches between two event lists"""
-        matches = []
+    def find_matches(self, events_a: List[Event], events_b: List[Event],
+                     top_k: Optional[int] = None) -> List[MatchResult]:
+        """Find all potential matches between two event lists
         
-        for event_a in events_a:
-            for event_b in events_b:
-                if event_a.venue == event_b.venue:
-                    continue  # Skip same-venue comparisons
-                
-                match_result = self._evaluate_match(event_a, event_b)
-                if match_result and match_result.confidence_score >= self.confidence_threshold:
-                    matches.append(match_result)
+        Only pairs that share an entity, or a category and deadline ISO week,
+        are evaluated; the rest of the N x M product is never visited. Inputs
+        of at least parallel_min_pairs pairs are split across worker processes.
+        top_k keeps only the k most confident matches.
+        """
+        if len(events_a) * len(events_b) >= self.parallel_min_pairs and len(events_a) > 1:
+            matches = self._find_matches_parallel(events_a, events_b)
+        else:
+            matches = self.find_matches_serial(events_a, events_b)
         
+        if top_k is not None:
+            return heapq.nlargest(top_k, matches, key=attrgetter('confidence_score'))
+        return matches
+    
+    def find_matches_serial(self, events_a: List[Event], events_b: List[Event]) -> List[MatchResult]:
+        """find_matches in the calling process; cheaper than a pool for small inputs"""
+        return [match_result for _, _, match_result in self._iter_matches(events_a, events_b)]
+    
+    def _find_matches_parallel(self, events_a: List[Event], events_b: List[Event]) -> List[MatchResult]:
+        """Fan rows of events_a out to a process pool, keeping serial result order"""
+        workers = self.max_workers or os.cpu_count() or 1
+        chunk_size = max(1, -(-len(events_a) // (workers * 4)))
+        offsets = range(0, len(events_a), chunk_size)
+        
+        matches = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_results = executor.map(
+                partial(_match_rows, self, events_b=events_b),
+                (events_a[offset:offset + chunk_size] for offset in offsets),
+            )
+            # Workers return indices, so results reference the caller's own Event objects
+            for offset, rows in zip(offsets, chunk_results):
+                for row, position, score, strategies, risk_mask, review in rows:
+                    matches.append(MatchResult(
+                        event_a=events_a[offset + row],
+                        event_b=events_b[position],
+                        confidence_score=score,
+                        match_strategies=strategies,
+                        risk_mask=risk_mask,
+                        human_review_required=review
+                    ))
         return matches
     
-    def _evaluate_match(self, event_a: Event, event_b: Event) -> Optional[MatchResult]:
-        """Evaluate if two events represent the same underlying prediction"""
+    def _iter_matches(self, events_a: List[Event], events_b: List[Event]):
+        """Yield (row in events_a, position in events_b, MatchResult) for matches above threshold"""
+        table_a = EventTable(events_a)
+        table_b = EventTable(events_b)
+        rows, positions = self._candidate_pairs(table_a, table_b)
+        eligible = self._eligible_pairs(table_a, table_b, rows, positions)
+        rows, positions = rows[eligible], positions[eligible]
+        fuzzy_scores = self._precompute_fuzzy_scores(table_a, table_b, rows, positions)
+        
+        for index, (row, position) in enumerate(zip(rows.tolist(), positions.tolist())):
+            precomputed = None
+            if fuzzy_scores is not None:
+                precomputed = {"fuzzy_title": float(fuzzy_scores[index])}
+            
+            match_result = self._evaluate_match(events_a[row], events_b[position], precomputed)
+            if match_result and match_result.confidence_score >= self.confidence_threshold:
+                yield row, position, match_result
+    
+    def _candidate_pairs(self, table_a: EventTable, table_b: EventTable) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, positions) of the pairs the blocking index proposes, row-major
+        
+        Positions within a row are in events_b order so results stay deterministic.
+        """
+        block_index, entity_index = self._build_blocking_index(table_b)
+        rows: List[int] = []
+        positions: List[int] = []
+        for row, event_a in enumerate(table_a.events):
+            candidate_positions = set(block_index.get(self._block_key(event_a), ()))
+            for entity in table_a.entities[row]:
+                candidate_positions.update(entity_index.get(entity, ()))
+            rows.extend([row] * len(candidate_positions))
+            positions.extend(sorted(candidate_positions))
+        return np.asarray(rows, dtype=np.intp), np.asarray(positions, dtype=np.intp)
+    
+    def _eligible_pairs(self, table_a: EventTable, table_b: EventTable,
+                        rows: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Mask of candidate pairs on different venues with deadlines within max_deadline_gap_days"""
+        # Same-venue pairs are skipped; far-apart deadlines would only ever be
+        # a flagged deadline mismatch. Only the candidate pairs are compared,
+        # never the dense N x M product.
+        max_gap = timedelta(days=self.max_deadline_gap_days) // timedelta(microseconds=1)
+        different_venue = table_a.venues[rows] != table_b.venues[positions]
+        deadline_gap = np.abs(table_a.deadlines[rows] - table_b.deadlines[positions])
+        return different_venue & (deadline_gap <= max_gap)
+    
+    @staticmethod
+    def _precompute_fuzzy_scores(table_a: EventTable, table_b: EventTable,
+                                 rows: np.ndarray, positions: np.ndarray) -> Optional[np.ndarray]:
+        """Fuzzy title scores for the given pairs in one batched rapidfuzz call (None without rapidfuzz)"""
+        if process is None or not len(rows):
+            return None
+        titles_a = [title.lower() for title in table_a.titles]
+        titles_b = [title.lower() for title in table_b.titles]
+        scores = process.cpdist([titles_a[row] for row in rows.tolist()],
+                                [titles_b[position] for position in positions.tolist()],
+                                scorer=fuzz.token_set_ratio, dtype=np.float32, workers=-1)
+        return scores / 100.0
+    
+    @staticmethod
+    def _block_key(event: Event) -> Tuple[str, int, int]:
+        """Category plus ISO (year, week) of the deadline"""
+        iso_year, iso_week, _ = event.deadline.isocalendar()
+        return event.category, iso_year, iso_week
+    
+    def _build_blocking_index(self, table: EventTable) -> Tuple[Dict, Dict]:
+        """Inverted indexes from block key and from entity to row positions in table"""
+        block_index = defaultdict(list)
+        entity_index = defaultdict(list)
+        for position, event in enumerate(table.events):
+            block_index[self._block_key(event)].append(position)
+            for entity in table.entities[position]:
+                entity_index[entity].append(position)
+        return block_index, entity_index
+    
+    def _evaluate_match(self, event_a: Event, event_b: Event,
+                        precomputed: Optional[Dict[str, float]] = None) -> Optional[MatchResult]:
+        """Evaluate if two events represent the same underlying prediction
+        
+        precomputed maps strategy name -> score already computed in batch;
+        those strategies are not re-run for this pair.
+        """
         
         scores = {}
         strategies_used = []
-        risk_factors = []
         
         # Run all matching strategies
         for strategy_name, strategy_func in self.match_strategies.items():
             try:
-                score = strategy_func(event_a, event_b)
+                if precomputed and strategy_name in precomputed:
+                    score = precomputed[strategy_name]
+                else:
+                    score = strategy_func(event_a, event_b)
                 if score > 0:
                     scores[strategy_name] = score
                     strategies_used.append(strategy_name)
@@ -84,13 +250,13 @@ class EventMatcher:
                          for strategy, weight in weights.items())
         
         # Risk factor detection
-        risk_factors.extend(self._detect_risk_factors(event_a, event_b))
+        risk_mask = self._detect_risk_factors(event_a, event_b)
         
         # Determine if human review needed
         human_review_required = (
             final_score < 0.9 or  # Lower confidence matches
-            len(risk_factors) > 0 or  # Any risk factors
-            abs((event_a.deadline - event_b.deadline).days) > 1  # Different deadlines
+            risk_mask != 0 or  # Any risk factors
+            abs(event_a.deadline_day - event_b.deadline_day) > 1  # Different deadlines
         )
         
         return MatchResult(
@@ -98,7 +264,7 @@ class EventMatcher:
             event_b=event_b,
             confidence_score=final_score,
             match_strategies=strategies_used,
-            risk_factors=risk_factors,
+            risk_mask=risk_mask,
             human_review_required=human_review_required
         )
     
@@ -109,13 +275,19 @@ class EventMatcher:
     
     def _fuzzy_title_match(self, event_a: Event, event_b: Event) -> float:
         """Fuzzy string matching on titles"""
-        # TODO: Implement fuzzy matching (Levenshtein, etc.)
-        pass
+        title_a = event_a.title.lower()
+        title_b = event_b.title.lower()
+        if fuzz is not None:
+            # Word-order insensitive, so "BTC above 100k by June" meets "By June, BTC above 100k"
+            return fuzz.token_set_ratio(title_a, title_b) / 100.0
+        return SequenceMatcher(None, title_a, title_b).ratio()
     
     def _entity_overlap_match(self, event_a: Event, event_b: Event) -> float:
-        """Check overlap in named entities"""
-        # TODO: Implement entity overlap scoring
-        pass
+        """Check overlap in named entities (Jaccard similarity)"""
+        shared = len(event_a.entities & event_b.entities)
+        if not shared:
+            return 0.0
+        return shared / len(event_a.entities | event_b.entities)
     
     def _semantic_embedding_match(self, event_a: Event, event_b: Event) -> float:
         """Semantic similarity using embeddings"""
@@ -132,33 +304,26 @@ class EventMatcher:
         # TODO: Implement temporal alignment scoring
         pass
     
-    def _detect_risk_factors(self, event_a: Event, event_b: Event) -> List[str]:
-        """Detect potential risks in the match"""
-        risks = []
-        
+    def _detect_risk_factors(self, event_a: Event, event_b: Event) -> int:
+        """Detect potential risks in the match as a RiskBits mask"""
         # Different resolution sources
-        if (event_a.resolution_source_url and event_b.resolution_source_url and 
-            event_a.resolution_source_url != event_b.resolution_source_url):
-            risks.append("different_resolution_sources")
+        different_sources = bool(event_a.resolution_source_url and event_b.resolution_source_url and
+                                 event_a.resolution_source_url != event_b.resolution_source_url)
         
         # Significant deadline mismatch
-        deadline_diff = abs((event_a.deadline - event_b.deadline).days)
-        if deadline_diff > 7:
-            risks.append("deadline_mismatch_gt_week")
-        
-        # Different market types
-        if event_a.market_type != event_b.market_type:
-            risks.append("different_market_types")
+        deadline_diff = abs(event_a.deadline_day - event_b.deadline_day)
         
         # TODO: Add more risk detection logic
         
-        return risks
+        return (RiskBits.DIFFERENT_RESOLUTION_SOURCES * different_sources
+                | RiskBits.DEADLINE_MISMATCH_GT_WEEK * (deadline_diff > 7)
+                | RiskBits.DIFFERENT_MARKET_TYPES * (event_a.market_type != event_b.market_type))
 
 class HumanReviewQueue:
     """Manages human review queue for low-confidence matches"""
     
     def __init__(self):
-        self.pending_reviews: List[MatchResult] = []
+        self.pending_reviews: Deque[MatchResult] = deque()  # FIFO; popleft is O(1)
     
     def add_for_review(self, match_result: MatchResult):
         """Add a match result to human review queue"""
@@ -166,9 +331,7 @@ class HumanReviewQueue:
     
     def get_next_review(self) -> Optional[MatchResult]:
         """Get next item requiring human review"""
-        if self.pending_reviews:
-            return self.pending_reviews.pop(0)
-        return None
+        return self.pending_reviews.popleft() if self.pending_reviews else None
     
     def approve_match(self, match_result: MatchResult):
         """Human approves the match"""
@@ -3,22 +3,43 @@
 Canonical Event Model - Normalization layer for cross-venue market data
 """
 
+import sys
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set
-from datetime import datetime
-from enum import Enum
+from typing import List, Dict, Optional, Set, FrozenSet
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
 
-class MarketType(Enum):
-    BINARY = "binary"
-    MULTI_OUTCOME = "multi_outcome"
-    CONTINUOUS = "continuous"
+import numpy as np
 
-class VenueType(Enum):
-    POLYMARKET = "polymarket"
-    PREDYX = "predyx"
-    STACKER_NEWS = "stacker_news"
+# __slots__ dataclasses (3.10+) drop the per-instance __dict__: smaller objects
+# and faster attribute access for the event/match/opportunity hot path.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# IntEnums compare as plain ints and pack straight into the EventTable's int8
+# columns; label keeps the lower-case string used for fee tables and output
+class MarketType(IntEnum):
+    BINARY = 0
+    MULTI_OUTCOME = 1
+    CONTINUOUS = 2
+    
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+class VenueType(IntEnum):
+    POLYMARKET = 0
+    PREDYX = 1
+    STACKER_NEWS = 2
+    
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+def intern_entities(raw_entities) -> FrozenSet[str]:
+    """Frozenset of interned entity names: overlap tests hash once and compare by identity"""
+    return frozenset(sys.intern(entity) for entity in raw_entities or ())
+
+@dataclass(**DATACLASS_SLOTS)
 class ContractSide:
     """Represents one side of a contract (YES/NO or specific outcome)"""
     side_id: str
@@ -28,7 +49,7 @@ class ContractSide:
     volume_24h: Optional[float] = None
     liquidity: Optional[float] = None
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Event:
     """Canonical representation of a predictable event across venues"""
     
@@ -38,7 +59,7 @@ class Event:
     
     # Event metadata
     title: str
-    entities: List[str]  # People, orgs, assets mentioned
+    entities: FrozenSet[str]  # People, orgs, assets mentioned (interned; any iterable is coerced)
     category: str
     resolution_criteria: str  # Plain text description
     
@@ -64,6 +85,62 @@ class Event:
     # Matching metadata
     confidence_score: Optional[float] = None  # For cross-venue matching
     match_strategy: Optional[str] = None
+    
+    # Derived: upper-cased side name -> ContractSide, built from contract_sides
+    contract_sides_by_name: Dict[str, ContractSide] = field(init=False, repr=False, compare=False)
+    # Derived: deadline as whole UTC days since the Unix epoch, so pair checks
+    # are int subtraction rather than datetime -> timedelta arithmetic
+    deadline_day: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.entities = intern_entities(self.entities)
+        self.index_contract_sides()
+        self.update_deadline_day()
+    
+    def update_deadline_day(self):
+        """Recompute deadline_day; call after reassigning deadline"""
+        self.deadline_day = _epoch_microseconds(self.deadline) // _MICROSECONDS_PER_DAY
+    
+    def index_contract_sides(self):
+        """Rebuild contract_sides_by_name; call after mutating contract_sides"""
+        sides_by_name = {}
+        for contract_side in self.contract_sides:
+            # First side wins on duplicate names, as with a linear scan
+            sides_by_name.setdefault(contract_side.name.upper(), contract_side)
+        self.contract_sides_by_name = sides_by_name
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_MICROSECONDS_PER_DAY = timedelta(days=1) // _ONE_MICROSECOND
+
+def _epoch_microseconds(moment: datetime) -> int:
+    """Exact microseconds since the Unix epoch; aware datetimes are taken in UTC"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - _EPOCH) // _ONE_MICROSECOND
+
+class EventTable:
+    """Struct-of-arrays view over a list of Events for batched matching
+    
+    The fields pair filters touch live in parallel NumPy columns, so venue and
+    deadline checks run as whole-array comparisons. Row i is events[i]; cold
+    fields (fees, source_ids, contract sides) stay on the Event objects.
+    """
+    
+    def __init__(self, events: List[Event]):
+        count = len(events)
+        self.events = events
+        self.venues = np.fromiter((e.venue for e in events), dtype=np.int8, count=count)
+        self.deadlines = np.fromiter((_epoch_microseconds(e.deadline) for e in events),
+                                     dtype=np.int64, count=count)
+        self.market_types = np.fromiter((e.market_type for e in events),
+                                        dtype=np.int8, count=count)
+        self.titles: List[str] = [e.title for e in events]
+        self.entities: List[FrozenSet[str]] = [frozenset(entity.lower() for entity in e.entities)
+                                               for e in events]
+    
+    def __len__(self) -> int:
+        return len(self.events)
 
 class EventNormalizer:
     """Transforms venue-specific market data into canonical Event objects"""
@@ -1,12 +1,54 @@
+import asyncio
 import os
 import re
+import sys
 import requests
 import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from typing import NamedTuple, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from py_clob_client.client import ClobClient
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None  # type: ignore[assignment]
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore[assignment]
+
+try:
+    import pyarrow  # only probed: enables pandas' Arrow-backed string dtype
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore[assignment]
+
+try:
+    from rapidfuzz import fuzz, process
+    from rapidfuzz.distance import Levenshtein
+    from rapidfuzz.utils import default_process
+except ImportError:  # pragma: no cover
+    fuzz = process = Levenshtein = default_process = None  # type: ignore[assignment]
+
+from levenshtein import JIT_AVAILABLE, levenshtein_ratio
+
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 api_key = os.getenv('API_KEY')
@@ -16,6 +58,62 @@ host = "https://clob.polymarket.com"
 chain_id = 137
 client = ClobClient(host, key=api_key, chain_id=chain_id)
 
+WEB_API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://polymarket.com/',
+    'Origin': 'https://polymarket.com'
+}
+WEB_API_MAX_WORKERS = 8
+
+# One pooled keep-alive session for all web API probes: the endpoints share a
+# handful of hosts, so reused connections skip repeated TCP/TLS handshakes
+SESSION = requests.Session()
+SESSION.headers.update(WEB_API_HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
+# Endpoints that failed to connect (or kept returning 5xx) are skipped for the
+# cooldown. They are keyed by host + path, so one failing route doesn't take
+# the other routes on the same host down with it; query variants of a path
+# share its entry. A 4xx only means this slug isn't there, so it doesn't count.
+DEAD_ENDPOINT_COOLDOWN = 300  # seconds
+_dead_endpoints = {}  # host + path -> time.monotonic() at which it may be probed again
+
+def _endpoint_key(endpoint):
+    """Cooldown key of a web API URL: host and path, without the query"""
+    parsed = urlparse(endpoint)
+    return parsed.netloc + parsed.path
+
+def _endpoint_cooling_down(endpoint_key):
+    """True while endpoint_key is inside its dead-endpoint cooldown"""
+    return _dead_endpoints.get(endpoint_key, 0) > time.monotonic()
+
+def _mark_endpoint_dead(endpoint_key):
+    """Skip endpoint_key for the next DEAD_ENDPOINT_COOLDOWN seconds"""
+    _dead_endpoints[endpoint_key] = time.monotonic() + DEAD_ENDPOINT_COOLDOWN
+
+class UrlInfo(NamedTuple):
+    """What extract_market_info_from_url pulls out of a Polymarket URL"""
+    full_url: str
+    slug: Optional[str]
+    tid: Optional[str]
+    event_type: Optional[str]  # 'event' or 'market'
+    path_parts: Tuple[str, ...]
+
+# Anything unusual (whitespace, ;params, no scheme) misses and goes through urlparse
+_MARKET_URL_RE = re.compile(
+    r'(?i:https?)://[^/?#;\s]*/'
+    r'(?P<path>(?P<event_type>event|market)/(?P<slug>[^/?#;\s]+)[^?#;\s]*)'
+    r'(?:\?(?P<query>[^#\s]*))?(?:#\S*)?\Z'
+)
+_TID_PARAM_RE = re.compile(r'(?:^|&)tid=([^&]*)')
+
+@lru_cache(maxsize=256)
 def extract_market_info_from_url(url):
     """
     Extract market slug and TID from a Polymarket URL.
@@ -24,46 +122,38 @@ def extract_market_info_from_url(url):
         url (str): Polymarket URL like https://polymarket.com/event/will-trump-resign-today?tid=1756938040931
     
     Returns:
-        dict: Contains 'slug', 'tid', and other extracted info
+        UrlInfo: slug, tid and the other extracted info; immutable, so the
+        memoized instance is safe to share between callers
     """
+    # Fast path: one regex match for the usual https://polymarket.com/event/<slug>?tid=<n>
+    match = _MARKET_URL_RE.match(url)
+    if match:
+        tid_match = _TID_PARAM_RE.search(match['query'] or '')
+        tid = tid_match[1] if tid_match else None
+        # Percent-encoded or blank tids need parse_qs's decoding/skipping rules
+        if tid is None or (tid and '%' not in tid and '+' not in tid):
+            path_parts = tuple(match['path'].strip('/').split('/'))
+            return UrlInfo(url, match['slug'], tid, match['event_type'], path_parts)
+    
     parsed = urlparse(url)
-    path_parts = parsed.path.strip('/').split('/')
+    path_parts = tuple(parsed.path.strip('/').split('/'))
     
-    result = {
-        'full_url': url,
-        'slug': None,
-        'tid': None,
-        'event_type': None,
-        'path_parts': path_parts
-    }
+    slug = event_type = tid = None
     
     # Extract slug from path
-    if len(path_parts) >= 2 and path_parts[0] == 'event':
-        result['slug'] = path_parts[1]
-        result['event_type'] = 'event'
-    elif len(path_parts) >= 2 and path_parts[0] == 'market':
-        result['slug'] = path_parts[1] 
-        result['event_type'] = 'market'
+    if len(path_parts) >= 2 and path_parts[0] in ('event', 'market'):
+        slug = path_parts[1]
+        event_type = path_parts[0]
     
     # Extract TID from query parameters
     query_params = parse_qs(parsed.query)
     if 'tid' in query_params:
-        result['tid'] = query_params['tid'][0]
+        tid = query_params['tid'][0]
     
-    return result
+    return UrlInfo(url, slug, tid, event_type, path_parts)
 
-def fetch_market_by_web_api(slug, tid=None, include_expired=True):
-    """
-    Fetch market data using Polymarket's web API endpoints.
-    
-    Args:
-        slug (str): Market slug
-        tid (str): Transaction ID (optional)
-        include_expired (bool): Whether to search expired/archived markets
-    
-    Returns:
-        dict: Market data if found, None otherwise
-    """
+def _web_api_endpoints(slug, tid=None, include_expired=True):
+    """Web API URLs to probe for a market, most preferred first"""
     endpoints_to_try = [
         # Active markets
         f"https://gamma-api.polymarket.com/events?slug={slug}",
@@ -101,113 +191,531 @@ def fetch_market_by_web_api(slug, tid=None, include_expired=True):
             f"https://strapi.polymarket.com/api/events?tid={tid}",
         ])
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'application/json',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Referer': 'https://polymarket.com/',
-        'Origin': 'https://polymarket.com'
-    }
+    # slug and tid can coincide, producing the same URL twice
+    return list(dict.fromkeys(endpoints_to_try))
+
+def fetch_market_by_web_api(slug, tid=None, include_expired=True):
+    """
+    Fetch market data using Polymarket's web API endpoints.
+    
+    Args:
+        slug (str): Market slug
+        tid (str): Transaction ID (optional)
+        include_expired (bool): Whether to search expired/archived markets
+    
+    Returns:
+        dict: Market data if found, None otherwise
+    """
+    # asyncio.run can't nest, so callers already inside a loop get the threads
+    if aiohttp is not None and not _event_loop_running():
+        return asyncio.run(fetch_market_by_web_api_async(slug, tid, include_expired))
+    
+    endpoints_to_try = _web_api_endpoints(slug, tid, include_expired)
+    
+    # Probes run concurrently, but results are taken in list order so the
+    # preferred endpoints still win exactly as in a sequential scan
+    executor = ThreadPoolExecutor(max_workers=WEB_API_MAX_WORKERS)
+    try:
+        futures = [executor.submit(_probe_web_api_endpoint, endpoint) for endpoint in endpoints_to_try]
+        for future in futures:
+            result = future.result()
+            if result is not None:
+                return result
+    finally:
+        # Return on the first hit without waiting for the slower probes
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return None
+
+def _probe_web_api_endpoint(endpoint):
+    """
+    GET one web API endpoint on the shared session.
+    
+    Returns:
+        dict: The event/market record the endpoint returned, None otherwise
+    """
+    endpoint_key = _endpoint_key(endpoint)
+    if _endpoint_cooling_down(endpoint_key):
+        logger.debug("Skipping %s (%s was unreachable recently)", endpoint, endpoint_key)
+        return None
+    
+    try:
+        logger.debug("Trying endpoint: %s", endpoint)
+        response = SESSION.get(endpoint, timeout=15)
+        
+        if response.status_code == 200:
+            data = response.json()
+            logger.debug("Success from %s", endpoint)
+            return _web_api_record(data)
+                    
+        else:
+            logger.debug("Failed: %s %s - %s", endpoint, response.status_code, response.text[:200])
+            if response.status_code >= 500:
+                # Still failing after the session's retries
+                _mark_endpoint_dead(endpoint_key)
+            
+    except (requests.ConnectionError, requests.Timeout) as e:
+        logger.debug("Error with %s: %s", endpoint, e)
+        _mark_endpoint_dead(endpoint_key)
+    except Exception as e:
+        logger.debug("Error with %s: %s", endpoint, e)
+    
+    return None
+
+def _web_api_record(data):
+    """Pull the event/market record out of the web API's various response shapes"""
+    if isinstance(data, list) and len(data) > 0:
+        return data[0]  # Return first event/market
+    elif isinstance(data, dict):
+        if 'data' in data and isinstance(data['data'], list) and len(data['data']) > 0:
+            return data['data'][0]
+        elif 'events' in data and len(data['events']) > 0:
+            return data['events'][0]
+        else:
+            return data
+    return None
+
+def _event_loop_running():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+async def fetch_market_by_web_api_async(slug, tid=None, include_expired=True):
+    """
+    Async fetch_market_by_web_api: every endpoint is probed at once on one
+    aiohttp session, bounded per host by the connector.
+    
+    Results are still taken in list order, so a preferred endpoint wins over
+    a faster one; once one hits, the probes still in flight are cancelled.
     
-    for endpoint in endpoints_to_try:
+    Returns:
+        dict: Market data if found, None otherwise
+    """
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=WEB_API_MAX_WORKERS, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector, headers=WEB_API_HEADERS,
+                                     timeout=aiohttp.ClientTimeout(total=15)) as session:
+        tasks = [asyncio.create_task(_probe_web_api_endpoint_async(session, endpoint))
+                 for endpoint in _web_api_endpoints(slug, tid, include_expired)]
         try:
-            print(f"🔍 Trying endpoint: {endpoint}")
-            response = requests.get(endpoint, headers=headers, timeout=15)
+            for task in tasks:
+                result = await task
+                if result is not None:
+                    return result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    return None
+
+async def _probe_web_api_endpoint_async(session, endpoint):
+    """_probe_web_api_endpoint on an aiohttp session"""
+    endpoint_key = _endpoint_key(endpoint)
+    if _endpoint_cooling_down(endpoint_key):
+        logger.debug("Skipping %s (%s was unreachable recently)", endpoint, endpoint_key)
+        return None
+    
+    try:
+        logger.debug("Trying endpoint: %s", endpoint)
+        async with session.get(endpoint) as response:
+            if response.status == 200:
+                data = await response.json(loads=orjson.loads if orjson is not None else json.loads,
+                                           content_type=None)
+                logger.debug("Success from %s", endpoint)
+                return _web_api_record(data)
             
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✅ Success! Status: {response.status_code}")
-                
-                # Handle different response formats
-                if isinstance(data, list) and len(data) > 0:
-                    return data[0]  # Return first event/market
-                elif isinstance(data, dict):
-                    if 'data' in data and isinstance(data['data'], list) and len(data['data']) > 0:
-                        return data['data'][0]
-                    elif 'events' in data and len(data['events']) > 0:
-                        return data['events'][0]
-                    else:
-                        return data
-                        
+            text = await response.text()
+            logger.debug("Failed: %s %s - %s", endpoint, response.status, text[:200])
+            if response.status >= 500:
+                _mark_endpoint_dead(endpoint_key)
+    
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+        logger.debug("Error with %s: %s", endpoint, e)
+        _mark_endpoint_dead(endpoint_key)
+    except Exception as e:
+        logger.debug("Error with %s: %s", endpoint, e)
+    
+    return None
+
+def _load_cache_markets(cache_file):
+    """
+    Parse a whole cache file and return its list of market records.
+    
+    Handles bare lists, {'markets': [...]}, {'data': [...]} and single-record files.
+    """
+    # orjson parses the raw UTF-8 bytes directly; stdlib json is the fallback
+    with open(cache_file, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    
+    # Handle different cache file formats
+    if isinstance(data, list):
+        return data
+    elif isinstance(data, dict):
+        if 'markets' in data:
+            return data['markets']
+        elif 'data' in data:
+            return data['data']
+        else:
+            return [data]
+    return []
+
+def _iter_cache_markets(cache_file):
+    """
+    Yield the market records in one cache file.
+    
+    With ijson the file is parsed in a single streaming pass and list records
+    are yielded as they complete, so a caller that stops at its match never
+    parses or holds the rest of the file. Without ijson the whole file is parsed.
+    """
+    if ijson is not None:
+        with open(cache_file, 'rb') as f:
+            is_list = f.read(64).lstrip()[:1] == b'['
+            f.seek(0)
+            if is_list:
+                yield from ijson.items(f, 'item', use_float=True)
             else:
-                print(f"❌ Failed: {response.status_code} - {response.text[:200]}")
-                
-        except Exception as e:
-            print(f"❌ Error with {endpoint}: {e}")
+                yield from _stream_cache_object(ijson.parse(f, use_float=True))
+        return
+    
+    yield from _load_cache_markets(cache_file)
+
+def _stream_cache_object(events):
+    """
+    Records of a dict-shaped cache from one pass over its ijson events.
+    
+    Same precedence as _load_cache_markets: 'markets' is streamed as soon as
+    it is reached; 'data' and any other top-level values are built as they
+    pass, since a later 'markets' key would still take priority.
+    """
+    top_level = {}
+    for prefix, event, value in events:
+        if prefix or event != 'map_key':
+            continue
+        event, first_value = next(events)[1:]
+        if value == 'markets' and event == 'start_array':
+            yield from _stream_array_items(events)
+            return
+        top_level[value] = _build_json_value(event, first_value, events)
+        if value == 'markets':
+            yield from top_level['markets']
+            return
+    
+    if 'data' in top_level:
+        yield from top_level['data']
+    else:
+        yield top_level
+
+def _stream_array_items(events):
+    """Yield each element of an array whose start_array event was just consumed"""
+    for _, event, value in events:
+        if event == 'end_array':
+            return
+        yield _build_json_value(event, value, events)
+
+def _build_json_value(event, value, events):
+    """Build one JSON value starting at (event, value), consuming its remaining events"""
+    if event not in ('start_map', 'start_array'):
+        return value
+    builder = ijson.common.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+            if not depth:
+                return builder.value
+
+SLUG_INDEX_FILENAME = '.slug_index.sqlite'
+CACHE_READ_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+def _cache_record_slug(market):
+    """The slug a cache record is matched on ('' when missing or not a string)"""
+    market_slug = market.get('market_slug', market.get('slug', ''))
+    return market_slug if isinstance(market_slug, str) else ''
+
+def _open_slug_index(cache_dir):
+    """Open (creating if needed) the persistent slug -> (file, record position) index"""
+    conn = sqlite3.connect(os.path.join(cache_dir, SLUG_INDEX_FILENAME))
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS indexed_files (
+            filename TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS slug_index (
+            slug TEXT NOT NULL,
+            normalized_slug TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            position INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS slug_index_slug ON slug_index (slug);
+        CREATE INDEX IF NOT EXISTS slug_index_filename ON slug_index (filename);
+    """)
+    return conn
+
+def _refresh_slug_index(conn, cache_dir, filenames):
+    """Re-index cache files that are new or whose mtime/size changed; forget deleted files"""
+    indexed = {filename: (mtime, size) for filename, mtime, size
+               in conn.execute('SELECT filename, mtime, size FROM indexed_files')}
+    
+    with conn:
+        for filename in set(indexed) - set(filenames):
+            conn.execute('DELETE FROM slug_index WHERE filename = ?', (filename,))
+            conn.execute('DELETE FROM indexed_files WHERE filename = ?', (filename,))
+    
+    stale = []
+    for filename in filenames:
+        stat = os.stat(os.path.join(cache_dir, filename))
+        if indexed.get(filename) != (stat.st_mtime, stat.st_size):
+            stale.append((filename, stat))
     
+    # Files are parsed on worker threads; the connection stays on this one
+    with ThreadPoolExecutor(max_workers=CACHE_READ_MAX_WORKERS) as executor:
+        parsed = executor.map(lambda entry: _slug_index_rows(cache_dir, entry[0]), stale)
+        for (filename, stat), rows in zip(stale, parsed):
+            if rows is None:
+                continue  # Left unindexed, so the next lookup retries it
+            with conn:
+                conn.execute('DELETE FROM slug_index WHERE filename = ?', (filename,))
+                conn.executemany('INSERT INTO slug_index VALUES (?, ?, ?, ?)', rows)
+                conn.execute('INSERT OR REPLACE INTO indexed_files VALUES (?, ?, ?)',
+                             (filename, stat.st_mtime, stat.st_size))
+
+def _slug_index_rows(cache_dir, filename):
+    """slug_index rows for one cache file, None if it can't be read"""
+    try:
+        logger.debug("Indexing %s", filename)
+        rows = []
+        for position, market in enumerate(_iter_cache_markets(os.path.join(cache_dir, filename))):
+            if isinstance(market, dict):
+                market_slug = _cache_record_slug(market)
+                rows.append((market_slug, market_slug.replace('-', ' ').lower(), filename, position))
+        return rows
+    except Exception as e:
+        logger.warning("Error reading %s: %s", filename, e)
+        return None
+
+def _read_cache_record(cache_file, position):
+    """Stream a cache file up to the record at position"""
+    return next(islice(_iter_cache_markets(cache_file), position, None), None)
+
+def _lookup_slug_index(cache_dir, slug):
+    """
+    Find a slug through the on-disk index, refreshing stale entries first.
+    
+    Same precedence as scanning: exact match before fuzzy, then directory
+    order, then record order within a file.
+    """
+    filenames = [filename for filename in os.listdir(cache_dir) if filename.endswith('.json')]
+    file_order = {filename: order for order, filename in enumerate(filenames)}
+    
+    conn = _open_slug_index(cache_dir)
+    try:
+        _refresh_slug_index(conn, cache_dir, filenames)
+        exact_hits = conn.execute(
+            'SELECT filename, position FROM slug_index WHERE slug = ?', (slug,)
+        ).fetchall()
+        fuzzy_hits = [] if exact_hits else conn.execute(
+            'SELECT filename, position FROM slug_index WHERE instr(normalized_slug, ?) > 0',
+            (slug.replace('-', ' ').lower(),)
+        ).fetchall()
+    finally:
+        conn.close()
+    
+    for hits, exact in ((exact_hits, True), (fuzzy_hits, False)):
+        hits = [hit for hit in hits if hit[0] in file_order]
+        if not hits:
+            continue
+        filename, position = min(hits, key=lambda hit: (file_order[hit[0]], hit[1]))
+        market = _read_cache_record(os.path.join(cache_dir, filename), position)
+        if exact:
+            logger.info("Found match in %s", filename)
+        else:
+            logger.info("Found potential match in %s: %s", filename, _cache_record_slug(market))
+        return market
+    return None
+
+def _scan_one_cache_file_for_slug(cache_file, slug, wanted):
+    """
+    Stream one cache file for slug.
+    
+    Returns:
+        tuple: (first exact match, first fuzzy match before it), either may be None
+    """
+    fuzzy = None
+    try:
+        logger.debug("Checking %s", os.path.basename(cache_file))
+        for market in _iter_cache_markets(cache_file):
+            if not isinstance(market, dict):
+                continue
+            market_slug = _cache_record_slug(market)
+            if market_slug == slug:
+                return market, fuzzy
+            if fuzzy is None and wanted in market_slug.replace('-', ' ').lower():
+                fuzzy = market
+    except Exception as e:
+        logger.warning("Error reading %s: %s", os.path.basename(cache_file), e)
+    return None, fuzzy
+
+def _scan_cache_for_slug(cache_dir, slug):
+    """
+    Unindexed fallback: stream every cache file on worker threads.
+    
+    Each file is read once for both the exact and the fuzzy match; results
+    are taken in directory order, so an exact match anywhere still beats a
+    fuzzy one and earlier files win ties, as with the index.
+    """
+    filenames = [filename for filename in os.listdir(cache_dir) if filename.endswith('.json')]
+    wanted = slug.replace('-', ' ').lower()
+    fuzzy_hit = None
+    
+    executor = ThreadPoolExecutor(max_workers=CACHE_READ_MAX_WORKERS)
+    try:
+        results = executor.map(
+            lambda filename: _scan_one_cache_file_for_slug(os.path.join(cache_dir, filename), slug, wanted),
+            filenames,
+        )
+        for filename, (exact, fuzzy) in zip(filenames, results):
+            if exact is not None:
+                logger.info("Found match in %s", filename)
+                return exact
+            if fuzzy_hit is None and fuzzy is not None:
+                fuzzy_hit = filename, fuzzy
+    finally:
+        # An exact hit doesn't wait for the files after it
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    if fuzzy_hit is not None:
+        filename, market = fuzzy_hit
+        logger.info("Found potential match in %s: %s", filename, _cache_record_slug(market))
+        return market
     return None
 
 def fetch_historical_markets_from_cache(slug):
     """
     Search for markets in cached historical data files.
     
+    Lookups go through a SQLite slug index kept next to the cache files
+    (SLUG_INDEX_FILENAME), so only new or modified files are parsed; if the
+    index cannot be used, every file is scanned instead. An exact slug match
+    anywhere in the cache wins over a fuzzy substring match.
+    
     Args:
         slug (str): Market slug to search for
         
     Returns:
         dict: Market data if found, None otherwise
     """
-    print(f"🗃️  Searching historical cache files for: {slug}")
+    logger.info("Searching historical cache files for: %s", slug)
     
     cache_dir = "./polymarket_cache"
     if not os.path.exists(cache_dir):
-        print(f"❌ Cache directory not found: {cache_dir}")
+        logger.info("Cache directory not found: %s", cache_dir)
         return None
     
-    # Search through all JSON files in cache
-    for filename in os.listdir(cache_dir):
-        if filename.endswith('.json'):
-            cache_file = os.path.join(cache_dir, filename)
-            try:
-                print(f"   Checking {filename}...")
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Handle different cache file formats
-                markets_to_search = []
-                if isinstance(data, list):
-                    markets_to_search = data
-                elif isinstance(data, dict):
-                    if 'markets' in data:
-                        markets_to_search = data['markets']
-                    elif 'data' in data:
-                        markets_to_search = data['data']
-                    else:
-                        markets_to_search = [data]
-                
-                # Search for matching slug
-                for market in markets_to_search:
-                    if isinstance(market, dict):
-                        market_slug = market.get('market_slug', market.get('slug', ''))
-                        if market_slug == slug:
-                            print(f"✅ Found match in {filename}!")
-                            return market
-                        
-                        # Fuzzy match for similar slugs
-                        if slug.replace('-', ' ').lower() in market_slug.replace('-', ' ').lower():
-                            print(f"✅ Found potential match in {filename}: {market_slug}")
-                            return market
-                            
-            except Exception as e:
-                print(f"   ⚠️  Error reading {filename}: {e}")
-                continue
+    try:
+        market = _lookup_slug_index(cache_dir, slug)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Slug index unavailable (%s), scanning cache files", e)
+        market = _scan_cache_for_slug(cache_dir, slug)
     
-    print(f"❌ No matches found in cache files")
+    if market is not None:
+        return market
+    
+    logger.info("No matches found in cache files")
     return None
 
-def fetch_market_by_clob_api(slug, include_archived=True):
+# Suggested fuzzy_cutoff when opting in to the slug edit-distance fallback.
+# Long sibling slugs ("...-by-june-30" vs "...-by-july-30") still clear it,
+# which is why the fallback is off by default.
+FUZZY_SLUG_CUTOFF = 0.9
+
+# token_set_ratio cutoffs (0-100) for the CLOB page match. A slug that shares
+# the asset and date but not the claim ("bitcoin-above-100k-on-june-30" for
+# "will-bitcoin-reach-100k-by-june-30") scores around 80, so the bar sits above that.
+FUZZY_MATCH_CUTOFF = 90
+FUZZY_MATCH_TIME_SENSITIVE_CUTOFF = 80
+
+def _fuzzy_match_market(slug_words, markets, market_slugs, time_sensitive):
+    """
+    Pick the market on one CLOB page that best matches the slug words.
+    
+    With rapidfuzz this is a single extractOne call scoring token_set_ratio
+    over each market's slug + question; descriptions are left out, since
+    their long text contains most short slugs' words by chance. The bar is
+    lower for time-sensitive slugs, whose dated wording rarely matches exactly.
+    Without rapidfuzz, the first market containing at least 70% (60%
+    time-sensitive) of the slug words in its slug, question or description wins.
+    
+    Returns:
+        dict: Best market above the threshold, None otherwise
+    """
+    if process is not None:
+        cutoff = FUZZY_MATCH_TIME_SENSITIVE_CUTOFF if time_sensitive else FUZZY_MATCH_CUTOFF
+        texts = [f"{market_slug or ''} {market.get('question') or ''}"
+                 for market, market_slug in zip(markets, market_slugs)]
+        best = process.extractOne(' '.join(slug_words), texts, scorer=fuzz.token_set_ratio,
+                                  processor=default_process, score_cutoff=cutoff)
+        return markets[best[2]] if best else None
+    
+    threshold = 0.6 if time_sensitive else 0.7
+    min_word_matches = len(slug_words) * threshold
+    for market, market_slug in zip(markets, market_slugs):
+        # slug_words are already lower-case; each market is lower-cased once
+        text = f"{market_slug or ''} {market.get('question') or ''} {market.get('description') or ''}".lower()
+        word_matches = sum(1 for word in slug_words if word in text)
+        if word_matches >= min_word_matches:
+            return market
+    return None
+
+def _closest_slug_market(slug_l, markets, market_slugs, cutoff):
+    """
+    Market whose slug is closest to slug_l by normalized Levenshtein similarity.
+    
+    Catches typos and reworded slugs that share few whole words. rapidfuzz's
+    bit-parallel (Myers) distance with score_cutoff makes a 1000-market page
+    one C call; otherwise the Numba DP is used, and without either this is skipped.
+    
+    Returns:
+        tuple: (similarity, market) for the closest market with similarity >= cutoff,
+            None otherwise
+    """
+    market_slugs = [(market_slug or '').lower() for market_slug in market_slugs]
+    
+    if Levenshtein is not None:
+        best = process.extractOne(slug_l, market_slugs, scorer=Levenshtein.normalized_similarity,
+                                  processor=None, score_cutoff=cutoff)
+        return (best[1], markets[best[2]]) if best else None
+    
+    if JIT_AVAILABLE and markets:
+        scores = [levenshtein_ratio(slug_l, market_slug) for market_slug in market_slugs]
+        best_index = max(range(len(scores)), key=scores.__getitem__)
+        if scores[best_index] >= cutoff:
+            return scores[best_index], markets[best_index]
+    return None
+
+def fetch_market_by_clob_api(slug, include_archived=True, fuzzy_cutoff=None):
     """
     Search for market using the CLOB API by filtering through available markets.
     
     Args:
         slug (str): Market slug to search for
         include_archived (bool): Whether to search archived markets
+        fuzzy_cutoff (float): Opt-in last resort: when set (e.g. FUZZY_SLUG_CUTOFF),
+            the market whose slug is closest by edit distance, with similarity
+            at least this (0-1), is returned once every page has been searched
+            without an exact or word match. None (default) disables it.
     
     Returns:
         dict: Market data if found, None otherwise
     """
     try:
-        print(f"🔍 Searching CLOB API for slug: {slug}")
+        logger.info("Searching CLOB API for slug: %s", slug)
         
         # Try different API methods for active and archived markets
         api_methods = [
@@ -222,75 +730,168 @@ def fetch_market_by_clob_api(slug, include_archived=True):
             except:
                 pass
         
+        # Normalize the slug once; the page loop below only touches market text
+        slug_l = slug.lower()
+        slug_words = tuple(slug_l.replace('-', ' ').split())
+        # Special handling for time-sensitive markets (today, tomorrow, etc.)
+        time_sensitive = 'today' in slug_l or 'tomorrow' in slug_l
+        # Best (similarity, market) by slug edit distance, only used when nothing else matched
+        closest = None
+        
         for method_name, method_func in api_methods:
-            print(f"   Trying {method_name}...")
+            logger.debug("Trying %s", method_name)
             
             # Search through batches of markets
-            next_cursor = None
             max_searches = 15  # Increase search depth for expired markets
             searches = 0
             
-            while searches < max_searches:
-                try:
-                    response = method_func(next_cursor)
-                    if not response:
-                        break
+            # Pages are cursor-chained, so they can't be fetched in parallel, but
+            # the next page can download while the current one is being scanned
+            prefetcher = ThreadPoolExecutor(max_workers=1)
+            pending = prefetcher.submit(method_func, None)
+            try:
+                while searches < max_searches:
+                    try:
+                        response = pending.result()
+                        pending = None
+                        if not response:
+                            break
+                            
+                        markets = response.get('data', [])
+                        if not markets:
+                            break
                         
-                    markets = response.get('data', [])
-                    if not markets:
-                        break
-            
-                    # Search for exact slug match
-                    for market in markets:
-                        if market.get('market_slug') == slug:
-                            print(f"✅ Found exact match in {method_name}!")
+                        next_cursor = response.get('next_cursor')
+                        if next_cursor and searches + 1 < max_searches:
+                            pending = prefetcher.submit(method_func, next_cursor)
+                
+                        # Search for exact slug match: the page's slugs are pulled out
+                        # once, then list.index scans them in C (first match wins)
+                        market_slugs = [market.get('market_slug') for market in markets]
+                        if slug in market_slugs:
+                            logger.info("Found exact match in %s", method_name)
+                            return markets[market_slugs.index(slug)]
+                        
+                        # Search for partial matches (fuzzy search)
+                        market = _fuzzy_match_market(slug_words, markets, market_slugs,
+                                                     time_sensitive)
+                        if market is not None:
+                            if time_sensitive:
+                                logger.info("Found potential time-sensitive match: %s (question: %s, closed: %s)",
+                                            market.get('market_slug', ''), market.get('question'),
+                                            market.get('closed', 'Unknown'))
+                            else:
+                                logger.info("Found potential match: %s (question: %s)",
+                                            market.get('market_slug', ''), market.get('question'))
                             return market
-                    
-                    # Search for partial matches (fuzzy search)
-                    slug_words = slug.replace('-', ' ').split()
-                    for market in markets:
-                        market_slug = market.get('market_slug', '')
-                        market_question = market.get('question', '').lower()
-                        market_desc = market.get('description', '').lower()
                         
-                        # Check if most words from the slug appear in the market data
-                        word_matches = sum(1 for word in slug_words if 
-                                         word.lower() in market_slug.lower() or 
-                                         word.lower() in market_question or 
-                                         word.lower() in market_desc)
+                        if fuzzy_cutoff is not None:
+                            candidate = _closest_slug_market(slug_l, markets, market_slugs, fuzzy_cutoff)
+                            if candidate is not None and (closest is None or candidate[0] > closest[0]):
+                                closest = candidate
                         
-                        # Special handling for time-sensitive markets (today, tomorrow, etc.)
-                        if 'today' in slug.lower() or 'tomorrow' in slug.lower():
-                            if word_matches >= len(slug_words) * 0.6:  # Lower threshold for time-sensitive
-                                print(f"✅ Found potential time-sensitive match: {market_slug}")
-                                print(f"   Question: {market.get('question')}")
-                                print(f"   Closed: {market.get('closed', 'Unknown')}")
-                                return market
-                        elif word_matches >= len(slug_words) * 0.7:  # 70% word match threshold
-                            print(f"✅ Found potential match: {market_slug}")
-                            print(f"   Question: {market.get('question')}")
-                            return market
-                    
-                    next_cursor = response.get('next_cursor')
-                    if not next_cursor:
+                        if not next_cursor:
+                            break
+                        
+                        searches += 1
+                        logger.info("Searched %d %s so far", searches * 1000, method_name.lower())
+                        
+                    except Exception as e:
+                        logger.warning("Error in %s: %s", method_name, e)
                         break
-                    
-                    searches += 1
-                    print(f"   Searched {searches * 1000} {method_name.lower()} so far...")
-                    
-                except Exception as e:
-                    print(f"   ⚠️  Error in {method_name}: {e}")
-                    break
+            finally:
+                # Don't wait on (or keep) a prefetch nobody will read
+                prefetcher.shutdown(wait=False, cancel_futures=True)
+        
+            logger.debug("No matches found in %s", method_name)
         
-            print(f"   No matches found in {method_name}")
+        if closest is not None:
+            similarity, market = closest
+            logger.info("Found closest slug match: %s (similarity %.2f)",
+                        market.get('market_slug', ''), similarity)
+            return market
         
-        print(f"❌ No matches found in any API method")
+        logger.info("No matches found in any API method")
         return None
         
     except Exception as e:
-        print(f"❌ Error searching CLOB API: {e}")
+        logger.warning("Error searching CLOB API: %s", e)
         return None
 
+# fetch_by_similar_keywords only ever looks at these columns
+MARKETS_CSV_SEARCH_COLUMNS = ('market_slug', 'question')
+
+@lru_cache(maxsize=4)
+def _read_markets_csv(csv_file, mtime, usecols=None):
+    """pd.read_csv keyed on the file's mtime, so an edited file is re-read"""
+    import pandas as pd
+    if usecols is None:
+        return pd.read_csv(csv_file)
+    # Narrow reads skip the other columns' parsing; Arrow-backed strings make
+    # the .str scans run in C. Columns missing from the file are just skipped.
+    return pd.read_csv(csv_file, usecols=lambda column: column in usecols,
+                       dtype='string[pyarrow]' if pyarrow is not None else None)
+
+def load_markets_csv(csv_file='./data/markets_data.csv', usecols=None):
+    """
+    Load the markets CSV, reusing the parsed DataFrame until the file changes.
+    
+    Args:
+        csv_file (str): Path to the markets CSV
+        usecols (tuple): Only parse these columns (all columns if None)
+    
+    The DataFrame is shared between callers: copy it before mutating.
+    """
+    return _read_markets_csv(csv_file, os.path.getmtime(csv_file), usecols)
+
+@lru_cache(maxsize=1)
+def _read_markets_csv_slugs(csv_file, mtime):
+    return frozenset(_read_markets_csv(csv_file, mtime, ('market_slug',))['market_slug'].dropna())
+
+def markets_csv_slugs(csv_file='./data/markets_data.csv'):
+    """Set of market slugs in the markets CSV, for O(1) membership checks"""
+    return _read_markets_csv_slugs(csv_file, os.path.getmtime(csv_file))
+
+@lru_cache(maxsize=1)
+def _read_markets_search_text(csv_file, mtime):
+    df = _read_markets_csv(csv_file, mtime, MARKETS_CSV_SEARCH_COLUMNS)
+    slugs = df['market_slug'].fillna('').str.lower()
+    questions = df['question'].fillna('').str.lower() if 'question' in df else ''
+    return slugs, slugs + '\n' + questions
+
+def markets_search_text(csv_file='./data/markets_data.csv'):
+    """
+    Lower-cased search text for every CSV row, built once per version of the file.
+    
+    Returns:
+        tuple: (slug Series, slug + newline + question Series), indexed like the CSV
+    """
+    return _read_markets_search_text(csv_file, os.path.getmtime(csv_file))
+
+def _first_pattern_match(texts, patterns):
+    """
+    Find the first row matching the highest-priority pattern (case-insensitive substring).
+    
+    texts is pre-lowered (see markets_search_text), so every scan is a plain
+    case-sensitive one. One combined regex pass narrows the rows to those
+    matching any pattern; only those candidates are re-checked pattern by
+    pattern, so the per-pattern cost no longer scales with the full CSV.
+    
+    Returns:
+        tuple: (pattern, index label) for the earliest pattern with a hit, (None, None) otherwise
+    """
+    if not patterns:
+        return None, None
+    
+    lowered = [pattern.lower() for pattern in patterns]
+    candidates = texts[texts.str.contains('|'.join(map(re.escape, lowered)), na=False).to_numpy(dtype=bool)]
+    
+    for pattern, needle in zip(patterns, lowered):
+        hits = candidates.str.contains(needle, regex=False, na=False).to_numpy(dtype=bool)
+        if hits.any():
+            return pattern, candidates.index[hits][0]
+    return None, None
+
 def fetch_by_similar_keywords(slug):
     """
     Try to find markets with similar keywords when exact match fails.
@@ -301,7 +902,7 @@ def fetch_by_similar_keywords(slug):
     Returns:
         dict: Market data if found, None otherwise
     """
-    print(f"🔍 Searching for similar markets to: {slug}")
+    logger.info("Searching for similar markets to: %s", slug)
     
     # Extract key terms from slug
     key_terms = slug.replace('-', ' ').split()
@@ -321,38 +922,36 @@ def fetch_by_similar_keywords(slug):
         ]
         alternative_patterns.extend(alternatives)
     
-    print(f"   Key terms: {key_terms}")
-    print(f"   Alternative patterns: {alternative_patterns}")
+    logger.debug("Key terms: %s", key_terms)
+    logger.debug("Alternative patterns: %s", alternative_patterns)
     
     # Search for alternatives in existing CSV data
     try:
-        import pandas as pd
         csv_file = './data/markets_data.csv'
         if os.path.exists(csv_file):
-            df = pd.read_csv(csv_file)
+            # Scan pre-lowered text from a narrow read; only a hit pays for the full row
+            slug_text, slug_question_text = markets_search_text(csv_file)
             
             # Search for alternative patterns first
-            for pattern in alternative_patterns:
-                matches = df[df['market_slug'].str.contains(pattern, case=False, na=False)]
-                if len(matches) > 0:
-                    print(f"✅ Found alternative market: {pattern}")
-                    return matches.iloc[0].to_dict()
+            pattern, label = _first_pattern_match(slug_text, alternative_patterns)
+            if label is not None:
+                logger.info("Found alternative market: %s", pattern)
+                return load_markets_csv(csv_file).loc[label].to_dict()
             
             # Search by key terms
-            for term in key_terms:
-                if len(term) > 3:  # Only search meaningful terms
-                    matches = df[df['market_slug'].str.contains(term, case=False, na=False) | 
-                               df['question'].str.contains(term, case=False, na=False)]
-                    if len(matches) > 0:
-                        print(f"✅ Found market containing '{term}': {matches.iloc[0]['market_slug']}")
-                        return matches.iloc[0].to_dict()
+            meaningful_terms = [term for term in key_terms if len(term) > 3]  # Only search meaningful terms
+            term, label = _first_pattern_match(slug_question_text, meaningful_terms)
+            if label is not None:
+                row = load_markets_csv(csv_file).loc[label].to_dict()
+                logger.info("Found market containing '%s': %s", term, row['market_slug'])
+                return row
                         
     except Exception as e:
-        print(f"   ⚠️  Error searching CSV: {e}")
+        logger.warning("Error searching CSV: %s", e)
     
     return None
 
-def get_market_from_url(url, search_expired=True):
+def get_market_from_url(url, search_expired=True, refresh=False):
     """
     Main function to fetch market data from a Polymarket URL.
     Tries multiple methods to find the market, including expired/archived markets.
@@ -360,39 +959,132 @@ def get_market_from_url(url, search_expired=True):
     Args:
         url (str): Full Polymarket URL
         search_expired (bool): Whether to search expired/archived markets
+        refresh (bool): Ignore cached lookups (in-process and on disk) and search again
     
     Returns:
         dict: Market data with standardized format
     """
-    print(f"🚀 FETCHING MARKET FROM URL")
-    print("=" * 60)
-    print(f"URL: {url}")
-    print()
+    logger.info("Fetching market from URL: %s", url)
     
     # Extract info from URL
     url_info = extract_market_info_from_url(url)
-    print(f"📊 Extracted URL info:")
-    for key, value in url_info.items():
-        print(f"   {key}: {value}")
-    print()
+    logger.debug("Extracted URL info: %s", url_info._asdict())
     
-    if not url_info['slug']:
-        print("❌ Could not extract market slug from URL")
+    if not url_info.slug:
+        logger.warning("Could not extract market slug from URL: %s", url)
         return None
     
+    if refresh:
+        _find_market.cache_clear()
+        market_data = _lookup_market(url_info.slug, url_info.tid, search_expired, refresh=True)
+        return dict(market_data) if market_data else market_data
+    
+    # Repeat lookups (e.g. quick_fetch_market then add_market_to_workflow on
+    # the same URL) reuse the first result instead of re-probing every source
+    hits_before = _find_market.cache_info().hits
+    market_data = _find_market(url_info.slug, url_info.tid, search_expired)
+    if _find_market.cache_info().hits > hits_before:
+        logger.info("Reusing earlier lookup result for this market")
+    return dict(market_data) if market_data else market_data
+
+@lru_cache(maxsize=256)
+def _find_market(slug, tid, search_expired):
+    """In-process memo over _lookup_market, misses included (cache_clear() forces a refetch)"""
+    return _lookup_market(slug, tid, search_expired)
+
+# Lookup results persist across runs: hits for an hour, misses for five minutes
+# so a newly listed market shows up soon. Least recently used entries go first.
+LOOKUP_CACHE_PATH = './data/.market_lookups.sqlite'
+LOOKUP_CACHE_TTL = 3600  # seconds
+LOOKUP_CACHE_MISS_TTL = 300  # seconds
+LOOKUP_CACHE_MAX_ENTRIES = 1000
+
+def _open_lookup_cache():
+    os.makedirs(os.path.dirname(LOOKUP_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(LOOKUP_CACHE_PATH)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS lookups (
+            key TEXT PRIMARY KEY,
+            market_data TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        )
+    """)
+    return conn
+
+def _json_default(value):
+    """numpy scalars from CSV rows serialize as their Python value, anything else as str"""
+    item = getattr(value, 'item', None)
+    return item() if callable(item) else str(value)
+
+def _lookup_market(slug, tid, search_expired, refresh=False):
+    """
+    _search_market_sources behind the on-disk lookup cache.
+    
+    Cache trouble (locked or unwritable file) is reported and the search
+    just runs uncached.
+    
+    Returns:
+        dict: Market data with standardized format, None if no method found it
+    """
+    key = json.dumps([slug, tid, search_expired])
+    now = time.time()
+    
+    if not refresh:
+        try:
+            conn = _open_lookup_cache()
+            try:
+                row = conn.execute('SELECT market_data FROM lookups WHERE key = ? AND expires_at > ?',
+                                   (key, now)).fetchone()
+                if row is not None:
+                    with conn:
+                        conn.execute('UPDATE lookups SET last_used = ? WHERE key = ?', (now, key))
+                    logger.info("Using cached lookup result (pass refresh=True to search again)")
+                    return json.loads(row[0])
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Lookup cache unavailable: %s", e)
+    
+    market_data = _search_market_sources(slug, tid, search_expired)
+    
+    try:
+        conn = _open_lookup_cache()
+        try:
+            ttl = LOOKUP_CACHE_TTL if market_data else LOOKUP_CACHE_MISS_TTL
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?)',
+                             (key, json.dumps(market_data, default=_json_default), now + ttl, now))
+                conn.execute('DELETE FROM lookups WHERE expires_at <= ?', (now,))
+                conn.execute('DELETE FROM lookups WHERE key NOT IN '
+                             '(SELECT key FROM lookups ORDER BY last_used DESC LIMIT ?)',
+                             (LOOKUP_CACHE_MAX_ENTRIES,))
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+        logger.warning("Could not cache lookup result: %s", e)
+    
+    return market_data
+
+def _search_market_sources(slug, tid, search_expired):
+    """
+    Run the lookup methods in order for one slug.
+    
+    Returns:
+        dict: Market data with standardized format, None if no method found it
+    """
     # Method 1: Try web API (including expired markets)
-    print("Method 1: Trying Polymarket Web API (including archived)...")
-    web_result = fetch_market_by_web_api(url_info['slug'], url_info['tid'], include_expired=search_expired)
+    logger.info("Method 1: Trying Polymarket Web API (including archived)")
+    web_result = fetch_market_by_web_api(slug, tid, include_expired=search_expired)
     
     if web_result:
-        print("✅ Found market via Web API!")
-        print(f"   Title: {web_result.get('title', 'N/A')}")
-        print(f"   Description: {web_result.get('description', 'N/A')[:100]}...")
+        logger.info("Found market via Web API: %s (description: %.100s)",
+                    web_result.get('title', 'N/A'), web_result.get('description', 'N/A'))
         
         # Extract market slug and condition_id for workflow compatibility
         market_data = {
             'source': 'web_api',
-            'market_slug': web_result.get('slug') or url_info['slug'],
+            'market_slug': web_result.get('slug') or slug,
             'condition_id': None,
             'full_data': web_result
         }
@@ -407,13 +1099,12 @@ def get_market_from_url(url, search_expired=True):
         return market_data
     
     # Method 2: Try CLOB API (including archived)
-    print("\nMethod 2: Trying CLOB API (including archived)...")
-    clob_result = fetch_market_by_clob_api(url_info['slug'], include_archived=search_expired)
+    logger.info("Method 2: Trying CLOB API (including archived)")
+    clob_result = fetch_market_by_clob_api(slug, include_archived=search_expired)
     
     if clob_result:
-        print("✅ Found market via CLOB API!")
-        print(f"   Slug: {clob_result.get('market_slug')}")
-        print(f"   Question: {clob_result.get('question')}")
+        logger.info("Found market via CLOB API: %s (question: %s)",
+                    clob_result.get('market_slug'), clob_result.get('question'))
         
         return {
             'source': 'clob_api',
@@ -424,24 +1115,24 @@ def get_market_from_url(url, search_expired=True):
     
     # Method 3: Try historical cache
     if search_expired:
-        print("\nMethod 3: Searching historical cache files...")
-        cache_result = fetch_historical_markets_from_cache(url_info['slug'])
+        logger.info("Method 3: Searching historical cache files")
+        cache_result = fetch_historical_markets_from_cache(slug)
         
         if cache_result:
-            print("✅ Found market in historical cache!")
+            logger.info("Found market in historical cache")
             return {
                 'source': 'historical_cache',
-                'market_slug': cache_result.get('market_slug') or cache_result.get('slug') or url_info['slug'],
+                'market_slug': cache_result.get('market_slug') or cache_result.get('slug') or slug,
                 'condition_id': cache_result.get('condition_id'),
                 'full_data': cache_result
             }
     
     # Method 4: Try similar keywords/alternatives
-    print("\nMethod 4: Searching for similar markets...")
-    similar_result = fetch_by_similar_keywords(url_info['slug'])
+    logger.info("Method 4: Searching for similar markets")
+    similar_result = fetch_by_similar_keywords(slug)
     
     if similar_result:
-        print("✅ Found similar market!")
+        logger.info("Found similar market")
         return {
             'source': 'similar_match',
             'market_slug': similar_result.get('market_slug'),
@@ -449,13 +1140,20 @@ def get_market_from_url(url, search_expired=True):
             'full_data': similar_result
         }
     
-    print("\n❌ Could not find market using any method (including expired/archived search)")
-    print("\n💡 Suggestions:")
-    print("   - The market may have expired and been removed from all datasets")
-    print("   - Try searching for similar markets with different time frames")
-    print("   - Check if the URL slug has changed or been updated")
+    logger.warning("Could not find market %s using any method (including expired/archived search). "
+                   "It may have expired and been removed from all datasets, or its slug may have "
+                   "changed; try similar markets with different time frames.", slug)
     return None
 
+def _ensure_trailing_newline(path):
+    """Terminate the last line if needed, so an appended row starts on its own line"""
+    with open(path, 'rb+') as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) not in (b'\n', b'\r'):
+            f.write(b'\n')
+
 def add_market_to_workflow(url, workflow_file_path=None, force_add_expired=False):
     """
     Fetch market from URL and add it to the workflow.
@@ -475,35 +1173,32 @@ def add_market_to_workflow(url, workflow_file_path=None, force_add_expired=False
     
     market_slug = market_data['market_slug']
     if not market_slug:
-        print("❌ No market slug found")
+        logger.warning("No market slug found")
         return False
     
-    print(f"\n🎯 RUNNING WORKFLOW WITH FOUND MARKET")
-    print("=" * 60)
-    print(f"Market slug: {market_slug}")
-    print(f"Source: {market_data.get('source', 'unknown')}")
+    logger.info("Running workflow with found market %s (source: %s)",
+                market_slug, market_data.get('source', 'unknown'))
     
     # If market is from historical/expired sources, we may need to add it manually
     if market_data.get('source') in ['historical_cache', 'similar_match'] and force_add_expired:
-        print("📝 Adding expired/historical market to current dataset...")
+        logger.info("Adding expired/historical market to current dataset")
         try:
             # Add the market data to the CSV if it's not already there
             import pandas as pd
             csv_file = './data/markets_data.csv'
             
             if os.path.exists(csv_file):
-                df = pd.read_csv(csv_file)
-                
                 # Check if market already exists
-                if market_slug not in df['market_slug'].values:
-                    print(f"   Adding {market_slug} to markets CSV...")
+                if market_slug not in markets_csv_slugs(csv_file):
+                    logger.info("Adding %s to markets CSV", market_slug)
+                    columns = pd.read_csv(csv_file, nrows=0).columns  # header only
                     
                     # Create a new row with the found market data
                     market_full_data = market_data['full_data']
                     new_row = {}
                     
                     # Map fields from found data to CSV columns
-                    for col in df.columns:
+                    for col in columns:
                         if col in market_full_data:
                             new_row[col] = market_full_data[col]
                         else:
@@ -513,15 +1208,15 @@ def add_market_to_workflow(url, workflow_file_path=None, force_add_expired=False
                     new_row['market_slug'] = market_slug
                     new_row['condition_id'] = market_data.get('condition_id', 'historical_market')
                     
-                    # Add to dataframe
-                    new_df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-                    new_df.to_csv(csv_file, index=False)
-                    print(f"✅ Added market to CSV dataset")
+                    # Append the one row rather than rewriting the whole file
+                    _ensure_trailing_newline(csv_file)
+                    pd.DataFrame([new_row], columns=columns).to_csv(csv_file, mode='a', header=False, index=False)
+                    logger.info("Added market to CSV dataset")
                 else:
-                    print(f"   Market {market_slug} already exists in CSV")
+                    logger.info("Market %s already exists in CSV", market_slug)
                     
         except Exception as e:
-            print(f"⚠️  Warning: Could not add to CSV dataset: {e}")
+            logger.warning("Could not add to CSV dataset: %s", e)
     
     try:
         from incremental_markets_update import update_selected_markets_workflow
@@ -530,26 +1225,25 @@ def add_market_to_workflow(url, workflow_file_path=None, force_add_expired=False
         success = update_selected_markets_workflow([market_slug])
         
         if success:
-            print(f"\n✅ Successfully added market '{market_slug}' to workflow!")
+            logger.info("Successfully added market '%s' to workflow", market_slug)
             return True
         else:
-            print(f"\n❌ Workflow failed for market '{market_slug}'")
+            logger.warning("Workflow failed for market '%s'", market_slug)
             
             # If workflow failed but we found the market, suggest manual approach
             if market_data:
-                print(f"\n💡 Alternative: Market data was found but workflow failed.")
-                print(f"   Market slug: {market_slug}")
-                print(f"   Condition ID: {market_data.get('condition_id', 'N/A')}")
-                print(f"   Source: {market_data.get('source', 'unknown')}")
-                print(f"   You can try manually adding this to your selected markets.")
+                logger.warning("Market data was found (condition ID: %s, source: %s); you can try "
+                               "manually adding '%s' to your selected markets.",
+                               market_data.get('condition_id', 'N/A'),
+                               market_data.get('source', 'unknown'), market_slug)
             
             return False
             
     except Exception as e:
-        print(f"❌ Error running workflow: {e}")
+        logger.error("Error running workflow: %s", e)
         return False
 
-def quick_fetch_market(url_or_slug, run_workflow=False, force_expired=False):
+def quick_fetch_market(url_or_slug, run_workflow=False, force_expired=False, refresh=False):
     """
     Quick utility function to fetch market info from URL or slug.
     
@@ -557,6 +1251,7 @@ def quick_fetch_market(url_or_slug, run_workflow=False, force_expired=False):
         url_or_slug (str): Either a full Polymarket URL or just the slug
         run_workflow (bool): Whether to automatically run the workflow
         force_expired (bool): Force search in expired/archived markets
+        refresh (bool): Bypass cached lookup results
     
     Returns:
         dict: Market information or None
@@ -568,39 +1263,38 @@ def quick_fetch_market(url_or_slug, run_workflow=False, force_expired=False):
         # Assume it's a slug, construct URL
         url = f"https://polymarket.com/event/{url_or_slug}"
     
-    print(f"🔍 Quick fetch for: {url_or_slug}")
-    print("=" * 40)
+    logger.info("Quick fetch for: %s", url_or_slug)
     
-    market_data = get_market_from_url(url, search_expired=True)
+    market_data = get_market_from_url(url, search_expired=True, refresh=refresh)
     
     if market_data:
-        print(f"\n📊 MARKET FOUND:")
-        print(f"   Slug: {market_data.get('market_slug', 'N/A')}")
-        print(f"   Condition ID: {market_data.get('condition_id', 'N/A')}")
-        print(f"   Source: {market_data.get('source', 'unknown')}")
+        logger.info("Market found: %s (condition ID: %s, source: %s)",
+                    market_data.get('market_slug', 'N/A'), market_data.get('condition_id', 'N/A'),
+                    market_data.get('source', 'unknown'))
         
         if 'full_data' in market_data:
             full_data = market_data['full_data']
-            if 'question' in full_data:
-                print(f"   Question: {full_data['question']}")
-            if 'closed' in full_data:
-                print(f"   Closed: {full_data['closed']}")
-            if 'active' in full_data:
-                print(f"   Active: {full_data['active']}")
+            for field in ('question', 'closed', 'active'):
+                if field in full_data:
+                    logger.info("   %s: %s", field.capitalize(), full_data[field])
         
         if run_workflow:
-            print(f"\n🔄 Running workflow...")
+            logger.info("Running workflow")
             success = add_market_to_workflow(url, force_add_expired=force_expired)
             return market_data if success else None
             
         return market_data
     else:
-        print(f"\n❌ Market not found")
+        logger.info("Market not found")
         return None
 
 if __name__ == "__main__":
+    # Per-endpoint/per-file progress is DEBUG; LOGLEVEL=WARNING keeps only problems
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO').upper(), format='%(message)s')
+    
     # Example usage
     test_url = "https://polymarket.com/event/will-trump-resign-today?tid=1756938040931"
+    refresh = '--refresh' in sys.argv[1:]  # skip cached lookup results
     
     print("🚀 ENHANCED POLYMARKET MARKET FETCHER")
     print("=" * 60)
@@ -614,7 +1308,7 @@ if __name__ == "__main__":
     
     # Method 1: Just fetch market info (including expired)
     print("🔍 Method 1: Comprehensive search (including expired markets)")
-    market_info = quick_fetch_market(test_url, run_workflow=False, force_expired=True)
+    market_info = quick_fetch_market(test_url, run_workflow=False, force_expired=True, refresh=refresh)
     
     if market_info:
         # Method 2: Try to run workflow with found market
@@ -640,7 +1334,7 @@ if __name__ == "__main__":
         
         for alt in alternatives:
             print(f"\n   Trying: {alt}")
-            alt_result = quick_fetch_market(alt, run_workflow=False)
+            alt_result = quick_fetch_market(alt, run_workflow=False, refresh=refresh)
             if alt_result:
                 print(f"✅ Found alternative market: {alt}")
                 print(f"   Use this slug instead: {alt}")
@@ -652,6 +1346,7 @@ if __name__ == "__main__":
     print("📚 USAGE EXAMPLES:")
     print("# Quick fetch without workflow:")
     print("python3 fetch_market_by_url.py")
+    print("python3 fetch_market_by_url.py --refresh  # ignore cached lookups")
     print()
     print("# In Python script:")
     print("from fetch_market_by_url import quick_fetch_market, add_market_to_workflow")
@@ -1,13 +1,27 @@
 import pandas as pd
 import json
 import ast
+import glob
+import hashlib
 import os
 import shutil
+import sqlite3
 import sys
 import io
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
 try:
     sys.stdout.reconfigure(errors='replace')
     sys.stderr.reconfigure(errors='replace')
@@ -16,12 +30,63 @@ except AttributeError:
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding=sys.stderr.encoding or 'utf-8', errors='replace')
 
 
+# Timestamped backups beyond the newest BACKUP_KEEP per file are pruned
+BACKUP_KEEP = 10
+FICLONE = 0x40049409  # Linux ioctl: share extents copy-on-write (btrfs, XFS)
+
+def snapshot_file(src, dst, hardlink=False):
+    """
+    Copy src to dst as cheaply as the filesystem allows.
+    
+    hardlink=True is only safe for files that are always replaced via
+    os.replace, never rewritten in place: the link keeps the old inode.
+    Otherwise try a copy-on-write clone, then fall back to shutil.copy2.
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+def backup_file(path, hardlink=False, keep=BACKUP_KEEP):
+    """Snapshot path to path.backup.<UTC timestamp>, prune old snapshots, return the backup path."""
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+    backup_path = f"{path}.backup.{timestamp}"
+    snapshot_file(path, backup_path, hardlink=hardlink)
+    
+    # The timestamp format sorts chronologically by name
+    pattern = f"{glob.escape(path)}.backup.{'[0-9]' * 8}_{'[0-9]' * 6}"
+    for old_backup in sorted(glob.glob(pattern))[:-keep]:
+        try:
+            os.remove(old_backup)
+        except OSError:
+            pass
+    return backup_path
+
 def load_existing_lookup(json_file):
     """Load existing market lookup JSON file if it exists."""
     if os.path.exists(json_file):
         try:
-            with open(json_file, 'r') as f:
-                existing_data = json.load(f)
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the
+            # backup path below handles both parsers
+            if orjson is not None:
+                with open(json_file, 'rb') as f:
+                    existing_data = orjson.loads(f.read())
+            else:
+                with open(json_file, 'r') as f:
+                    existing_data = json.load(f)
             print(f"ðŸ“‹ Loaded {len(existing_data)} existing markets from {json_file}")
             return existing_data
         except json.JSONDecodeError as e:
@@ -37,43 +102,84 @@ def load_existing_lookup(json_file):
         print(f"ðŸ“„ Creating new market lookup file: {json_file}")
         return {}
 
+def _python_literal_as_json(text):
+    """
+    Rewrite a Python repr of lists/dicts/strings as JSON text, or None.
+    
+    Only safe for text without double quotes or backslashes: then every
+    single quote delimits a string, so splitting on it alternates
+    outside/inside segments and True/False/None are rewritten only outside
+    strings.
+    """
+    if '"' in text:
+        return None
+    segments = text.split("'")
+    for i in range(0, len(segments), 2):
+        segments[i] = segments[i].replace('True', 'true').replace('False', 'false').replace('None', 'null')
+    return '"'.join(segments)
+
 def safe_parse_tokens(tokens_str):
     """Safely parse tokens string with multiple fallback methods."""
     if pd.isna(tokens_str) or tokens_str == '':
         return []
     
+    # Fast path: the CSV holds Python reprs of the token list, which mostly
+    # translate straight to JSON. Escapes mean different things in the two
+    # syntaxes, so text with backslashes (and anything that doesn't parse)
+    # takes the original literal_eval -> json -> quote-swap chain below.
+    # stdlib json rather than orjson: orjson turns >64-bit integers into floats.
+    tokens_text = str(tokens_str)
+    if '\\' not in tokens_text:
+        json_text = _python_literal_as_json(tokens_text)
+        try:
+            return json.loads(json_text if json_text is not None else tokens_text)
+        except ValueError:
+            pass
+    
     try:
         # Method 1: Direct literal_eval
-        return ast.literal_eval(str(tokens_str))
+        return ast.literal_eval(tokens_text)
     except (ValueError, SyntaxError):
         try:
             # Method 2: JSON parsing
-            return json.loads(str(tokens_str))
+            return json.loads(tokens_text)
         except json.JSONDecodeError:
             try:
                 # Method 3: Handle single quotes to double quotes
-                tokens_fixed = str(tokens_str).replace("'", '"')
+                tokens_fixed = tokens_text.replace("'", '"')
                 return json.loads(tokens_fixed)
             except json.JSONDecodeError:
                 print(f"âš ï¸  Warning: Could not parse tokens: {tokens_str[:100]}...")
                 return []
 
+# Tried in order by the CSV readers; cp1252 covers smart quotes from Excel exports
+CSV_ENCODINGS = ['utf-8', 'utf-8-sig', 'cp1252', 'latin-1']
+
 def read_csv_with_fallback(csv_file):
     """Read CSV with encoding fallbacks to handle smart quotes and other cp1252 artifacts."""
-    raw_bytes = Path(csv_file).read_bytes()
-    encodings = ['utf-8', 'utf-8-sig', 'cp1252', 'latin-1']
+    # pandas decodes while it parses straight from the file, so no decoded
+    # copy of the whole file is held next to the raw bytes
     last_error = None
-    for encoding in encodings:
+    for encoding in CSV_ENCODINGS:
         try:
-            text = raw_bytes.decode(encoding)
+            df = pd.read_csv(csv_file, encoding=encoding)
             if encoding != 'utf-8':
                 print(f"Warning: UTF-8 failed, using {encoding} encoding")
-            return pd.read_csv(io.StringIO(text))
+            return df
         except UnicodeDecodeError as exc:
             last_error = exc
     print(f"Warning: Falling back to UTF-8 with replacement due to decode error: {last_error}")
-    text = raw_bytes.decode('utf-8', errors='replace')
-    return pd.read_csv(io.StringIO(text))
+    return pd.read_csv(csv_file, encoding='utf-8', encoding_errors='replace')
+
+def file_sha256(path):
+    """Hex SHA-256 of a file, streamed rather than read into memory whole."""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
 
 def validate_market_data(condition_id, description, market_slug, tokens):
     """Validate market data before adding to lookup."""
@@ -105,10 +211,186 @@ def validate_market_data(condition_id, description, market_slug, tokens):
     
     return issues
 
-def create_market_lookup_incremental(csv_file, output_json_file, backup=True):
+def tokens_are_valid(tokens):
+    """True when validate_market_data would raise no token issues"""
+    return bool(tokens) and all(
+        isinstance(token, dict) and 'token_id' in token and 'outcome' in token
+        for token in tokens
+    )
+
+def market_data_is_valid(condition_id, description, market_slug, tokens):
+    """
+    True when validate_market_data would find no issues.
+    
+    Same rules, but stops at the first failure and allocates nothing, for
+    callers that only need the verdict; validate_market_data still produces
+    the full list for messages.
+    """
+    if not condition_id or pd.isna(condition_id):
+        return False
+    if not str(condition_id).startswith('0x') and condition_id != 'NaN':
+        return False
+    if not description or pd.isna(description) or len(str(description).strip()) < 10:
+        return False
+    if not market_slug or pd.isna(market_slug):
+        return False
+    return tokens_are_valid(tokens)
+
+def fingerprint_path(output_json_file):
+    """Sidecar file recording which CSV the lookup was last built from."""
+    return f"{output_json_file}.fingerprint.json"
+
+def load_fingerprint(output_json_file):
+    """Load the stored CSV fingerprint, or {} if missing or unreadable."""
+    try:
+        with open(fingerprint_path(output_json_file), 'r') as f:
+            fingerprint = json.load(f)
+        return fingerprint if isinstance(fingerprint, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_fingerprint(output_json_file, csv_stat, csv_sha256):
+    """Record the CSV fingerprint alongside the lookup file it produced."""
+    try:
+        lookup_stat = os.stat(output_json_file)
+        fingerprint = {
+            "csv_sha256": csv_sha256,
+            "csv_size": csv_stat.st_size,
+            "csv_mtime_ns": csv_stat.st_mtime_ns,
+            "lookup_size": lookup_stat.st_size,
+            "lookup_mtime_ns": lookup_stat.st_mtime_ns,
+        }
+        temp_file = f"{fingerprint_path(output_json_file)}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(fingerprint, f, indent=2, sort_keys=True)
+        os.replace(temp_file, fingerprint_path(output_json_file))
+    except OSError as e:
+        # Only costs a full rebuild next run
+        print(f"Warning: Could not save CSV fingerprint: {e}")
+
+def lookup_matches_fingerprint(output_json_file, fingerprint):
+    """True if the lookup file is still exactly the one the fingerprint was saved with."""
+    try:
+        lookup_stat = os.stat(output_json_file)
+    except OSError:
+        return False
+    return (fingerprint.get('lookup_size') == lookup_stat.st_size
+            and fingerprint.get('lookup_mtime_ns') == lookup_stat.st_mtime_ns)
+
+def lookup_index_path(output_json_file):
+    """SQLite mirror of the lookup: one row per condition_id, for indexed queries."""
+    return f"{output_json_file}.sqlite"
+
+def open_lookup_index(output_json_file):
+    """Open (creating if needed) the lookup's SQLite index"""
+    conn = sqlite3.connect(lookup_index_path(output_json_file))
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS markets (
+            condition_id TEXT PRIMARY KEY,
+            description TEXT,
+            market_slug TEXT,
+            tokens_json TEXT,
+            content_hash TEXT,
+            last_updated TEXT
+        );
+        CREATE INDEX IF NOT EXISTS markets_slug ON markets (market_slug);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """)
+    return conn
+
+def lookup_index_in_sync(conn, output_json_file):
+    """True if the index mirrors the lookup file as it is on disk now"""
+    try:
+        lookup_stat = os.stat(output_json_file)
+    except OSError:
+        return False
+    meta = dict(conn.execute('SELECT key, value FROM meta'))
+    return (meta.get('lookup_size') == lookup_stat.st_size
+            and meta.get('lookup_mtime_ns') == lookup_stat.st_mtime_ns)
+
+def _lookup_index_row(condition_id, entry):
+    return (condition_id, entry.get('description'), entry.get('market_slug'),
+            json.dumps(entry.get('tokens', [])), entry.get('content_hash'), entry.get('last_updated'))
+
+def update_lookup_index(output_json_file, lookup, changed_ids, in_sync):
+    """
+    Bring the SQLite index in line with the lookup just saved.
+    
+    An index that was in sync before the run only needs the changed rows
+    upserted; otherwise it is rebuilt from the whole lookup. Index trouble is
+    reported and left for the next run, the JSON file stays authoritative.
+    """
+    try:
+        conn = open_lookup_index(output_json_file)
+        try:
+            with conn:
+                if in_sync:
+                    rows = [_lookup_index_row(cid, lookup[cid]) for cid in changed_ids]
+                else:
+                    conn.execute('DELETE FROM markets')
+                    rows = [_lookup_index_row(cid, entry) for cid, entry in lookup.items()]
+                conn.executemany('INSERT OR REPLACE INTO markets VALUES (?, ?, ?, ?, ?, ?)', rows)
+                lookup_stat = os.stat(output_json_file)
+                conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                                 [('lookup_size', lookup_stat.st_size),
+                                  ('lookup_mtime_ns', lookup_stat.st_mtime_ns)])
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError, TypeError, ValueError, AttributeError) as e:
+        print(f"Warning: Could not update lookup index: {e}")
+
+def query_lookup_index(lookup_json, sql, params=()):
+    """Rows for sql on the lookup's index, or None when there is no in-sync index"""
+    if not os.path.exists(lookup_index_path(lookup_json)):
+        return None
+    try:
+        conn = sqlite3.connect(lookup_index_path(lookup_json))
+        try:
+            if not lookup_index_in_sync(conn, lookup_json):
+                return None
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+def market_content_hash(description, market_slug, tokens):
+    """Stable 16-byte blake2b digest (hex) of the fields compared on update."""
+    h = hashlib.blake2b(digest_size=16)
+    # NUL-separated so shifting text between fields can't collide
+    h.update(description.encode())
+    h.update(b'\0')
+    h.update(market_slug.encode())
+    for token in tokens:
+        h.update(b'\0')
+        h.update(token['token_id'].encode())
+        h.update(b'\0')
+        h.update(token['outcome'].encode())
+    return h.hexdigest()
+
+def dump_lookup(lookup, pretty=False):
+    """Serialize the lookup to JSON bytes: compact and ordered by condition_id, or indented."""
+    if pretty:
+        if orjson is not None:
+            return orjson.dumps(lookup, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+        return json.dumps(lookup, indent=2, sort_keys=True).encode('utf-8')
+    # Only the top level needs ordering; sorting it once is cheaper than
+    # sort_keys re-sorting every entry's fields
+    sorted_lookup = dict(sorted(lookup.items()))
+    if orjson is not None:
+        return orjson.dumps(sorted_lookup)
+    return json.dumps(sorted_lookup, separators=(',', ':')).encode('utf-8')
+
+def create_market_lookup_incremental(csv_file, output_json_file, backup=True, pretty=False):
     """
     Create/update a JSON lookup from a CSV file incrementally.
     Only adds new markets or updates changed ones.
+    
+    The lookup is written as compact JSON ordered by condition_id; pass
+    pretty=True for the indented, key-sorted form when reading it by hand.
     """
     print("ðŸš€ INCREMENTAL MARKET LOOKUP GENERATOR")
     print("=" * 60)
@@ -122,18 +404,33 @@ def create_market_lookup_incremental(csv_file, output_json_file, backup=True):
     output_dir = Path(output_json_file).parent
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Create backup if requested and file exists
-    if backup and os.path.exists(output_json_file):
-        timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
-        backup_path = f"{output_json_file}.backup.{timestamp}"
-        try:
-            shutil.copy2(output_json_file, backup_path)
-            print(f"ðŸ’¾ Backup created: {backup_path}")
-        except Exception as e:
-            print(f"âš ï¸  Warning: Could not create backup: {e}")
+    # Skip the whole run if the CSV is byte-identical to the one the current
+    # lookup was built from: size+mtime first, then a SHA-256 of the contents
+    fingerprint = load_fingerprint(output_json_file)
+    lookup_current = lookup_matches_fingerprint(output_json_file, fingerprint)
+    csv_stat = os.stat(csv_file)
+    if (lookup_current and fingerprint.get('csv_size') == csv_stat.st_size
+            and fingerprint.get('csv_mtime_ns') == csv_stat.st_mtime_ns):
+        print(f"CSV unchanged since last run, lookup is up to date: {output_json_file}")
+        return True
+    csv_sha256 = file_sha256(csv_file)
+    if lookup_current and fingerprint.get('csv_sha256') == csv_sha256:
+        print(f"CSV unchanged since last run, lookup is up to date: {output_json_file}")
+        # Same contents, new mtime: record it so the next run skips the hash
+        save_fingerprint(output_json_file, csv_stat, csv_sha256)
+        return True
     
     # Load existing lookup
     existing_lookup = load_existing_lookup(output_json_file)
+    try:
+        conn = open_lookup_index(output_json_file)
+        try:
+            index_in_sync = lookup_index_in_sync(conn, output_json_file)
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        index_in_sync = False
+    changed_ids = []
     
     try:
         # Read the CSV file
@@ -160,79 +457,118 @@ def create_market_lookup_incremental(csv_file, output_json_file, backup=True):
         
         print("ðŸ”„ Processing markets...")
         
-        for index, row in df_dedup.iterrows():
-            condition_id = str(row['condition_id'])
-            description = str(row['description'])
-            market_slug = str(row['market_slug'])
-            tokens_str = row['tokens']
+        # Vectorized validation of the scalar fields (same rules as
+        # validate_market_data); only rows that fail build the issues list
+        condition_ids = df_dedup['condition_id'].map(str)
+        descriptions = df_dedup['description'].map(str)
+        market_slugs = df_dedup['market_slug'].map(str)
+        fields_valid = (
+            (condition_ids.str.startswith('0x') | (condition_ids == 'NaN'))
+            & (descriptions.str.strip().str.len() >= 10)
+            & (market_slugs != '')
+        )
+        
+        # Per-row hash of the source fields; an entry built from an identical
+        # row (same stored row_hash) is skipped before parsing or validation
+        row_hashes = pd.util.hash_pandas_object(
+            pd.DataFrame({'condition_id': condition_ids, 'description': descriptions,
+                          'market_slug': market_slugs, 'tokens': df_dedup['tokens']}),
+            index=False).map('{:016x}'.format)
+        
+        # One timestamp for the whole run: every entry written now shares it
+        run_timestamp = datetime.now(timezone.utc).isoformat()
+        
+        for condition_id, description, market_slug, tokens_str, row_fields_valid, row_hash in zip(
+            condition_ids.to_numpy(), descriptions.to_numpy(), market_slugs.to_numpy(),
+            df_dedup['tokens'].to_numpy(), fields_valid.to_numpy(), row_hashes.to_numpy()
+        ):
+            existing_entry = existing_lookup.get(condition_id)
+            if existing_entry is not None and existing_entry.get('row_hash') == row_hash:
+                continue
             
             # Parse tokens safely
             tokens_list = safe_parse_tokens(tokens_str)
             
-            # Validate market data
-            validation_issues = validate_market_data(condition_id, description, market_slug, tokens_list)
-            if validation_issues:
+            if not (row_fields_valid and tokens_are_valid(tokens_list)):
+                validation_issues = validate_market_data(condition_id, description, market_slug, tokens_list)
                 print(f"âš ï¸  Skipping market {condition_id}: {'; '.join(validation_issues)}")
                 failed_markets += 1
                 continue
             
-            # Extract token information
-            try:
-                tokens_info = []
-                for token in tokens_list:
-                    if isinstance(token, dict) and 'token_id' in token and 'outcome' in token:
-                        tokens_info.append({
-                            "token_id": str(token["token_id"]),
-                            "outcome": str(token["outcome"])
-                        })
+            # Extract token information (validation guarantees a non-empty list
+            # of dicts carrying both fields)
+            tokens_info = [
+                {"token_id": str(token["token_id"]), "outcome": str(token["outcome"])}
+                for token in tokens_list
+            ]
+            
+            content_hash = market_content_hash(description, market_slug, tokens_info)
+            
+            # Check if this is new or updated
+            is_new = existing_entry is None
+            if not is_new:
+                # Check if data has changed (excluding timestamp); entries
+                # written before content_hash existed are hashed on the fly
+                existing_hash = existing_entry.get('content_hash')
+                if existing_hash is None:
+                    try:
+                        existing_hash = market_content_hash(
+                            existing_entry['description'], existing_entry['market_slug'],
+                            existing_entry['tokens'])
+                    except (KeyError, TypeError, AttributeError):
+                        existing_hash = None
                 
-                if not tokens_info:
-                    print(f"âš ï¸  Skipping market {condition_id}: No valid tokens")
-                    failed_markets += 1
+                if existing_hash == content_hash:
+                    # Same entry from a different row (e.g. only token prices
+                    # moved): remember the row so it is skipped next time
+                    existing_entry['row_hash'] = row_hash
+                    existing_entry['content_hash'] = content_hash
+                    changed_ids.append(condition_id)
                     continue
-                
-            except Exception as e:
-                print(f"âš ï¸  Error processing tokens for {condition_id}: {e}")
-                failed_markets += 1
-                continue
             
-            # Create market entry
-            market_entry = {
+            # Create market entry (only for new or changed markets)
+            existing_lookup[condition_id] = {
                 "description": description,
                 "market_slug": market_slug,
                 "tokens": tokens_info,
-                "last_updated": datetime.now(timezone.utc).isoformat()
+                "content_hash": content_hash,
+                "row_hash": row_hash,
+                "last_updated": run_timestamp
             }
-            
-            # Check if this is new or updated
-            if condition_id not in existing_lookup:
-                existing_lookup[condition_id] = market_entry
+            changed_ids.append(condition_id)
+            if is_new:
                 new_markets += 1
-                if (new_markets + updated_markets) % 100 == 0:
-                    print(f"   Processed {new_markets + updated_markets} markets...")
             else:
-                # Check if data has changed (excluding timestamp)
-                existing_entry = existing_lookup[condition_id].copy()
-                existing_entry.pop('last_updated', None)
-                new_entry_compare = market_entry.copy()
-                new_entry_compare.pop('last_updated', None)
-                
-                if existing_entry != new_entry_compare:
-                    existing_lookup[condition_id] = market_entry
-                    updated_markets += 1
-                    if (new_markets + updated_markets) % 100 == 0:
-                        print(f"   Processed {new_markets + updated_markets} markets...")
+                updated_markets += 1
+            if (new_markets + updated_markets) % 100 == 0:
+                print(f"   Processed {new_markets + updated_markets} markets...")
         
-        # Save the updated lookup
-        print("ðŸ’¾ Saving updated lookup...")
+        # Save the updated lookup; nothing new or changed leaves the file as is
         try:
-            # Write to temporary file first for atomicity
-            temp_file = f"{output_json_file}.tmp"
-            with open(temp_file, 'w') as json_file:
-                json.dump(existing_lookup, json_file, indent=2, sort_keys=True)
-            
-            # Atomically replace the original file
-            os.replace(temp_file, output_json_file)
+            if changed_ids or not os.path.exists(output_json_file):
+                # Back up only when the file is about to be replaced; it always
+                # is replaced (os.replace), so a hardlink is a safe snapshot
+                if backup and os.path.exists(output_json_file):
+                    try:
+                        backup_path = backup_file(output_json_file, hardlink=True)
+                        print(f"ðŸ’¾ Backup created: {backup_path}")
+                    except Exception as e:
+                        print(f"âš ï¸  Warning: Could not create backup: {e}")
+                print("ðŸ’¾ Saving updated lookup...")
+                # Write to temporary file first for atomicity
+                temp_file = f"{output_json_file}.tmp"
+                with open(temp_file, 'wb') as json_file:
+                    json_file.write(dump_lookup(existing_lookup, pretty))
+                    # Contents must be on disk before the rename makes them visible
+                    json_file.flush()
+                    os.fsync(json_file.fileno())
+                
+                # Atomically replace the original file
+                os.replace(temp_file, output_json_file)
+            else:
+                print("No new or changed markets, lookup file left as is")
+            update_lookup_index(output_json_file, existing_lookup, changed_ids, index_in_sync)
+            save_fingerprint(output_json_file, csv_stat, csv_sha256)
             
             print(f"âœ… Successfully updated market lookup!")
             print(f"ðŸ“Š SUMMARY:")
@@ -263,17 +599,41 @@ def create_market_lookup(csv_file, output_json_file):
 
 
 
-def query_description_by_keyword(lookup_json, keyword):
+@lru_cache(maxsize=8)
+def _load_lookup(lookup_json, mtime):
+    """Parsed lookup keyed on the file's mtime, so a rewritten file is re-read"""
+    if orjson is not None:
+        with open(lookup_json, 'rb') as json_file:
+            return orjson.loads(json_file.read())
     with open(lookup_json, 'r') as json_file:
-        lookup_dict = json.load(json_file)
+        return json.load(json_file)
 
-    results = {cond_id: info for cond_id, info in lookup_dict.items() if keyword.lower() in info['description'].lower()}
+@lru_cache(maxsize=8)
+def _load_lookup_descriptions(lookup_json, mtime):
+    """(condition_id, lower-cased description) pairs for keyword scans"""
+    return tuple((cond_id, info['description'].lower())
+                 for cond_id, info in _load_lookup(lookup_json, mtime).items())
+
+def query_description_by_keyword(lookup_json, keyword):
+    mtime = os.path.getmtime(lookup_json)
+    lookup_dict = _load_lookup(lookup_json, mtime)
+    keyword = keyword.lower()
+
+    # Shallow copies so callers can't edit the cached entries
+    results = {cond_id: dict(lookup_dict[cond_id])
+               for cond_id, description in _load_lookup_descriptions(lookup_json, mtime)
+               if keyword in description}
     return results
 
 
 def get_market_slug_by_condition_id(lookup_json, condition_id):
-    with open(lookup_json, 'r') as json_file:
-        lookup_dict = json.load(json_file)
+    # Indexed point query when the SQLite mirror is current, no JSON parse
+    rows = query_lookup_index(lookup_json, 'SELECT market_slug FROM markets WHERE condition_id = ?',
+                              (condition_id,))
+    if rows is not None:
+        return rows[0][0] if rows else None
+    
+    lookup_dict = _load_lookup(lookup_json, os.path.getmtime(lookup_json))
 
     return lookup_dict.get(condition_id, {}).get('market_slug')
 
@@ -284,8 +644,9 @@ if __name__ == "__main__":
     csv_file = './data/markets_data.csv'
     output_json_file = './data/market_lookup.json'
     
-    # Run incremental update
-    success = create_market_lookup_incremental(csv_file, output_json_file, backup=True)
+    # Run incremental update (--pretty writes indented JSON for reading by hand)
+    pretty = '--pretty' in sys.argv[1:]
+    success = create_market_lookup_incremental(csv_file, output_json_file, backup=True, pretty=pretty)
     
     if success:
         print("\nðŸŽ‰ Market lookup successfully updated!")
@@ -1,11 +1,13 @@
 import os
 import csv
 import json
+import base64
+import binascii
 import pandas as pd
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from py_clob_client.client import ClobClient
-from generate_market_lookup_json import create_market_lookup_incremental
+from generate_market_lookup_json import backup_file, create_market_lookup_incremental
 
 # Load environment variables
 load_dotenv()
@@ -17,31 +19,62 @@ chain_id = 137
 client = ClobClient(host, key=api_key, chain_id=chain_id)
 
 def load_existing_markets(csv_file):
-    """Load existing markets from CSV and return as dict by condition_id."""
+    """
+    Load existing markets from CSV.
+    
+    Returns the DataFrame of rows with a usable condition_id plus the set of
+    those ids; rows only become dicts in existing_market_rows(), when the CSV
+    is actually rewritten.
+    """
     if not os.path.exists(csv_file):
         print(f"📄 No existing markets file found: {csv_file}")
-        return {}, set()
+        return pd.DataFrame(), set()
     
     try:
         df = pd.read_csv(csv_file)
         print(f"📊 Loaded {len(df)} existing markets from {csv_file}")
         
-        # Convert to dict indexed by condition_id
-        existing_markets = {}
-        condition_ids = set()
-        
-        for _, row in df.iterrows():
-            condition_id = str(row.get('condition_id', ''))
-            if condition_id and condition_id != 'nan':
-                existing_markets[condition_id] = row.to_dict()
-                condition_ids.add(condition_id)
+        if 'condition_id' not in df.columns:
+            condition_ids = set()
+            df = df.iloc[0:0]
+        else:
+            ids = df['condition_id'].map(str)
+            has_id = (ids != '') & (ids != 'nan')
+            df = df[has_id]
+            condition_ids = set(ids[has_id])
         
         print(f"📋 Found {len(condition_ids)} unique condition IDs")
-        return existing_markets, condition_ids
+        return df, condition_ids
         
     except Exception as e:
         print(f"⚠️  Error loading existing markets: {e}")
-        return {}, set()
+        return pd.DataFrame(), set()
+
+def existing_market_rows(existing_df):
+    """Existing CSV rows as dicts, one per condition_id (first position, last row wins)."""
+    if existing_df.empty:
+        return []
+    markets_by_id = {}
+    for condition_id, row in zip(existing_df['condition_id'].map(str), existing_df.to_dict('records')):
+        markets_by_id[condition_id] = row
+    return list(markets_by_id.values())
+
+# CLOB cursors are base64-encoded integer offsets ("MTAw" -> "100"). When the
+# returned cursor decodes that way, the pages after it are requested ahead in
+# parallel; a prefetched page is only used if its cursor is the one the API
+# actually hands back, so a format change just falls back to serial paging.
+PREFETCH_PAGES = 4
+
+def cursor_offset(cursor):
+    """Integer offset encoded in a CLOB cursor, or None if it isn't one."""
+    try:
+        return int(base64.b64decode(cursor, validate=True).decode('ascii'))
+    except (TypeError, ValueError, UnicodeDecodeError, binascii.Error):
+        return None
+
+def offset_cursor(offset):
+    """CLOB cursor for an integer offset (inverse of cursor_offset)."""
+    return base64.b64encode(str(offset).encode('ascii')).decode('ascii')
 
 def fetch_markets_batch(next_cursor=None, limit=100):
     """Fetch a batch of markets from API."""
@@ -60,6 +93,21 @@ def fetch_markets_batch(next_cursor=None, limit=100):
         print(f"⚠️  Error fetching markets batch: {e}")
         return [], None
 
+def prefetch_pages(pages, inflight, page_offset, next_cursor):
+    """Keep the next PREFETCH_PAGES guessed pages in flight, dropping stale guesses."""
+    next_offset = cursor_offset(next_cursor) if next_cursor else None
+    wanted = []
+    if (page_offset is not None and next_offset is not None and next_offset > page_offset
+            and offset_cursor(next_offset) == next_cursor):
+        step = next_offset - page_offset
+        wanted = [offset_cursor(next_offset + step * ahead) for ahead in range(PREFETCH_PAGES)]
+    for cursor in list(inflight):
+        if cursor not in wanted:
+            inflight.pop(cursor).cancel()
+    for cursor in wanted:
+        if cursor not in inflight:
+            inflight[cursor] = pages.submit(fetch_markets_batch, cursor)
+
 def incremental_update_markets(csv_file="./data/markets_data.csv", 
                               max_new_markets=1000,
                               backup=True):
@@ -77,106 +125,161 @@ def incremental_update_markets(csv_file="./data/markets_data.csv",
     # Ensure data directory exists
     os.makedirs(os.path.dirname(csv_file), exist_ok=True)
     
-    # Create backup if requested
-    if backup and os.path.exists(csv_file):
-        timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
-        backup_path = f"{csv_file}.backup.{timestamp}"
-        try:
-            import shutil
-            shutil.copy2(csv_file, backup_path)
-            print(f"💾 Backup created: {backup_path}")
-        except Exception as e:
-            print(f"⚠️  Warning: Could not create backup: {e}")
-    
     # Load existing markets
-    existing_markets, existing_condition_ids = load_existing_markets(csv_file)
+    existing_df, existing_condition_ids = load_existing_markets(csv_file)
     
     # Fetch new markets incrementally
     print("🔄 Fetching new markets from API...")
-    all_markets = list(existing_markets.values())
+    new_markets = []
     new_markets_count = 0
     next_cursor = None
     
-    while new_markets_count < max_new_markets:
-        # Fetch batch
-        batch_markets, next_cursor = fetch_markets_batch(next_cursor)
-        
-        if not batch_markets:
-            print("✅ No more markets to fetch")
-            break
-        
-        # Filter for new markets only
-        new_batch_markets = []
-        for market in batch_markets:
-            condition_id = str(market.get('condition_id', ''))
-            if condition_id and condition_id not in existing_condition_ids:
-                new_batch_markets.append(market)
-                existing_condition_ids.add(condition_id)
-                new_markets_count += 1
-        
-        if new_batch_markets:
-            all_markets.extend(new_batch_markets)
-            print(f"   Added {len(new_batch_markets)} new markets (total new: {new_markets_count})")
-        else:
-            print(f"   No new markets in this batch")
-        
-        # Stop if we've reached the limit
-        if new_markets_count >= max_new_markets:
-            print(f"⚠️  Reached maximum new markets limit: {max_new_markets}")
-            break
+    pages = ThreadPoolExecutor(max_workers=PREFETCH_PAGES)
+    inflight = {}  # cursor -> future for fetch_markets_batch(cursor)
+    try:
+        while new_markets_count < max_new_markets:
+            # Fetch batch (already in flight if the cursor was guessed right)
+            pending = inflight.pop(next_cursor, None) or pages.submit(fetch_markets_batch, next_cursor)
+            page_offset = 0 if next_cursor is None else cursor_offset(next_cursor)
+            batch_markets, next_cursor = pending.result()
             
-        # Stop if no more pages
-        if not next_cursor:
-            print("✅ Reached end of available markets")
-            break
+            if not batch_markets:
+                print("✅ No more markets to fetch")
+                break
+            
+            prefetch_pages(pages, inflight, page_offset, next_cursor)
+            
+            # Filter for new markets only
+            new_batch_markets = []
+            for market in batch_markets:
+                condition_id = str(market.get('condition_id', ''))
+                if condition_id and condition_id not in existing_condition_ids:
+                    new_batch_markets.append(market)
+                    existing_condition_ids.add(condition_id)
+                    new_markets_count += 1
+            
+            if new_batch_markets:
+                new_markets.extend(new_batch_markets)
+                print(f"   Added {len(new_batch_markets)} new markets (total new: {new_markets_count})")
+            else:
+                print(f"   No new markets in this batch")
+            
+            # Stop if we've reached the limit
+            if new_markets_count >= max_new_markets:
+                print(f"⚠️  Reached maximum new markets limit: {max_new_markets}")
+                break
+                
+            # Stop if no more pages
+            if not next_cursor:
+                print("✅ Reached end of available markets")
+                break
+    finally:
+        # Don't wait on (or keep) prefetches nobody will read
+        pages.shutdown(wait=False, cancel_futures=True)
     
     # Save updated CSV
     if new_markets_count > 0:
-        print(f"💾 Saving {len(all_markets)} total markets...")
-        save_markets_to_csv(all_markets, csv_file)
+        # Back up only when the CSV is about to change. It is appended to or
+        # rewritten in place, so no hardlink: that would change with it.
+        if backup and os.path.exists(csv_file):
+            try:
+                backup_path = backup_file(csv_file)
+                print(f"💾 Backup created: {backup_path}")
+            except Exception as e:
+                print(f"⚠️  Warning: Could not create backup: {e}")
+        
+        # Purely additive: append the new rows unless they bring columns the
+        # on-disk header doesn't have, in which case rewrite the whole file
+        header = read_csv_header(csv_file) if not existing_df.empty else None
+        if header and market_columns(new_markets) <= set(header):
+            print(f"💾 Appending {new_markets_count} new markets...")
+            append_markets_to_csv(new_markets, csv_file, header)
+        else:
+            all_markets = existing_market_rows(existing_df) + new_markets
+            print(f"💾 Saving {len(all_markets)} total markets...")
+            save_markets_to_csv(all_markets, csv_file)
         print(f"✅ Successfully added {new_markets_count} new markets")
     else:
         print("✅ No new markets found - CSV is up to date")
     
     return new_markets_count
 
-def save_markets_to_csv(markets_list, csv_file):
-    """Save markets list to CSV file."""
-    # Get all possible columns
+def market_columns(markets_list):
+    """All CSV columns the markets produce: their keys plus token_<key> for token fields."""
     csv_columns = set()
     for market in markets_list:
         csv_columns.update(market.keys())
-        if 'tokens' in market:
-            for token in market.get('tokens', []):
-                csv_columns.update({f"token_{key}" for key in token.keys()})
-    
-    csv_columns = sorted(csv_columns)
+        tokens = market.get('tokens')
+        if isinstance(tokens, list):
+            for token in tokens:
+                csv_columns.update(f"token_{key}" for key in token.keys())
+    return csv_columns
+
+def markets_frame(markets_list, csv_columns):
+    """DataFrame of the markets with exactly csv_columns, in that order."""
+    # Build the frame column by column; token_* columns join the per-token
+    # values, while rows reloaded from CSV (tokens already a string) keep
+    # their own token_* values. None is written as '' like DictWriter did.
+    market_tokens = [market.get('tokens', []) for market in markets_list]
+    columns = {}
+    for key in csv_columns:
+        if key.startswith("token_"):
+            token_key = key[len("token_"):]
+            columns[key] = [
+                (', '.join([str(token.get(token_key, 'N/A')) for token in tokens]) or 'N/A')
+                if isinstance(tokens, list) else market.get(key, 'N/A')
+                for market, tokens in zip(markets_list, market_tokens)
+            ]
+        else:
+            values = [market.get(key, 'N/A') for market in markets_list]
+            if None in values:
+                values = ['' if value is None else value for value in values]
+            columns[key] = values
+    return pd.DataFrame(columns, columns=list(csv_columns), dtype=object)
+
+def read_csv_header(csv_file):
+    """Column names from the CSV's header line, or None if it can't be read."""
+    try:
+        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+            return next(csv.reader(f))
+    except (OSError, UnicodeDecodeError, StopIteration, csv.Error):
+        return None
+
+def save_markets_to_csv(markets_list, csv_file):
+    """Save markets list to CSV file."""
+    csv_columns = sorted(market_columns(markets_list))
     
     try:
-        with open(csv_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=csv_columns)
-            writer.writeheader()
-            
-            for market in markets_list:
-                row = {}
-                for key in csv_columns:
-                    if key.startswith("token_"):
-                        token_key = key[len("token_"):]
-                        tokens = market.get('tokens', [])
-                        if tokens:
-                            row[key] = ', '.join([str(token.get(token_key, 'N/A')) for token in tokens])
-                        else:
-                            row[key] = 'N/A'
-                    else:
-                        row[key] = market.get(key, 'N/A')
-                writer.writerow(row)
-                
+        markets_df = markets_frame(markets_list, csv_columns)
+        # na_rep/lineterminator match what csv.DictWriter wrote before
+        markets_df.to_csv(csv_file, index=False, encoding='utf-8', na_rep='nan', lineterminator='\r\n')
+        
         print(f"💾 Markets data saved to: {csv_file}")
         
     except Exception as e:
         print(f"❌ Error saving CSV: {e}")
         raise
 
+def append_markets_to_csv(markets_list, csv_file, header):
+    """Append markets as rows under an existing header (their columns must be a subset of it)."""
+    try:
+        with open(csv_file, 'rb+') as f:
+            # A file not ending in a newline would glue the first row onto the last
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\r\n')
+        markets_df = markets_frame(markets_list, header)
+        markets_df.to_csv(csv_file, mode='a', header=False, index=False, encoding='utf-8',
+                          na_rep='nan', lineterminator='\r\n')
+        
+        print(f"💾 Markets data appended to: {csv_file}")
+        
+    except Exception as e:
+        print(f"❌ Error saving CSV: {e}")
+        raise
+
 def update_selected_markets_workflow(selected_slugs, 
                                    markets_csv="./data/markets_data.csv",
                                    selected_json="./data/selected_market_lookup.json"):
@@ -212,7 +315,6 @@ def update_selected_markets_workflow(selected_slugs,
         selected_lookup = create_selected_market_lookup(
             selected_slugs, 
             input_csv=markets_csv,
-            temp_lookup=temp_lookup,
             output_json=selected_json
         )
         
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Levenshtein edit distance, JIT-compiled with Numba when it is installed
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None  # type: ignore[assignment]
+
+# Callers should prefer difflib over the interpreted DP loop when this is False
+JIT_AVAILABLE = njit is not None
+
+def _levenshtein(a, b):
+    """Wagner-Fischer edit distance between two code point arrays, O(len(b)) space"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = np.arange(len(b) + 1, dtype=np.int32)
+    current = np.empty(len(b) + 1, dtype=np.int32)
+    for i in range(1, len(a) + 1):
+        current[0] = i
+        for j in range(1, len(b) + 1):
+            substitution = previous[j - 1] + (0 if a[i - 1] == b[j - 1] else 1)
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, substitution)
+        previous, current = current, previous
+    return previous[len(b)]
+
+if JIT_AVAILABLE:
+    _levenshtein = njit(cache=True)(_levenshtein)
+
+def _code_points(text: str) -> np.ndarray:
+    """One uint32 per character, so non-ASCII text is compared per character"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+def levenshtein_distance(a: str, b: str) -> int:
+    """Minimum number of single-character edits turning a into b"""
+    return int(_levenshtein(_code_points(a), _code_points(b)))
+
+def levenshtein_ratio(a: str, b: str) -> float:
+    """Similarity in [0, 1]: 1 - distance / length of the longer string"""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    return 1.0 - levenshtein_distance(a, b) / longest
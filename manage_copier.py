@@ -5,34 +5,205 @@ Easy interface for setting up and managing Polymarket trade copying
 """
 
 import os
+import re
+import sys
 import json
-import argparse
-import subprocess
+import mmap
+import pickle
+import struct
 from typing import List, Dict
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# 0x followed by exactly 40 hex digits (\Z: a trailing newline doesn't match)
+_ADDRESS_RE = re.compile(r'\A0x[0-9a-fA-F]{40}\Z')
+
+# copy_settings keys; each is also a run_monitor() keyword argument
+COPY_SETTINGS = ('copy_percentage', 'min_trade_size', 'max_trade_size', 'check_interval')
+
+# list_addresses status label, indexed by bool(entry['active'])
+STATUS = ('✗ Inactive', '✓ Active')
+
+# Header of the pickled config snapshot: st_mtime_ns, st_size and st_ino of
+# the JSON file it was taken from. Any mismatch means the snapshot is stale.
+CONFIG_CACHE_HEADER = struct.Struct('<QQQ')
+
+_MISSING = object()
+
+class LazyConfig:
+    """
+    Config file view that parses top-level sections only when they are read.
+    
+    With ijson, a section is streamed out of the mmapped file the first time
+    it is accessed, so e.g. the settings commands never build the watched
+    addresses. Sections that were read (and may have been changed in place)
+    or assigned are kept, and merged over the full file on save.
+    
+    Every section parsed from the file is also pickled into cache_file, keyed
+    by the file's stat; while the file is unchanged, later runs unpickle the
+    section instead of parsing JSON again.
+    """
+    
+    def __init__(self, config_file: str, defaults, cache_file: str = None):
+        self.config_file = config_file
+        self.defaults = defaults
+        self.cache_file = cache_file
+        self._sections = {}
+        self._full = None  # whole file, parsed only when needed
+        self._stamp = None
+        self._cache = None  # (complete, {section: pickled bytes}) for _stamp
+    
+    def __getitem__(self, key: str):
+        if key not in self._sections:
+            self._sections[key] = self._read_section(key)
+        return self._sections[key]
+    
+    def __setitem__(self, key: str, value):
+        self._sections[key] = value
+    
+    def _read_section(self, key: str):
+        if self._full is None:
+            complete, pickled = self._snapshot()
+            if key in pickled:
+                return pickle.loads(pickled[key])
+            if not complete and ijson is not None:
+                section = self._stream_section(key)
+                if section is not _MISSING:
+                    pickled[key] = pickle.dumps(section, protocol=pickle.HIGHEST_PROTOCOL)
+                    self._store_cached()
+                    return section
+        # No ijson, no such file/section, or a parse error: the full load
+        # handles (and reports) all of those
+        return self._load_full()[key]
+    
+    def _stream_section(self, key: str):
+        try:
+            with open(self.config_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                for section in ijson.items(buf, key, use_float=True):
+                    return section
+        except (OSError, ValueError, ijson.JSONError):
+            pass
+        return _MISSING
+    
+    def _load_full(self) -> Dict:
+        if self._full is None:
+            complete, pickled = self._snapshot()
+            if complete:
+                self._full = {key: pickle.loads(data) for key, data in pickled.items()}
+            elif self._stamp is not None:
+                try:
+                    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                    if orjson is not None:
+                        with open(self.config_file, 'rb') as f:
+                            self._full = orjson.loads(f.read())
+                    else:
+                        with open(self.config_file, 'r') as f:
+                            self._full = json.load(f)
+                    self._cache = (True, {key: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                                          for key, value in self._full.items()})
+                    self._store_cached()
+                except json.JSONDecodeError:
+                    logger.warning("Invalid config file, creating new one")
+            if self._full is None:
+                self._full = self.defaults()
+        return self._full
+    
+    def _snapshot(self):
+        """Cached sections for the file as it is now (stat once per instance)"""
+        if self._cache is None:
+            try:
+                st = os.stat(self.config_file)
+                self._stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+            except OSError:
+                self._stamp = None
+            self._cache = self._load_cached() or (False, {})
+        return self._cache
+    
+    def _load_cached(self):
+        if self.cache_file is None or self._stamp is None:
+            return None
+        try:
+            with open(self.cache_file, 'rb') as f:
+                header = f.read(CONFIG_CACHE_HEADER.size)
+                if len(header) != CONFIG_CACHE_HEADER.size or CONFIG_CACHE_HEADER.unpack(header) != self._stamp:
+                    return None
+                complete, pickled = pickle.load(f)
+                return bool(complete), dict(pickled)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Unreadable snapshot: parse the JSON and overwrite it
+            logger.debug(f"Ignoring config cache {self.cache_file}: {e}")
+            return None
+    
+    def _store_cached(self):
+        if self.cache_file is None or self._stamp is None:
+            return
+        tmp_path = f"{self.cache_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(CONFIG_CACHE_HEADER.pack(*self._stamp))
+                pickle.dump(self._cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.debug(f"Could not write config cache {self.cache_file}: {e}")
+    
+    def invalidate_cache(self):
+        """Drop the pickled snapshot (before the config file is rewritten)"""
+        if self.cache_file is None:
+            return
+        try:
+            os.unlink(self.cache_file)
+        except FileNotFoundError:
+            pass
+    
+    def to_dict(self) -> Dict:
+        """The whole config: the file's contents with loaded sections on top"""
+        config = dict(self._load_full())
+        config.update(self._sections)
+        return config
+
 class TradeCopierManager:
     """Helper class to manage trade copying operations"""
     
     def __init__(self):
         self.config_file = './config/trade_copier_config.json'
+        self.config_cache_file = './data/.trade_copier_config.cache'
         self.config = self.load_config()
     
-    def load_config(self) -> Dict:
-        """Load configuration from file"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                logger.warning("Invalid config file, creating new one")
-        
-        # Default configuration
+    def watched_addresses(self) -> Dict[str, Dict]:
+        """Watched address entries keyed by lower-cased address"""
+        watched = self.config['watched_addresses']
+        if isinstance(watched, list):
+            # Older configs store a list; migrate (first entry wins on a case-only duplicate)
+            migrated = {}
+            for addr in watched:
+                migrated.setdefault(addr['address'].lower(), addr)
+            self.config['watched_addresses'] = watched = migrated
+        return watched
+    
+    def load_config(self) -> LazyConfig:
+        """Load configuration from file (sections are parsed on first access)"""
+        return LazyConfig(self.config_file, self.default_config, self.config_cache_file)
+    
+    @staticmethod
+    def default_config() -> Dict:
+        """Default configuration"""
         return {
-            'watched_addresses': [],
+            'watched_addresses': {},
             'copy_settings': {
                 'copy_percentage': 1.0,
                 'min_trade_size': 10.0,
@@ -48,22 +219,35 @@ class TradeCopierManager:
     
     def save_config(self):
         """Save configuration to file"""
+        # Merge before writing: unread sections come from the file
+        config = self.config.to_dict()
+        self.config.invalidate_cache()
         os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        # Write-then-rename, so a concurrent run never reads a half-written file
+        temp_file = f"{self.config_file}.tmp"
+        if orjson is not None:
+            with open(temp_file, 'wb') as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(temp_file, 'w') as f:
+                json.dump(config, f, indent=2)
+        os.replace(temp_file, self.config_file)
         logger.info(f"Configuration saved to {self.config_file}")
     
     def add_address(self, address: str, nickname: str = None):
         """Add an address to watch list"""
-        if not address.startswith('0x') or len(address) != 42:
+        from datetime import datetime
+        
+        if not _ADDRESS_RE.match(address):
             logger.error("Invalid Ethereum address format")
             return False
         
         # Check if address already exists
-        for watched in self.config['watched_addresses']:
-            if watched['address'].lower() == address.lower():
-                logger.warning(f"Address {address} is already being watched")
-                return False
+        key = address.lower()
+        watched = self.watched_addresses()
+        if key in watched:
+            logger.warning(f"Address {address} is already being watched")
+            return False
         
         address_info = {
             'address': address,
@@ -72,71 +256,72 @@ class TradeCopierManager:
             'active': True
         }
         
-        self.config['watched_addresses'].append(address_info)
+        watched[key] = address_info
         self.save_config()
         logger.info(f"Added address {address} with nickname '{address_info['nickname']}'")
         return True
     
     def remove_address(self, address: str):
         """Remove an address from watch list"""
-        original_count = len(self.config['watched_addresses'])
-        self.config['watched_addresses'] = [
-            addr for addr in self.config['watched_addresses'] 
-            if addr['address'].lower() != address.lower()
-        ]
-        
-        if len(self.config['watched_addresses']) < original_count:
-            self.save_config()
-            logger.info(f"Removed address {address}")
-            return True
-        else:
+        if self.watched_addresses().pop(address.lower(), None) is None:
             logger.warning(f"Address {address} not found in watch list")
             return False
+        
+        self.save_config()
+        logger.info(f"Removed address {address}")
+        return True
     
     def list_addresses(self):
         """List all watched addresses"""
-        if not self.config['watched_addresses']:
+        watched = self.watched_addresses()
+        if not watched:
             print("No addresses are currently being watched.")
             return
         
-        print("\nWatched Addresses:")
-        print("-" * 80)
-        for i, addr in enumerate(self.config['watched_addresses'], 1):
-            status = "✓ Active" if addr['active'] else "✗ Inactive"  
-            print(f"{i}. {addr['nickname']}")
-            print(f"   Address: {addr['address']}")
-            print(f"   Status: {status}")
-            print(f"   Added: {addr['added_date']}")
-            print()
+        # One write for the whole report rather than five prints per address
+        parts = ["\nWatched Addresses:\n", "-" * 80, "\n"]
+        for i, addr in enumerate(watched.values(), 1):
+            parts.append(f"{i}. {addr['nickname']}\n"
+                         f"   Address: {addr['address']}\n"
+                         f"   Status: {STATUS[bool(addr['active'])]}\n"
+                         f"   Added: {addr['added_date']}\n\n")
+        sys.stdout.write(''.join(parts))
     
     def update_copy_settings(self, **kwargs):
         """Update copy settings"""
-        valid_settings = ['copy_percentage', 'min_trade_size', 'max_trade_size', 'check_interval']
+        copy_settings = self.config['copy_settings']
         
+        dirty = False
         for key, value in kwargs.items():
-            if key in valid_settings:
-                self.config['copy_settings'][key] = value
-                logger.info(f"Updated {key} to {value}")
-            else:
+            if key not in COPY_SETTINGS:
                 logger.warning(f"Unknown setting: {key}")
+            elif copy_settings.get(key) != value:
+                copy_settings[key] = value
+                dirty = True
+                logger.info(f"Updated {key} to {value}")
         
-        self.save_config()
+        # Re-passing the current values rewrites nothing
+        if dirty:
+            self.save_config()
     
     def show_settings(self):
         """Display current settings"""
-        print("\nCurrent Trade Copier Settings:")
-        print("-" * 40)
-        print(f"Copy Percentage: {self.config['copy_settings']['copy_percentage']*100}%")
-        print(f"Min Trade Size: ${self.config['copy_settings']['min_trade_size']}")
-        print(f"Max Trade Size: ${self.config['copy_settings']['max_trade_size']}")
-        print(f"Check Interval: {self.config['copy_settings']['check_interval']} seconds")
-        print(f"Min Original Trade Size: ${self.config['filters']['min_original_trade_size']}")
-        print()
+        copy_settings = self.config['copy_settings']
+        sys.stdout.write(
+            "\nCurrent Trade Copier Settings:\n"
+            f"{'-' * 40}\n"
+            f"Copy Percentage: {copy_settings['copy_percentage']*100}%\n"
+            f"Min Trade Size: ${copy_settings['min_trade_size']}\n"
+            f"Max Trade Size: ${copy_settings['max_trade_size']}\n"
+            f"Check Interval: {copy_settings['check_interval']} seconds\n"
+            f"Min Original Trade Size: ${self.config['filters']['min_original_trade_size']}\n"
+            "\n"
+        )
     
     def start_monitoring(self, dry_run: bool = False):
         """Start monitoring all active addresses"""
         active_addresses = [
-            addr['address'] for addr in self.config['watched_addresses'] 
+            addr['address'] for addr in self.watched_addresses().values() 
             if addr['active']
         ]
         
@@ -146,20 +331,13 @@ class TradeCopierManager:
         
         logger.info(f"Starting to monitor {len(active_addresses)} addresses")
         
-        # Build command
-        cmd = ['python3', 'trade_copier.py']
-        cmd.extend(['--addresses'] + active_addresses)
-        cmd.extend(['--copy-percentage', str(self.config['copy_settings']['copy_percentage'])])
-        cmd.extend(['--min-trade-size', str(self.config['copy_settings']['min_trade_size'])])
-        cmd.extend(['--max-trade-size', str(self.config['copy_settings']['max_trade_size'])])
-        cmd.extend(['--check-interval', str(self.config['copy_settings']['check_interval'])])
-        
-        if dry_run:
-            cmd.append('--dry-run')
+        copy_settings = self.config['copy_settings']
+        settings = {key: copy_settings[key] for key in COPY_SETTINGS}
         
-        # Execute command
+        # Run in-process; trade_copier (and its client deps) is only imported here
         try:
-            subprocess.run(cmd)
+            from trade_copier import run_monitor
+            run_monitor(addresses=active_addresses, dry_run=dry_run, **settings)
         except KeyboardInterrupt:
             logger.info("Monitoring stopped by user")
         except Exception as e:
@@ -171,20 +349,20 @@ class TradeCopierManager:
         """Analyze historical trades for an address"""
         logger.info(f"Analyzing trades from {address} (last {hours} hours)")
         
-        cmd = [
-            'python3', 'trade_copier.py',
-            '--addresses', address,
-            '--historical',
-            '--lookback-hours', str(hours),
-            '--dry-run'
-        ]
-        
         try:
-            subprocess.run(cmd)
+            from trade_copier import run_monitor
+            run_monitor(
+                addresses=[address],
+                historical=True,
+                lookback_hours=hours,
+                dry_run=True
+            )
         except Exception as e:
             logger.error(f"Error during analysis: {e}")
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Manage Polymarket Trade Copier')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -258,5 +436,5 @@ def main():
         manager.analyze_address(args.address, args.hours)
 
 if __name__ == "__main__":
-    from datetime import datetime
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
@@ -13,15 +13,30 @@ from decimal import Decimal, ROUND_HALF_UP
 import math
 import logging
 
+import numpy as np
+
 from polymarket_subgraph import PolymarketSubgraphClient, SubgraphEndpoints
 
 @dataclass 
 class PriceLevel:
-    """Individual price level in the orderbook"""
+    """Individual price level in the orderbook (a view built from OrderbookDepth's arrays)"""
     price: float
     size: float
     cumulative_size: float = 0.0  # Running total from best price
 
+# Fractions of mid price reported as depth_1pct, depth_5pct and depth_10pct
+DEPTH_PERCENTAGES = (0.01, 0.05, 0.10)
+
+# One side of the book: (prices, sizes, cum_sizes), best price first
+LevelArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+def _empty_levels() -> np.ndarray:
+    return np.empty(0, dtype=np.float64)
+
+def _price_level_views(prices: np.ndarray, sizes: np.ndarray, cum_sizes: np.ndarray) -> List[PriceLevel]:
+    return [PriceLevel(price=price, size=size, cumulative_size=cumulative)
+            for price, size, cumulative in zip(prices.tolist(), sizes.tolist(), cum_sizes.tolist())]
+
 @dataclass
 class OrderbookDepth:
     """Complete orderbook depth analysis"""
@@ -35,9 +50,14 @@ class OrderbookDepth:
     spread_percentage: Optional[float] = None
     mid_price: Optional[float] = None
     
-    # Depth levels
-    bid_levels: List[PriceLevel] = field(default_factory=list)
-    ask_levels: List[PriceLevel] = field(default_factory=list)
+    # Depth levels as parallel float64 arrays, best price first (bids
+    # descending, asks ascending); cum_sizes is the running size total
+    bid_prices: np.ndarray = field(default_factory=_empty_levels)
+    bid_sizes: np.ndarray = field(default_factory=_empty_levels)
+    bid_cum_sizes: np.ndarray = field(default_factory=_empty_levels)
+    ask_prices: np.ndarray = field(default_factory=_empty_levels)
+    ask_sizes: np.ndarray = field(default_factory=_empty_levels)
+    ask_cum_sizes: np.ndarray = field(default_factory=_empty_levels)
     
     # Aggregate depth metrics
     total_bid_depth: float = 0.0
@@ -48,6 +68,16 @@ class OrderbookDepth:
     depth_1pct: Optional[float] = None  # Depth within 1% of mid
     depth_5pct: Optional[float] = None  # Depth within 5% of mid
     depth_10pct: Optional[float] = None  # Depth within 10% of mid
+    
+    @property
+    def bid_levels(self) -> List[PriceLevel]:
+        """Bid levels as PriceLevel objects (built on each access)"""
+        return _price_level_views(self.bid_prices, self.bid_sizes, self.bid_cum_sizes)
+    
+    @property
+    def ask_levels(self) -> List[PriceLevel]:
+        """Ask levels as PriceLevel objects (built on each access)"""
+        return _price_level_views(self.ask_prices, self.ask_sizes, self.ask_cum_sizes)
 
 @dataclass
 class SlippageEstimate:
@@ -134,21 +164,16 @@ class MarketDepthAnalyzer:
         
         # Process price levels if available
         if price_levels:
-            depth.bid_levels, depth.ask_levels = self._process_price_levels(
-                price_levels, depth.mid_price
-            )
+            (depth.bid_prices, depth.bid_sizes, depth.bid_cum_sizes), \
+                (depth.ask_prices, depth.ask_sizes, depth.ask_cum_sizes) = self._process_price_levels(
+                    price_levels, depth.mid_price
+                )
             
             # Calculate depth at specific percentages
             if depth.mid_price:
-                depth.depth_1pct = self._calculate_depth_within_percentage(
-                    depth, 0.01
-                )
-                depth.depth_5pct = self._calculate_depth_within_percentage(
-                    depth, 0.05
-                )
-                depth.depth_10pct = self._calculate_depth_within_percentage(
-                    depth, 0.10
-                )
+                depth.depth_1pct, depth.depth_5pct, depth.depth_10pct = self._calculate_depths_within(
+                    depth, DEPTH_PERCENTAGES
+                ).tolist()
         
         return depth
     
@@ -185,10 +210,10 @@ class MarketDepthAnalyzer:
             self.logger.warning(f"Failed to get price levels for {market_id}: {e}")
             return []
     
-    def _process_price_levels(self, price_levels: List[Dict], mid_price: Optional[float]) -> Tuple[List[PriceLevel], List[PriceLevel]]:
-        """Process raw price levels into organized bid/ask levels"""
-        bid_levels = []
-        ask_levels = []
+    def _process_price_levels(self, price_levels: List[Dict], mid_price: Optional[float]) -> Tuple[LevelArrays, LevelArrays]:
+        """Process raw price levels into sorted (prices, sizes, cum_sizes) arrays for bids and asks"""
+        bid_prices, bid_sizes = [], []
+        ask_prices, ask_sizes = [], []
         
         for level in price_levels:
             price = float(level["price"])
@@ -198,52 +223,58 @@ class MarketDepthAnalyzer:
             if size < self.config["min_level_size"]:
                 continue
             
-            price_level = PriceLevel(price=price, size=size)
-            
             # Classify as bid or ask
             if level["side"] == "BUY":
-                bid_levels.append(price_level)
+                bid_prices.append(price)
+                bid_sizes.append(size)
             elif level["side"] == "SELL":
-                ask_levels.append(price_level)
+                ask_prices.append(price)
+                ask_sizes.append(size)
         
         # Sort levels (bids descending, asks ascending)
-        bid_levels.sort(key=lambda x: x.price, reverse=True)
-        ask_levels.sort(key=lambda x: x.price)
-        
-        # Calculate cumulative sizes
-        self._calculate_cumulative_sizes(bid_levels)
-        self._calculate_cumulative_sizes(ask_levels)
-        
-        return bid_levels, ask_levels
+        return (self._sort_levels(bid_prices, bid_sizes, descending=True),
+                self._sort_levels(ask_prices, ask_sizes, descending=False))
+    
+    def _sort_levels(self, prices: List[float], sizes: List[float], descending: bool) -> LevelArrays:
+        """Levels sorted best price first, with their cumulative sizes"""
+        prices = np.asarray(prices, dtype=np.float64)
+        sizes = np.asarray(sizes, dtype=np.float64)
+        # Stable, like list.sort: equal prices keep their subgraph order
+        order = np.argsort(-prices if descending else prices, kind='stable')
+        prices = prices[order]
+        sizes = sizes[order]
+        return prices, sizes, self._calculate_cumulative_sizes(sizes)
     
-    def _calculate_cumulative_sizes(self, levels: List[PriceLevel]):
-        """Calculate running cumulative sizes for price levels"""
-        cumulative = 0.0
-        for level in levels:
-            cumulative += level.size
-            level.cumulative_size = cumulative
+    def _calculate_cumulative_sizes(self, sizes: np.ndarray) -> np.ndarray:
+        """Running cumulative sizes from the best price (sequential sum, like a loop)"""
+        return np.cumsum(sizes, dtype=np.float64)
     
     def _calculate_depth_within_percentage(self, depth: OrderbookDepth, percentage: float) -> Optional[float]:
         """Calculate total depth within percentage of mid price"""
+        depths = self._calculate_depths_within(depth, [percentage])
+        return None if depths is None else float(depths[0])
+    
+    def _calculate_depths_within(self, depth: OrderbookDepth, percentages) -> Optional[np.ndarray]:
+        """Total depth within each percentage of mid price, in one pass over the levels"""
         if not depth.mid_price:
             return None
         
-        total_depth = 0.0
-        threshold_range = depth.mid_price * percentage
-        
-        # Count bid depth within range
-        for level in depth.bid_levels:
-            if depth.mid_price - level.price <= threshold_range:
-                total_depth += level.size
+        threshold_ranges = depth.mid_price * np.asarray(percentages, dtype=np.float64)
         
-        # Count ask depth within range
-        for level in depth.ask_levels:
-            if level.price - depth.mid_price <= threshold_range:
-                total_depth += level.size
+        # Levels are sorted best price first, so distance from mid only grows
+        # along each side: the levels within range are a prefix, summed by cum_sizes
+        bid_depths = self._prefix_depths(depth.bid_cum_sizes, depth.mid_price - depth.bid_prices, threshold_ranges)
+        ask_depths = self._prefix_depths(depth.ask_cum_sizes, depth.ask_prices - depth.mid_price, threshold_ranges)
         
-        return total_depth
+        return bid_depths + ask_depths
+    
+    def _prefix_depths(self, cum_sizes: np.ndarray, distances: np.ndarray, threshold_ranges: np.ndarray) -> np.ndarray:
+        """Total size of the leading levels whose (non-decreasing) distance from mid is within each range"""
+        counts = np.searchsorted(distances, threshold_ranges, side='right')
+        return np.concatenate(([0.0], cum_sizes))[counts]
     
-    def calculate_slippage(self, depth: OrderbookDepth, side: str, size: float) -> SlippageEstimate:
+    def calculate_slippage(self, depth: OrderbookDepth, side: str, size: float,
+                           include_levels: bool = True) -> SlippageEstimate:
         """
         Calculate slippage estimate for a trade of given size and direction
         
@@ -251,6 +282,7 @@ class MarketDepthAnalyzer:
             depth: OrderbookDepth analysis
             side: "buy" or "sell"
             size: Nominal trade size
+            include_levels: Whether to fill in levels_consumed
             
         Returns:
             SlippageEstimate with execution analysis
@@ -263,35 +295,37 @@ class MarketDepthAnalyzer:
         
         # Get the appropriate levels to consume
         if side == "buy":
-            levels = depth.ask_levels  # Buy from asks
+            prices, sizes, cum_sizes = depth.ask_prices, depth.ask_sizes, depth.ask_cum_sizes  # Buy from asks
             expected_price = depth.best_ask
         else:
-            levels = depth.bid_levels  # Sell to bids  
+            prices, sizes, cum_sizes = depth.bid_prices, depth.bid_sizes, depth.bid_cum_sizes  # Sell to bids  
             expected_price = depth.best_bid
         
-        if not levels or expected_price is None:
+        if not len(prices) or expected_price is None:
             self.logger.warning(f"No {side} levels available for {depth.market_id}")
             return estimate
         
         estimate.expected_fill_price = expected_price
         
-        # Walk through price levels to calculate execution
-        remaining_size = size
+        # Levels before the first one whose running total covers the order
+        # fill completely; that level (if any) fills the remainder
+        remaining_size = float(size)
         total_cost = 0.0
         levels_consumed = []
         
-        for level in levels:
-            if remaining_size <= 0:
-                break
-                
-            # Determine how much we can fill at this level
-            fill_at_level = min(remaining_size, level.size)
-            
-            # Add to cost calculation
-            total_cost += fill_at_level * level.price
-            levels_consumed.append((level.price, fill_at_level))
-            
-            remaining_size -= fill_at_level
+        if size > 0:
+            last = int(np.searchsorted(cum_sizes, size, side='left'))
+            full = min(last, len(prices))
+            total_cost = float(np.dot(prices[:full], sizes[:full]))
+            remaining_size -= float(cum_sizes[full - 1]) if full else 0.0
+            if include_levels:
+                levels_consumed = list(zip(prices[:full].tolist(), sizes[:full].tolist()))
+            if last < len(prices):
+                residual_price = float(prices[last])
+                total_cost += remaining_size * residual_price
+                if include_levels:
+                    levels_consumed.append((residual_price, remaining_size))
+                remaining_size = 0.0
         
         # Calculate results
         if total_cost > 0:
@@ -0,0 +1,246 @@
+import random
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from arbitrage_engine import ArbitrageDetector  # noqa: E402
+from event_matcher import MatchResult, RiskBits  # noqa: E402
+from event_model import ContractSide, Event, MarketType, VenueType  # noqa: E402
+
+
+def build_event(event_id, venue, yes_price, no_price, liquidity=None, deadline_offset_days=0):
+    return Event(
+        event_id=event_id,
+        source_ids={},
+        title=f"Event {event_id}",
+        entities=["bitcoin"],
+        category="crypto",
+        resolution_criteria="",
+        deadline=datetime(2025, 1, 1) + timedelta(days=deadline_offset_days),
+        venue=venue,
+        market_type=MarketType.BINARY,
+        contract_sides=[
+            ContractSide("yes", "YES", yes_price, yes_price, liquidity=liquidity),
+            ContractSide("no", "NO", no_price, no_price, liquidity=liquidity),
+        ],
+        fees={},
+        min_tick=0.01,
+        lot_size=1.0,
+    )
+
+
+def build_match(event_a, event_b, confidence=0.9, risk_mask=0):
+    return MatchResult(
+        event_a=event_a,
+        event_b=event_b,
+        confidence_score=confidence,
+        match_strategies=[],
+        risk_mask=risk_mask,
+        human_review_required=False,
+    )
+
+
+def build_random_matches(count, seed=7):
+    rng = random.Random(seed)
+    matches = []
+    for i in range(count):
+        event_a = build_event(
+            f"poly-{i}",
+            VenueType.POLYMARKET,
+            rng.uniform(0.2, 0.8),
+            rng.uniform(0.2, 0.8),
+            rng.choice([None, 500, 1000, 5000, 10000, 20000]),
+        )
+        event_b = build_event(
+            f"predyx-{i}",
+            VenueType.PREDYX,
+            rng.uniform(0.1, 0.8),
+            rng.uniform(0.1, 0.8),
+            rng.choice([None, 500, 5000, 20000]),
+            rng.randint(0, 10),
+        )
+        matches.append(build_match(event_a, event_b, rng.uniform(0.6, 1.0), rng.choice([0, RiskBits.DIFFERENT_RESOLUTION_SOURCES])))
+    return matches
+
+
+def opportunity_key(opp):
+    return (
+        opp.match_result.event_a.event_id,
+        opp.buy_side,
+        opp.sell_side,
+        opp.gross_edge,
+        opp.net_edge,
+        opp.max_position_size,
+        opp.expected_profit,
+        opp.slippage_estimate,
+        opp.timing_risk_score,
+        opp.resolution_risk_score,
+    )
+
+
+def test_binary_arbitrage_economics():
+    event_a = build_event("a", VenueType.POLYMARKET, 0.40, 0.62, liquidity=20000)
+    event_b = build_event("b", VenueType.PREDYX, 0.55, 0.45, liquidity=5000)
+    detector = ArbitrageDetector()
+
+    opportunities = detector.scan_for_arbitrage([build_match(event_a, event_b)])
+
+    assert len(opportunities) == 1
+    opp = opportunities[0]
+    assert (opp.buy_side, opp.sell_side) == ("YES", "NO")
+    # 1 - (0.40 * 1.02 + 0.005) - (0.45 * 1.01 + 0.0001)
+    assert opp.gross_edge == Decimal("0.1324")
+    assert opp.slippage_estimate == Decimal("0.004")
+    assert opp.net_edge == Decimal("0.1284")
+    assert opp.max_position_size == Decimal("500.0")
+
+
+def test_low_confidence_matches_are_skipped():
+    event_a = build_event("a", VenueType.POLYMARKET, 0.40, 0.62, liquidity=20000)
+    event_b = build_event("b", VenueType.PREDYX, 0.55, 0.45, liquidity=5000)
+    detector = ArbitrageDetector()
+
+    assert detector.scan_for_arbitrage([build_match(event_a, event_b, confidence=0.5)]) == []
+
+
+def test_vectorized_scan_matches_scalar_path():
+    matches = build_random_matches(500)
+    detector = ArbitrageDetector(max_slippage_tolerance=0.02)
+
+    scalar = []
+    for match in matches:
+        if match.confidence_score < detector.min_match_confidence:
+            continue
+        for side_a, side_b in (("YES", "NO"), ("NO", "YES")):
+            opp = detector._check_binary_arbitrage(match, side_a, side_b)
+            if opp:
+                scalar.append(opp)
+    vectorized = detector.scan_for_arbitrage(matches)
+
+    assert scalar
+    assert sorted(map(opportunity_key, vectorized)) == sorted(map(opportunity_key, scalar))
+
+
+def test_numpy_kernel_matches_loop_kernel():
+    import numpy as np
+
+    from arbitrage_engine import _arb_kernel, _arb_kernel_numpy
+
+    rng = np.random.default_rng(3)
+    n = 200
+    args = (
+        rng.uniform(0.1, 0.9, n),
+        rng.uniform(0.1, 0.9, n),
+        rng.choice([0.0, 500.0, 1000.0, 5000.0, 10000.0, 20000.0], n),
+        rng.choice([0.0, 500.0, 5000.0, 20000.0], n),
+        rng.integers(0, 3, n).astype(np.intp),
+        rng.integers(0, 3, n).astype(np.intp),
+        np.array([1.02, 1.01, 1.0]),
+        np.array([0.005, 0.0001, 0.0]),
+        0.02,
+        0.01,
+    )
+
+    for expected, actual in zip(_arb_kernel_numpy(*args), _arb_kernel(*args)):
+        np.testing.assert_allclose(actual, expected)
+
+
+def test_top_k_and_min_net_edge_filter():
+    matches = build_random_matches(500)
+    detector = ArbitrageDetector(max_slippage_tolerance=0.02)
+
+    ranked = detector.scan_for_arbitrage(matches)
+    top = detector.scan_for_arbitrage(matches, top_k=5)
+    above = detector.scan_for_arbitrage(matches, min_net_edge=0.3)
+
+    assert [opp.net_edge for opp in top] == [opp.net_edge for opp in ranked[:5]]
+    assert above
+    assert all(opp.net_edge >= Decimal("0.3") for opp in above)
+    assert len(above) == sum(1 for opp in ranked if opp.net_edge >= Decimal("0.3"))
+
+
+def test_scalar_min_net_edge_matches_vectorized():
+    matches = build_random_matches(40)
+    detector = ArbitrageDetector(max_slippage_tolerance=0.02)
+
+    scalar = detector.scan_for_arbitrage(matches, min_net_edge=0.1)
+    vectorized = detector._scan_vectorized(
+        [match for match in matches if match.confidence_score >= detector.min_match_confidence],
+        min_net_edge=0.1,
+    )
+
+    assert scalar
+    assert sorted(map(opportunity_key, scalar)) == sorted(map(opportunity_key, vectorized))
+
+
+def test_transitive_match_chain_yields_statistical_arbitrage():
+    from arbitrage_engine import ArbitrageType
+
+    cheap_yes = build_event("a", VenueType.POLYMARKET, 0.40, 0.70, liquidity=20000)
+    bridge = build_event("b", VenueType.PREDYX, 0.60, 0.60, liquidity=20000)
+    cheap_no = build_event("c", VenueType.POLYMARKET, 0.70, 0.45, liquidity=20000)
+    matches = [build_match(cheap_yes, bridge, 0.9), build_match(bridge, cheap_no, 0.8)]
+    detector = ArbitrageDetector()
+
+    opportunities = detector.scan_for_arbitrage(matches)
+
+    assert len(opportunities) == 1
+    opp = opportunities[0]
+    assert opp.arbitrage_type == ArbitrageType.STATISTICAL_ARBITRAGE
+    assert (opp.match_result.event_a.event_id, opp.buy_side) == ("a", "YES")
+    assert (opp.match_result.event_b.event_id, opp.sell_side) == ("c", "NO")
+    assert abs(opp.confidence_score - 0.72) < 1e-9
+    assert "transitive_match" in opp.match_result.risk_factor_names
+
+
+def transitive_pairs(opportunities):
+    from arbitrage_engine import ArbitrageType
+
+    return sorted(
+        (opp.match_result.event_a.event_id, opp.match_result.event_b.event_id)
+        for opp in opportunities if opp.arbitrage_type == ArbitrageType.STATISTICAL_ARBITRAGE
+    )
+
+
+def test_transitive_scan_skips_direct_best_pair_for_next_best():
+    cheap_yes = build_event("a", VenueType.POLYMARKET, 0.40, 0.70, liquidity=20000)
+    bridge = build_event("b", VenueType.PREDYX, 0.60, 0.60, liquidity=20000)
+    cheapest_no = build_event("c", VenueType.PREDYX, 0.70, 0.45, liquidity=20000)
+    cheap_no = build_event("d", VenueType.POLYMARKET, 0.70, 0.48, liquidity=20000)
+    matches = [
+        build_match(cheap_yes, bridge, 0.9),
+        build_match(bridge, cheapest_no, 0.9),
+        build_match(bridge, cheap_no, 0.9),
+        build_match(cheap_yes, cheapest_no, 0.9),  # the best pair is matched directly
+    ]
+
+    opportunities = ArbitrageDetector().scan_for_arbitrage(matches)
+
+    assert transitive_pairs(opportunities) == [("a", "d")]
+    assert any(opp.match_result.event_b.event_id == "c" and opp.arbitrage_type.name == "PURE_ARBITRAGE"
+               for opp in opportunities)
+
+
+def test_transitive_scan_reports_every_profitable_pair_in_a_component():
+    bridge = build_event("hub", VenueType.PREDYX, 0.60, 0.60, liquidity=20000)
+    first_yes = build_event("a", VenueType.POLYMARKET, 0.40, 0.70, liquidity=20000)
+    first_no = build_event("b", VenueType.POLYMARKET, 0.70, 0.45, liquidity=20000)
+    second_yes = build_event("c", VenueType.POLYMARKET, 0.42, 0.70, liquidity=20000)
+    second_no = build_event("d", VenueType.POLYMARKET, 0.70, 0.44, liquidity=20000)
+    matches = [build_match(bridge, event, 0.9) for event in (first_yes, first_no, second_yes, second_no)]
+
+    pairs = transitive_pairs(ArbitrageDetector().scan_for_arbitrage(matches))
+
+    assert pairs == [("a", "b"), ("a", "d"), ("c", "b"), ("c", "d")]
+
+
+def test_withdrawal_fee_is_not_charged_per_trade():
+    detector = ArbitrageDetector()
+    detector.venue_fees["predyx"]["withdrawal_fee"] = 0.05
+    detector._precompute_fee_tables()
+
+    assert detector._calculate_total_cost(0.5, "predyx", "buy") == 0.5 * 1.01 + 0.0001
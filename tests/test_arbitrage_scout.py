@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from arbitrage_scout import ArbitrageScout  # noqa: E402
+
+
+def bare_scout():
+    scout = ArbitrageScout.__new__(ArbitrageScout)
+    scout.logger = logging.getLogger("test_arbitrage_scout")
+    return scout
+
+
+def test_fetch_all_sources_reports_failed_venues():
+    scout = bare_scout()
+
+    async def some_events():
+        return ["event"]
+
+    async def outage():
+        raise ConnectionError("venue down")
+
+    scout._fetch_stacker_news_signals = some_events
+    scout._fetch_polymarket_markets = outage
+    scout._fetch_predyx_markets = some_events
+
+    fetched, failures = asyncio.run(scout._fetch_all_sources())
+    assert fetched == [["event"], [], ["event"]]
+    assert list(failures) == ["polymarket"]
+    assert isinstance(failures["polymarket"], ConnectionError)
+
+
+def test_venue_pair_matching_meets_events_sharing_any_entity():
+    from datetime import datetime
+
+    from event_matcher import EventMatcher
+    from event_model import ContractSide, Event, MarketType, VenueType
+
+    def build_event(event_id, venue, entities, category):
+        return Event(
+            event_id=event_id, source_ids={}, title="Trump wins the election", entities=entities,
+            category=category, resolution_criteria="", deadline=datetime(2025, 1, 1), venue=venue,
+            market_type=MarketType.BINARY,
+            contract_sides=[ContractSide("yes", "YES", 0.5, 0.5), ContractSide("no", "NO", 0.5, 0.5)],
+            fees={}, min_tick=0.01, lot_size=1.0,
+        )
+
+    scout = bare_scout()
+    scout.matcher = EventMatcher(confidence_threshold=0.0)
+    # Smallest entities differ ("biden" vs "trump") and so do the categories
+    events_a = [build_event("a", VenueType.POLYMARKET, ["Biden", "Trump"], "politics")]
+    events_b = [build_event("b", VenueType.PREDYX, ["Trump"], "elections")]
+    matches = scout._match_venue_pair(events_a, events_b)
+    assert [(match.event_a.event_id, match.event_b.event_id) for match in matches] == [("a", "b")]
@@ -0,0 +1,58 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from connectors import PolymarketConnector  # noqa: E402
+
+
+def test_polymarket_fetches_share_one_pooled_session():
+    requests = []
+
+    async def markets(request):
+        requests.append(dict(request.query))
+        return web.json_response([{"slug": "will-it-rain"}])
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/markets", markets)
+        async with TestServer(app) as server:
+            connector = PolymarketConnector(str(server.make_url("")).rstrip("/"), markets_limit=50)
+            first = await connector.fetch_markets()
+            session = connector._session
+            second = await connector.fetch_markets()
+            assert connector._session is session
+            await connector.close()
+            return first, second, session
+
+    first, second, session = asyncio.run(scenario())
+
+    assert first == second == [{"slug": "will-it-rain"}]
+    assert requests == [{"active": "true", "closed": "false", "limit": "50"}] * 2
+    assert session.closed
+
+
+def test_polymarket_http_errors_are_raised():
+    async def unavailable(request):
+        return web.Response(status=503)
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/markets", unavailable)
+        async with TestServer(app) as server:
+            connector = PolymarketConnector(str(server.make_url("")).rstrip("/"))
+            try:
+                await connector.fetch_markets()
+            finally:
+                await connector.close()
+
+    # A failed request must not look like a venue with no markets
+    with pytest.raises(ClientResponseError) as excinfo:
+        asyncio.run(scenario())
+    assert excinfo.value.status == 503
@@ -0,0 +1,49 @@
+import json
+import sys
+import warnings
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from create_selected_market_lookup import create_selected_market_lookup  # noqa: E402
+
+TOKENS = "[{'token_id': '123', 'outcome': 'Yes'}, {'token_id': '456', 'outcome': 'No'}]"
+
+
+def write_markets_csv(path, rows, encoding):
+    lines = ["condition_id,description,market_slug,tokens"]
+    lines += [f'{condition_id},"{description}",{slug},"{TOKENS}"' for condition_id, description, slug in rows]
+    path.write_bytes(("\r\n".join(lines) + "\r\n").encode(encoding))
+
+
+def test_cp1252_descriptions_are_decoded_not_replaced(tmp_path):
+    markets_csv = tmp_path / "markets.csv"
+    write_markets_csv(markets_csv, [
+        ("0xaa", "Will it “rain” tomorrow?", "will-it-rain"),
+        ("0xbb", "Will it be windy tomorrow?", "other-market"),
+    ], "cp1252")
+    output_json = tmp_path / "selected.json"
+
+    selected = create_selected_market_lookup(["will-it-rain"], input_csv=str(markets_csv),
+                                             output_json=str(output_json))
+    assert list(selected) == ["0xaa"]
+    assert selected["0xaa"]["description"] == "Will it “rain” tomorrow?"
+    assert json.loads(output_json.read_text())["0xaa"]["tokens"] == [
+        {"token_id": "123", "outcome": "Yes"}, {"token_id": "456", "outcome": "No"}
+    ]
+
+
+def test_temp_lookup_is_accepted_with_a_deprecation_warning(tmp_path):
+    markets_csv = tmp_path / "markets.csv"
+    write_markets_csv(markets_csv, [("0xaa", "Will it snow tomorrow?", "slug")], "utf-8")
+    temp_lookup = tmp_path / "temp.json"
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        # Positional order is unchanged: (slugs, input_csv, temp_lookup, output_json)
+        selected = create_selected_market_lookup(["slug"], str(markets_csv), str(temp_lookup),
+                                                 str(tmp_path / "out.json"))
+    assert list(selected) == ["0xaa"]
+    assert any(issubclass(w.category, DeprecationWarning) for w in caught)
+    assert not temp_lookup.exists()
@@ -0,0 +1,156 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from event_matcher import EventMatcher, RiskBits  # noqa: E402
+from event_model import ContractSide, Event, EventTable, MarketType, VenueType  # noqa: E402
+
+
+def build_event(event_id, venue, title, entities, category="crypto", deadline_offset_days=0):
+    return Event(
+        event_id=event_id,
+        source_ids={},
+        title=title,
+        entities=entities,
+        category=category,
+        resolution_criteria="",
+        deadline=datetime(2025, 1, 1) + timedelta(days=deadline_offset_days),
+        venue=venue,
+        market_type=MarketType.BINARY,
+        contract_sides=[
+            ContractSide("yes", "YES", 0.5, 0.5),
+            ContractSide("no", "NO", 0.5, 0.5),
+        ],
+        fees={},
+        min_tick=0.01,
+        lot_size=1.0,
+    )
+
+
+def matched_pairs(matches):
+    return [(match.event_a.event_id, match.event_b.event_id) for match in matches]
+
+
+def test_find_matches_only_evaluates_blocked_candidates():
+    matcher = EventMatcher(confidence_threshold=0.0)
+    events_a = [
+        build_event("a1", VenueType.POLYMARKET, "Bitcoin above 100k", ["Bitcoin"]),
+        build_event("a2", VenueType.POLYMARKET, "Fed cuts rates", ["Fed"], category="macro", deadline_offset_days=60),
+    ]
+    events_b = [
+        build_event("b1", VenueType.PREDYX, "BTC above 100k", ["bitcoin"], category="markets"),
+        build_event("b2", VenueType.PREDYX, "Ether above 5k", ["Ethereum"], deadline_offset_days=2),
+        build_event("b3", VenueType.PREDYX, "Fed cuts rates", ["Fed"], category="macro"),
+        build_event("b4", VenueType.POLYMARKET, "Bitcoin above 100k", ["Bitcoin"]),
+    ]
+
+    # b1 shares an entity, b2 the category and ISO week; b3 is too far out and
+    # b4 is on the same venue
+    assert matched_pairs(matcher.find_matches(events_a, events_b)) == [("a1", "b1"), ("a1", "b2")]
+
+
+def test_fuzzy_title_match_scores_similar_titles_higher():
+    matcher = EventMatcher()
+    event = build_event("a", VenueType.POLYMARKET, "Will Bitcoin close above 100k", ["Bitcoin"])
+    close = build_event("b", VenueType.PREDYX, "Will Bitcoin close above 100k?", ["Bitcoin"])
+    far = build_event("c", VenueType.PREDYX, "Fed cuts rates in March", ["Fed"])
+
+    assert matcher._fuzzy_title_match(event, close) > matcher._fuzzy_title_match(event, far)
+
+
+def test_risk_mask_decodes_to_factor_names():
+    matcher = EventMatcher()
+    event_a = build_event("a", VenueType.POLYMARKET, "Bitcoin above 100k", ["Bitcoin"])
+    event_b = build_event("b", VenueType.PREDYX, "Bitcoin above 100k", ["Bitcoin"], deadline_offset_days=10)
+    event_b.market_type = MarketType.MULTI_OUTCOME
+
+    match = matcher._evaluate_match(event_a, event_b)
+
+    assert match.risk_mask == RiskBits.DEADLINE_MISMATCH_GT_WEEK | RiskBits.DIFFERENT_MARKET_TYPES
+    assert match.risk_factor_names == ["deadline_mismatch_gt_week", "different_market_types"]
+    assert match.risk_factors == match.risk_factor_names
+    assert match.risk_count == 2
+    assert match.human_review_required
+
+
+def test_find_matches_top_k_keeps_most_confident():
+    matcher = EventMatcher(confidence_threshold=0.0)
+    events_a = [build_event("a", VenueType.POLYMARKET, "Bitcoin above 100k", ["Bitcoin"])]
+    events_b = [
+        build_event(f"b{i}", VenueType.PREDYX, title, ["Bitcoin"])
+        for i, title in enumerate(["Fed cuts rates", "Bitcoin above 100k", "Bitcoin above 90k"])
+    ]
+
+    everything = matcher.find_matches(events_a, events_b)
+    top = matcher.find_matches(events_a, events_b, top_k=2)
+
+    assert matched_pairs(top) == matched_pairs(
+        sorted(everything, key=lambda match: match.confidence_score, reverse=True)[:2]
+    )
+    assert matched_pairs(top)[0] == ("a", "b1")
+
+
+def test_entity_overlap_is_jaccard_over_interned_sets():
+    matcher = EventMatcher()
+    event_a = build_event("a", VenueType.POLYMARKET, "x", ["Trump", "Biden", "Ohio"])
+    event_b = build_event("b", VenueType.PREDYX, "y", ["".join(["Tru", "mp"]), "Ohio"])
+
+    assert isinstance(event_a.entities, frozenset)
+    assert next(e for e in event_b.entities if e == "Trump") is next(e for e in event_a.entities if e == "Trump")
+    assert matcher._entity_overlap_match(event_a, event_b) == 2 / 3
+    assert matcher._entity_overlap_match(event_a, build_event("c", VenueType.PREDYX, "z", [])) == 0.0
+
+
+def test_parallel_find_matches_matches_serial():
+    events_a = [
+        build_event(f"a{i}", VenueType.POLYMARKET, f"Bitcoin above {i}k", ["Bitcoin"], deadline_offset_days=i % 5)
+        for i in range(12)
+    ]
+    events_b = [
+        build_event(f"b{i}", VenueType.PREDYX, f"BTC above {i}k", ["bitcoin"], deadline_offset_days=i % 3)
+        for i in range(10)
+    ]
+    serial = EventMatcher(confidence_threshold=0.0).find_matches(events_a, events_b)
+    parallel_matcher = EventMatcher(confidence_threshold=0.0, parallel_min_pairs=1, max_workers=2)
+    parallel = parallel_matcher.find_matches(events_a, events_b)
+
+    assert serial
+    assert matched_pairs(parallel) == matched_pairs(serial)
+    assert [m.confidence_score for m in parallel] == [m.confidence_score for m in serial]
+    assert all(match.event_a is events_a[int(match.event_a.event_id[1:])] for match in parallel)
+
+
+def test_deadline_day_is_utc_calendar_day():
+    from datetime import timezone
+
+    naive = build_event("a", VenueType.POLYMARKET, "x", ["x"])
+    aware = build_event("b", VenueType.PREDYX, "x", ["x"])
+    aware.deadline = datetime(2025, 1, 1, 23, 30, tzinfo=timezone(timedelta(hours=-5)))
+    aware.update_deadline_day()
+
+    assert naive.deadline_day == (datetime(2025, 1, 1) - datetime(1970, 1, 1)).days
+    assert aware.deadline_day == naive.deadline_day + 1
+
+    # 2025-01-08 23:30 at UTC-5 is already January 9th in UTC: 8 days apart
+    aware.deadline = datetime(2025, 1, 8, 23, 30, tzinfo=timezone(timedelta(hours=-5)))
+    aware.update_deadline_day()
+    assert EventMatcher()._detect_risk_factors(naive, aware) & RiskBits.DEADLINE_MISMATCH_GT_WEEK
+
+
+def test_eligibility_is_computed_over_candidate_pairs_only():
+    matcher = EventMatcher()
+    table_a = EventTable([build_event("a", VenueType.POLYMARKET, "Bitcoin above 100k", ["Bitcoin"])])
+    table_b = EventTable([
+        build_event("b1", VenueType.PREDYX, "BTC above 100k", ["bitcoin"], category="markets"),
+        build_event("b2", VenueType.PREDYX, "Fed cuts rates", ["Fed"], category="macro"),
+        build_event("b3", VenueType.POLYMARKET, "Bitcoin above 100k", ["Bitcoin"]),
+    ])
+
+    rows, positions = matcher._candidate_pairs(table_a, table_b)
+    eligible = matcher._eligible_pairs(table_a, table_b, rows, positions)
+
+    assert positions.tolist() == [0, 2]
+    assert eligible.tolist() == [True, False]
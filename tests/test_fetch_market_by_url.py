@@ -0,0 +1,142 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+pytest.importorskip("dotenv")
+pytest.importorskip("py_clob_client")
+
+import fetch_market_by_url  # noqa: E402
+
+
+@pytest.mark.parametrize("cache", [
+    [{"market_slug": "a"}, {"market_slug": "b", "tokens": [{"token_id": "1"}]}],
+    {"markets": [{"market_slug": "a"}], "data": [{"market_slug": "ignored"}]},
+    {"data": [{"market_slug": "a"}], "markets": [{"market_slug": "wins"}]},
+    {"meta": {"pages": [1, 2]}, "data": [{"market_slug": "a"}]},
+    {"market_slug": "single", "tokens": [{"token_id": "1"}]},
+])
+def test_streamed_cache_records_match_full_parse(tmp_path, cache):
+    cache_file = tmp_path / "cache.json"
+    cache_file.write_text(json.dumps(cache))
+
+    assert list(fetch_market_by_url._iter_cache_markets(str(cache_file))) == \
+        fetch_market_by_url._load_cache_markets(str(cache_file))
+
+
+def test_dict_cache_is_streamed_in_one_pass(tmp_path):
+    cache_file = tmp_path / "cache.json"
+    # Truncated mid-list: only a streaming parse can return the first record
+    cache_file.write_text('{"markets": [{"market_slug": "a"}, {"market_slug": "b"}, ')
+
+    if fetch_market_by_url.ijson is None:
+        pytest.skip("streaming needs ijson")
+    assert next(fetch_market_by_url._iter_cache_markets(str(cache_file))) == {"market_slug": "a"}
+
+
+def fuzzy_match(slug, markets, time_sensitive=False):
+    market_slugs = [market.get("market_slug") for market in markets]
+    return fetch_market_by_url._fuzzy_match_market(tuple(slug.lower().replace("-", " ").split()), markets,
+                                                   market_slugs, time_sensitive)
+
+
+def test_fuzzy_match_rejects_near_miss_slugs():
+    markets = [
+        # Long descriptions aren't scored: this one holds every slug word
+        {"market_slug": "eth-5k", "question": "Will ETH reach 5k?",
+         "description": "Resolves like will bitcoin reach 100k by june 30, but for Ether."},
+        {"market_slug": "will-ethereum-reach-5k-by-july-31", "question": "Will Ethereum reach $5k by July 31?"},
+        {"market_slug": "bitcoin-above-100k-on-june-30", "question": "Bitcoin above $100k on June 30?"},
+    ]
+
+    assert fuzzy_match("will-bitcoin-reach-100k-by-june-30", markets) is None
+
+
+def test_fuzzy_match_returns_best_scoring_market():
+    markets = [
+        {"market_slug": "fed-cuts-rates", "question": "Will the Fed cut rates?"},
+        {"market_slug": "bitcoin-above-100k-on-june-30", "question": "Bitcoin above $100k on June 30?"},
+        {"market_slug": "bitcoin-100k", "question": "Will Bitcoin reach 100k by June?", "description": None},
+        {"market_slug": "will-bitcoin-reach-100k-by-june-30", "question": "Exact slug, later on the page"},
+    ]
+
+    assert fuzzy_match("will-bitcoin-reach-100k-by-june-30", markets) is markets[2]
+
+
+def test_time_sensitive_slugs_have_a_lower_cutoff():
+    markets = [{"market_slug": "btc-up-or-down-today", "question": "Bitcoin up or down today?"}]
+
+    assert fuzzy_match("bitcoin-up-or-down-on-tuesday", markets) is None
+    assert fuzzy_match("bitcoin-up-or-down-on-tuesday", markets, time_sensitive=True) is markets[0]
+
+
+class PagedClient:
+    """Stands in for the CLOB client: serves the same pages for active and archived markets"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get_markets(self, next_cursor=None, limit=1000, active=True):
+        page = int(next_cursor or 0)
+        return {"data": self.pages[page], "next_cursor": str(page + 1) if page + 1 < len(self.pages) else None}
+
+
+def test_closest_slug_fallback_is_opt_in(monkeypatch):
+    sibling = {"market_slug": "lakers-vs-clippers-jul-30", "question": "Lakers vs. Clippers"}
+    monkeypatch.setattr(fetch_market_by_url, "client", PagedClient([[sibling]]))
+
+    assert fetch_market_by_url.fetch_market_by_clob_api("lakers-vs-celtics-jun-30") is None
+    assert fetch_market_by_url.fetch_market_by_clob_api("lakers-vs-celtics-jun-30", fuzzy_cutoff=0.7) is sibling
+
+
+def test_closest_slug_never_beats_a_later_exact_match(monkeypatch):
+    sibling = {"market_slug": "lakers-vs-clippers-jul-30", "question": "Lakers vs. Clippers"}
+    exact = {"market_slug": "lakers-vs-celtics-jun-30", "question": "Lakers vs. Celtics"}
+    monkeypatch.setattr(fetch_market_by_url, "client", PagedClient([[sibling], [exact]]))
+
+    assert fetch_market_by_url.fetch_market_by_clob_api("lakers-vs-celtics-jun-30", fuzzy_cutoff=0.7) is exact
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = ""
+
+    def json(self):
+        return self.payload
+
+
+def test_server_error_only_cools_down_the_failing_endpoint(monkeypatch):
+    requested = []
+
+    def get(endpoint, timeout):
+        requested.append(endpoint)
+        if "/events" in endpoint:
+            return FakeResponse(503)
+        return FakeResponse(200, [{"slug": "found"}])
+
+    monkeypatch.setattr(fetch_market_by_url, "_dead_endpoints", {})
+    monkeypatch.setattr(fetch_market_by_url.SESSION, "get", get)
+    probe = fetch_market_by_url._probe_web_api_endpoint
+
+    assert probe("https://gamma-api.polymarket.com/events?slug=a") is None
+    assert probe("https://gamma-api.polymarket.com/events?slug=b&closed=true") is None
+    assert probe("https://gamma-api.polymarket.com/markets?slug=a") == {"slug": "found"}
+    assert requested == ["https://gamma-api.polymarket.com/events?slug=a",
+                         "https://gamma-api.polymarket.com/markets?slug=a"]
+
+
+def test_market_lookup_reports_through_the_logger(monkeypatch, capsys, caplog):
+    monkeypatch.setattr(fetch_market_by_url, "_lookup_market",
+                        lambda slug, tid, search_expired, refresh=False: None)
+
+    with caplog.at_level("INFO", logger="fetch_market_by_url"):
+        assert fetch_market_by_url.quick_fetch_market("some-market", refresh=True) is None
+
+    assert capsys.readouterr().out == ""
+    assert "Market not found" in caplog.messages
@@ -0,0 +1,122 @@
+import ast
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import generate_market_lookup_json as lookup_json  # noqa: E402
+
+
+def tokens_repr(price=0.5, outcomes=("Yes", "No")):
+    return repr([{"token_id": str(10**30 + i), "outcome": outcome, "price": price, "winner": False}
+                 for i, outcome in enumerate(outcomes)])
+
+
+def write_csv(path, rows):
+    lines = ["condition_id,description,market_slug,tokens"]
+    lines += [f'{condition_id},"{description}",{slug},"{tokens}"' for condition_id, description, slug, tokens in rows]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def build(tmp_path, rows, **kwargs):
+    csv_file = tmp_path / "markets.csv"
+    output_json = tmp_path / "lookup.json"
+    write_csv(csv_file, rows)
+    assert lookup_json.create_market_lookup_incremental(str(csv_file), str(output_json),
+                                                        backup=False, **kwargs)
+    return csv_file, output_json
+
+
+@pytest.mark.parametrize("tokens_str", [
+    tokens_repr(),
+    "[{'token_id': 123456789012345678901234567890, 'outcome': 'Yes', 'winner': True, 'extra': None}]",
+    repr([{"token_id": "1", "outcome": "Trump's win"}]),
+    repr([{"token_id": "1", "outcome": 'Say "yes"'}]),
+    repr([{"token_id": "1", "outcome": "café \\ back"}]),
+    "[{'token_id': '1', 'outcome': 'None of the above: True or False'}]",
+    "[]",
+])
+def test_safe_parse_tokens_matches_literal_eval(tokens_str):
+    assert lookup_json.safe_parse_tokens(tokens_str) == ast.literal_eval(tokens_str)
+
+
+def test_safe_parse_tokens_fallbacks():
+    assert lookup_json.safe_parse_tokens("") == []
+    assert lookup_json.safe_parse_tokens(float("nan")) == []
+    assert lookup_json.safe_parse_tokens('[{"token_id": "1", "outcome": "Yes"}]') == [{"token_id": "1", "outcome": "Yes"}]
+    assert lookup_json.safe_parse_tokens("not tokens") == []
+
+
+def test_unchanged_csv_skips_the_rebuild(tmp_path):
+    rows = [("0xaa", "Will it rain tomorrow?", "will-it-rain", tokens_repr())]
+    csv_file, output_json = build(tmp_path, rows)
+    lookup_mtime = output_json.stat().st_mtime_ns
+
+    # Same size and mtime: skipped on the stat check alone
+    assert lookup_json.create_market_lookup_incremental(str(csv_file), str(output_json), backup=False)
+    # Same contents, new mtime: skipped on the hash, and the new mtime is recorded
+    os.utime(csv_file, ns=(csv_file.stat().st_atime_ns, csv_file.stat().st_mtime_ns + 10**9))
+    assert lookup_json.create_market_lookup_incremental(str(csv_file), str(output_json), backup=False)
+    assert lookup_json.load_fingerprint(str(output_json))["csv_mtime_ns"] == csv_file.stat().st_mtime_ns
+    assert output_json.stat().st_mtime_ns == lookup_mtime
+
+
+def test_changed_csv_rewrites_only_changed_entries(tmp_path):
+    rows = [
+        ("0xaa", "Will it rain tomorrow?", "will-it-rain", tokens_repr()),
+        ("0xbb", "Will it snow tomorrow?", "will-it-snow", tokens_repr()),
+    ]
+    csv_file, output_json = build(tmp_path, rows)
+    before = json.loads(output_json.read_text())
+
+    rows[0] = ("0xaa", "Will it rain tomorrow?", "will-it-rain", tokens_repr(price=0.7))  # price only
+    rows[1] = ("0xbb", "Will it snow on Friday?", "will-it-snow", tokens_repr())
+    rows.append(("0xcc", "Will it be windy tomorrow?", "will-it-be-windy", tokens_repr()))
+    write_csv(csv_file, rows)
+    assert lookup_json.create_market_lookup_incremental(str(csv_file), str(output_json), backup=False)
+    after = json.loads(output_json.read_text())
+
+    assert sorted(after) == ["0xaa", "0xbb", "0xcc"]
+    # Token prices aren't part of the entry: only the row hash moves
+    assert after["0xaa"]["last_updated"] == before["0xaa"]["last_updated"]
+    assert after["0xaa"]["content_hash"] == before["0xaa"]["content_hash"]
+    assert after["0xaa"]["row_hash"] != before["0xaa"]["row_hash"]
+    assert after["0xbb"]["description"] == "Will it snow on Friday?"
+    assert after["0xbb"]["content_hash"] != before["0xbb"]["content_hash"]
+
+
+def test_sqlite_index_mirrors_the_lookup(tmp_path):
+    rows = [("0xaa", "Will it rain tomorrow?", "will-it-rain", tokens_repr())]
+    csv_file, output_json = build(tmp_path, rows)
+    sql = "SELECT condition_id, market_slug FROM markets ORDER BY condition_id"
+
+    assert lookup_json.query_lookup_index(str(output_json), sql) == [("0xaa", "will-it-rain")]
+
+    rows.append(("0xbb", "Will it snow tomorrow?", "will-it-snow", tokens_repr()))
+    write_csv(csv_file, rows)
+    assert lookup_json.create_market_lookup_incremental(str(csv_file), str(output_json), backup=False)
+    assert lookup_json.query_lookup_index(str(output_json), sql) == [("0xaa", "will-it-rain"),
+                                                                    ("0xbb", "will-it-snow")]
+
+    # An edit made behind the index's back means it is no longer trusted
+    output_json.write_text(output_json.read_text() + " ")
+    assert lookup_json.query_lookup_index(str(output_json), sql) is None
+
+
+def test_backups_are_pruned_and_can_be_hard_links(tmp_path):
+    path = tmp_path / "lookup.json"
+    path.write_text("{}")
+    for day in range(1, 5):
+        (tmp_path / f"lookup.json.backup.2020010{day}_000000").write_text("old")
+
+    backup_path = lookup_json.backup_file(str(path), hardlink=True, keep=2)
+
+    assert os.path.samefile(backup_path, path)
+    assert sorted(p.name for p in tmp_path.glob("lookup.json.backup.*")) == [
+        "lookup.json.backup.20200104_000000", os.path.basename(backup_path)
+    ]
@@ -0,0 +1,94 @@
+import csv
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+pytest.importorskip("dotenv")
+pytest.importorskip("py_clob_client")
+
+import incremental_markets_update  # noqa: E402
+
+
+def build_market(i, **extra):
+    return {"condition_id": f"0x{i:04x}", "market_slug": f"market-{i}", "question": f"Question {i}?",
+            "tokens": [{"token_id": str(10**20 + i), "outcome": "Yes"}, {"token_id": str(i), "outcome": "No"}],
+            **extra}
+
+
+def serve_pages(monkeypatch, pages, cursors=None):
+    """Route fetch_markets_batch to in-memory pages; cursors default to CLOB-style offsets"""
+    cursors = cursors or [incremental_markets_update.offset_cursor(100 * i) for i in range(len(pages))]
+    requested = []
+    lock = threading.Lock()
+
+    def fetch_markets_batch(next_cursor=None, limit=100):
+        with lock:
+            requested.append(next_cursor)
+        index = 0 if next_cursor is None else cursors.index(next_cursor) if next_cursor in cursors else None
+        if index is None:
+            return [], None
+        return pages[index], cursors[index + 1] if index + 1 < len(pages) else None
+
+    monkeypatch.setattr(incremental_markets_update, "fetch_markets_batch", fetch_markets_batch)
+    return requested
+
+
+def read_rows(csv_file):
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_new_markets_with_known_columns_are_appended(tmp_path, monkeypatch):
+    csv_file = tmp_path / "markets.csv"
+    incremental_markets_update.save_markets_to_csv([build_market(0), build_market(1)], str(csv_file))
+    original = csv_file.read_bytes()
+    serve_pages(monkeypatch, [[build_market(1), build_market(2)]])
+
+    assert incremental_markets_update.incremental_update_markets(str(csv_file), backup=False) == 1
+
+    assert csv_file.read_bytes().startswith(original)
+    rows = read_rows(csv_file)
+    assert [row["condition_id"] for row in rows] == ["0x0000", "0x0001", "0x0002"]
+    assert rows[2]["token_token_id"] == f"{10**20 + 2}, 2"
+
+
+def test_new_columns_rewrite_the_csv(tmp_path, monkeypatch):
+    csv_file = tmp_path / "markets.csv"
+    incremental_markets_update.save_markets_to_csv([build_market(0)], str(csv_file))
+    serve_pages(monkeypatch, [[build_market(1, neg_risk=True)]])
+
+    assert incremental_markets_update.incremental_update_markets(str(csv_file), backup=False) == 1
+
+    rows = read_rows(csv_file)
+    assert [row["condition_id"] for row in rows] == ["0x0000", "0x0001"]
+    assert [row["neg_risk"] for row in rows] == ["N/A", "True"]
+    assert rows[0]["token_token_id"] == f"{10**20}, 0"
+
+
+def test_prefetched_pages_keep_serial_order(tmp_path, monkeypatch):
+    pages = [[build_market(page * 10 + i) for i in range(3)] for page in range(6)]
+    csv_file = tmp_path / "markets.csv"
+    requested = serve_pages(monkeypatch, pages)
+
+    assert incremental_markets_update.incremental_update_markets(str(csv_file), backup=False) == 18
+
+    assert [row["condition_id"] for row in read_rows(csv_file)] == [
+        market["condition_id"] for page in pages for market in page
+    ]
+    # A page fetched ahead is used, not fetched a second time
+    page_cursors = [None] + [incremental_markets_update.offset_cursor(100 * i) for i in range(1, len(pages))]
+    assert [requested.count(cursor) for cursor in page_cursors] == [1] * len(pages)
+
+
+def test_unrecognized_cursors_page_serially(tmp_path, monkeypatch):
+    pages = [[build_market(page)] for page in range(3)]
+    csv_file = tmp_path / "markets.csv"
+    requested = serve_pages(monkeypatch, pages, cursors=["start", "opaque-1", "opaque-2"])
+
+    assert incremental_markets_update.incremental_update_markets(str(csv_file), backup=False) == 3
+    assert requested == [None, "opaque-1", "opaque-2"]
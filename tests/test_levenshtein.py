@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from levenshtein import levenshtein_distance, levenshtein_ratio  # noqa: E402
+
+
+def test_levenshtein_distance_known_values():
+    assert levenshtein_distance("kitten", "sitting") == 3
+    assert levenshtein_distance("", "abc") == 3
+    assert levenshtein_distance("flaw", "lawn") == 2
+    assert levenshtein_distance("trump", "trump") == 0
+    assert levenshtein_distance("café", "cafe") == 1
+
+
+def test_levenshtein_ratio_bounds():
+    assert levenshtein_ratio("", "") == 1.0
+    assert levenshtein_ratio("abc", "xyz") == 0.0
+    assert abs(levenshtein_ratio("kitten", "sitting") - (1 - 3 / 7)) < 1e-12
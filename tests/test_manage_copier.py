@@ -0,0 +1,120 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import manage_copier  # noqa: E402
+from manage_copier import TradeCopierManager  # noqa: E402
+
+ADDRESS = "0x" + "Ab" * 20
+
+
+def make_manager(tmp_path, config=None):
+    config_file = tmp_path / "config" / "trade_copier_config.json"
+    if config is not None:
+        config_file.parent.mkdir()
+        config_file.write_text(json.dumps(config))
+    manager = TradeCopierManager.__new__(TradeCopierManager)
+    manager.config_file = str(config_file)
+    manager.config_cache_file = str(tmp_path / "data" / ".trade_copier_config.cache")
+    manager.config = manager.load_config()
+    return manager
+
+
+def test_duplicate_address_is_rejected(tmp_path):
+    manager = make_manager(tmp_path)
+    assert manager.add_address(ADDRESS, "whale")
+    assert not manager.add_address(ADDRESS, "again")
+
+    reloaded = make_manager(tmp_path)
+    assert [entry["nickname"] for entry in reloaded.watched_addresses().values()] == ["whale"]
+    assert reloaded.remove_address(ADDRESS)
+    assert not reloaded.remove_address(ADDRESS)
+
+def test_import_defers_cli_only_modules():
+    # A fresh interpreter: pytest itself has argparse and subprocess loaded
+    probe = ("import logging, sys, manage_copier; "
+             "print(sorted(m for m in ('argparse', 'subprocess', 'trade_copier') if m in sys.modules), "
+             "logging.getLogger().handlers)")
+    result = subprocess.run([sys.executable, "-c", probe], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[] []"
+
+
+def test_settings_update_keeps_sections_it_never_read(tmp_path):
+    config = TradeCopierManager.default_config()
+    config["filters"]["excluded_markets"] = ["some-market"]
+    config["watched_addresses"] = {ADDRESS.lower(): {"address": ADDRESS, "nickname": "a", "active": True}}
+    manager = make_manager(tmp_path, config)
+
+    manager.update_copy_settings(copy_percentage=0.25)
+
+    assert "watched_addresses" not in manager.config._sections
+    saved = json.loads(Path(manager.config_file).read_text())
+    assert saved["copy_settings"]["copy_percentage"] == 0.25
+    assert saved["filters"]["excluded_markets"] == ["some-market"]
+    assert saved["watched_addresses"] == config["watched_addresses"]
+
+
+def test_config_sections_are_served_from_cache_until_the_file_changes(tmp_path, monkeypatch):
+    config = TradeCopierManager.default_config()
+    make_manager(tmp_path, config).config["copy_settings"]
+    assert Path(tmp_path / "data" / ".trade_copier_config.cache").exists()
+
+    def no_parsing(self, *args):
+        raise AssertionError("config file parsed despite an up-to-date cache")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(manage_copier.LazyConfig, "_stream_section", no_parsing)
+        patch.setattr(manage_copier.LazyConfig, "_load_full", no_parsing)
+        assert make_manager(tmp_path).config["copy_settings"] == config["copy_settings"]
+
+    config["copy_settings"]["copy_percentage"] = 0.5
+    config_file = tmp_path / "config" / "trade_copier_config.json"
+    config_file.write_text(json.dumps(config, indent=4))
+    assert make_manager(tmp_path).config["copy_settings"]["copy_percentage"] == 0.5
+
+
+def test_add_and_remove_address_ignore_case(tmp_path):
+    manager = make_manager(tmp_path)
+    assert manager.add_address(ADDRESS, "whale")
+    assert not manager.add_address(ADDRESS.lower())
+
+    reloaded = make_manager(tmp_path)
+    assert list(reloaded.watched_addresses()) == [ADDRESS.lower()]
+    assert reloaded.watched_addresses()[ADDRESS.lower()]["address"] == ADDRESS
+    assert not reloaded.remove_address("0x" + "cd" * 20)
+    assert reloaded.remove_address(ADDRESS.upper().replace("0X", "0x"))
+    assert make_manager(tmp_path).watched_addresses() == {}
+
+
+def test_address_list_config_is_migrated_first_entry_wins(tmp_path):
+    config = TradeCopierManager.default_config()
+    config["watched_addresses"] = [
+        {"address": ADDRESS, "nickname": "a", "added_date": "2025-01-01", "active": True},
+        {"address": ADDRESS.lower(), "nickname": "b", "added_date": "2025-01-02", "active": True},
+    ]
+    manager = make_manager(tmp_path, config)
+    assert [entry["nickname"] for entry in manager.watched_addresses().values()] == ["a"]
+
+    manager.update_copy_settings(copy_percentage=0.25)
+    saved = json.loads(Path(manager.config_file).read_text())
+    assert list(saved["watched_addresses"]) == [ADDRESS.lower()]
+
+
+def test_unchanged_settings_are_not_rewritten(tmp_path):
+    manager = make_manager(tmp_path, TradeCopierManager.default_config())
+    config_file = Path(manager.config_file)
+    before = config_file.stat().st_mtime_ns, config_file.stat().st_ino
+    manager.update_copy_settings(copy_percentage=1.0, check_interval=60)
+    assert (config_file.stat().st_mtime_ns, config_file.stat().st_ino) == before
+
+
+def test_malformed_addresses_are_rejected(tmp_path):
+    manager = make_manager(tmp_path)
+    for address in ["0x" + "zz" * 20, "0x" + "ab" * 19, "0x" + "ab" * 21, "ab" * 21, ADDRESS + "\n"]:
+        assert not manager.add_address(address)
+    assert manager.watched_addresses() == {}
@@ -0,0 +1,105 @@
+import math
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from market_depth import DEPTH_PERCENTAGES, MarketDepthAnalyzer, OrderbookDepth  # noqa: E402
+
+
+def build_depth(analyzer, raw_levels):
+    (bid_prices, bid_sizes, bid_cum), (ask_prices, ask_sizes, ask_cum) = analyzer._process_price_levels(
+        [{"price": str(price), "totalSize": str(size), "side": side} for price, size, side in raw_levels],
+        None,
+    )
+    depth = OrderbookDepth(
+        market_id="m",
+        question_id="q",
+        bid_prices=bid_prices, bid_sizes=bid_sizes, bid_cum_sizes=bid_cum,
+        ask_prices=ask_prices, ask_sizes=ask_sizes, ask_cum_sizes=ask_cum,
+        total_bid_depth=float(bid_sizes.sum()),
+        total_ask_depth=float(ask_sizes.sum()),
+    )
+    depth.best_bid = bid_prices[0] if len(bid_prices) else None
+    depth.best_ask = ask_prices[0] if len(ask_prices) else None
+    if depth.best_bid and depth.best_ask:
+        depth.mid_price = (depth.best_bid + depth.best_ask) / 2
+    return depth
+
+
+def walk_levels(levels, size):
+    """Reference level-by-level fill: (total_cost, remaining_size, consumed)"""
+    remaining, cost, consumed = size, 0.0, []
+    for level in levels:
+        if remaining <= 0:
+            break
+        fill = min(remaining, level.size)
+        cost += fill * level.price
+        consumed.append((level.price, fill))
+        remaining -= fill
+    return cost, remaining, consumed
+
+
+def test_levels_are_sorted_best_first_with_running_totals():
+    analyzer = MarketDepthAnalyzer(None)
+    depth = build_depth(analyzer, [
+        (0.40, 400, "BUY"), (0.48, 100, "BUY"), (0.47, 5, "BUY"),
+        (0.55, 300, "SELL"), (0.52, 120, "SELL"), (0.60, 1000, "SELL"),
+    ])
+    assert [(level.price, level.cumulative_size) for level in depth.bid_levels] == [(0.48, 100.0), (0.40, 500.0)]
+    assert [(level.price, level.cumulative_size) for level in depth.ask_levels] == [
+        (0.52, 120.0), (0.55, 420.0), (0.60, 1420.0)
+    ]
+
+
+def test_slippage_matches_level_walk():
+    analyzer = MarketDepthAnalyzer(None)
+    rng = random.Random(3)
+    for _ in range(200):
+        depth = build_depth(analyzer, [
+            (round(rng.uniform(0.01, 0.99), 2), round(rng.uniform(10, 500), 2), rng.choice(["BUY", "SELL"]))
+            for _ in range(rng.randint(1, 30))
+        ])
+        for side, levels in (("buy", depth.ask_levels), ("sell", depth.bid_levels)):
+            if not levels:
+                continue
+            for size in (1.0, levels[0].size, levels[-1].cumulative_size, rng.uniform(0, 3000)):
+                estimate = analyzer.calculate_slippage(depth, side, size)
+                cost, remaining, consumed = walk_levels(levels, size)
+                assert math.isclose(estimate.average_fill_price, cost / (size - remaining), rel_tol=1e-9)
+                assert estimate.can_execute == (not estimate.depth_exhausted)
+                assert estimate.depth_exhausted == (size > levels[-1].cumulative_size)
+                assert len(estimate.levels_consumed) == len(consumed)
+                for (price, fill), (expected_price, expected_fill) in zip(estimate.levels_consumed, consumed):
+                    assert price == expected_price
+                    assert math.isclose(fill, expected_fill, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_slippage_without_levels_breakdown():
+    analyzer = MarketDepthAnalyzer(None)
+    depth = build_depth(analyzer, [(0.52, 120, "SELL"), (0.55, 300, "SELL"), (0.48, 100, "BUY")])
+    estimate = analyzer.calculate_slippage(depth, "buy", 200, include_levels=False)
+    assert estimate.levels_consumed == []
+    assert math.isclose(estimate.average_fill_price, (120 * 0.52 + 80 * 0.55) / 200)
+    assert estimate.can_execute and estimate.max_executable_size == 200
+
+
+def test_depth_within_percentage_matches_scan():
+    analyzer = MarketDepthAnalyzer(None)
+    rng = random.Random(5)
+    for _ in range(100):
+        depth = build_depth(analyzer, [
+            (round(rng.uniform(0.2, 0.8), 3), round(rng.uniform(10, 500), 2), rng.choice(["BUY", "SELL"]))
+            for _ in range(rng.randint(2, 30))
+        ])
+        depth.mid_price = rng.choice([depth.mid_price, 0.5]) or 0.5
+        for percentage in (0.0, 0.01, 0.05, 0.10, 1.0):
+            threshold = depth.mid_price * percentage
+            expected = sum(level.size for level in depth.bid_levels if depth.mid_price - level.price <= threshold)
+            expected += sum(level.size for level in depth.ask_levels if level.price - depth.mid_price <= threshold)
+            assert math.isclose(analyzer._calculate_depth_within_percentage(depth, percentage), expected,
+                                rel_tol=1e-12, abs_tol=1e-9)
+        fused = analyzer._calculate_depths_within(depth, DEPTH_PERCENTAGES).tolist()
+        assert fused == [analyzer._calculate_depth_within_percentage(depth, p) for p in DEPTH_PERCENTAGES]
@@ -573,6 +573,21 @@ def main():
     
     args = parser.parse_args()
     
+    run_monitor(
+        addresses=args.addresses,
+        copy_percentage=args.copy_percentage,
+        min_trade_size=args.min_trade_size,
+        max_trade_size=args.max_trade_size,
+        check_interval=args.check_interval,
+        historical=args.historical,
+        lookback_hours=args.lookback_hours,
+        dry_run=args.dry_run
+    )
+
+def run_monitor(addresses: List[str], copy_percentage: float = 1.0, min_trade_size: float = 10.0,
+                max_trade_size: float = 1000.0, check_interval: int = 60, historical: bool = False,
+                lookback_hours: int = 24, dry_run: bool = False):
+    """Monitor (or, with historical, replay) trades from addresses; main() without argv parsing"""
     # Load environment variables
     private_key = os.getenv('PK')
     api_key = os.getenv('API_KEY')
@@ -589,25 +604,25 @@ def main():
     
     # Set copy parameters
     copier.set_copy_parameters(
-        copy_percentage=args.copy_percentage,
-        min_trade_size=args.min_trade_size,
-        max_trade_size=args.max_trade_size
+        copy_percentage=copy_percentage,
+        min_trade_size=min_trade_size,
+        max_trade_size=max_trade_size
     )
     
-    if args.historical:
+    if historical:
         # Copy historical trades
-        for address in args.addresses:
+        for address in addresses:
             copier.copy_historical_trades(
                 address, 
-                lookback_hours=args.lookback_hours,
-                dry_run=args.dry_run
+                lookback_hours=lookback_hours,
+                dry_run=dry_run
             )
     else:
         # Monitor addresses for new trades
-        if args.dry_run:
+        if dry_run:
             logger.info("DRY RUN MODE: Trades will be analyzed but not placed")
         
-        copier.monitor_multiple_addresses(args.addresses, args.check_interval)
+        copier.monitor_multiple_addresses(addresses, check_interval)
 
 if __name__ == "__main__":
     main()